@@ -0,0 +1,123 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the compression codecs used for the results backend.
+
+Payloads are built the way SQL Lab stores them, as an Arrow IPC stream (the
+default, with ``RESULTS_BACKEND_USE_MSGPACK``) or as JSON records, for a few
+typical result shapes.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import click
+import pyarrow as pa
+
+from superset.utils import json
+from superset.utils.compression import compress, COMPRESSION_CODECS, decompress
+
+
+def numeric_table(rows: int) -> pa.Table:
+    return pa.table(
+        {
+            "id": range(rows),
+            "value": [i * 0.5 for i in range(rows)],
+            "count": [i % 100 for i in range(rows)],
+        }
+    )
+
+
+def mixed_table(rows: int) -> pa.Table:
+    start = datetime(2024, 1, 1)
+    return pa.table(
+        {
+            "id": range(rows),
+            "ts": [start + timedelta(seconds=i) for i in range(rows)],
+            "country": [f"country_{i % 50}" for i in range(rows)],
+            "value": [i * 0.5 for i in range(rows)],
+            "flag": [i % 2 == 0 if i % 10 else None for i in range(rows)],
+        }
+    )
+
+
+def text_table(rows: int) -> pa.Table:
+    return pa.table(
+        {
+            "id": range(rows),
+            "description": [
+                f"Order {i} shipped to customer {i % 997} via carrier {i % 7}"
+                for i in range(rows)
+            ],
+        }
+    )
+
+
+SHAPES: dict[str, Callable[[int], pa.Table]] = {
+    "numeric": numeric_table,
+    "mixed": mixed_table,
+    "text": text_table,
+}
+
+
+def serialize(table: pa.Table, payload_format: str) -> bytes:
+    if payload_format == "arrow":
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    return json.dumps(table.to_pylist(), default=json.json_iso_dttm_ser).encode()
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+@click.command()
+@click.option("--rows", default=200_000, help="Number of rows per result.")
+@click.option("--repeat", default=3, help="Number of runs to average.")
+def main(rows: int, repeat: int) -> None:
+    codecs = [
+        name for name, codec in COMPRESSION_CODECS.items() if codec.is_available()
+    ]
+    print(f"Benchmarking {', '.join(codecs)} with {rows} rows")
+    print(
+        f"{'shape':<8} {'format':<6} {'codec':<5} {'size MiB':>9} {'ratio':>6} "
+        f"{'compress s':>11} {'decompress s':>13}"
+    )
+
+    for shape, build in SHAPES.items():
+        table = build(rows)
+        for payload_format in ("arrow", "json"):
+            data = serialize(table, payload_format)
+            for codec in codecs:
+                blob = compress(data, codec)
+                compress_time = timed(lambda: compress(data, codec), repeat)  # noqa: B023
+                decompress_time = timed(lambda: decompress(blob), repeat)  # noqa: B023
+                print(
+                    f"{shape:<8} {payload_format:<6} {codec:<5} "
+                    f"{len(blob) / 1024**2:9.2f} {len(data) / len(blob):6.1f} "
+                    f"{compress_time:11.3f} {decompress_time:13.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,111 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the escaping of formulas in CSV and Excel exports.
+
+The vectorized ``df_to_escaped_csv`` and ``quote_formulas`` are compared with the
+original implementations, which escaped the values of object columns one by one.
+"""
+
+import time
+from typing import Any, Callable
+
+import click
+import numpy as np
+import pandas as pd
+
+from superset.utils.csv import df_to_escaped_csv, escape_value
+from superset.utils.excel import quote_formulas
+
+
+def legacy_df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
+    df = df.rename(columns=lambda v: escape_value(v) if isinstance(v, str) else v)
+    for col_idx, (_, column) in enumerate(df.items()):
+        if column.dtype == np.dtype(object):
+            for idx, value in enumerate(column.values):
+                if isinstance(value, str):
+                    df.iat[idx, col_idx] = escape_value(value)
+    return df.to_csv(escapechar="\\", **kwargs)
+
+
+def legacy_quote_formulas(df: pd.DataFrame) -> pd.DataFrame:
+    for col in df.select_dtypes(include="object").columns:
+        df[col] = df[col].apply(
+            lambda x: (
+                f"'{x}"
+                if isinstance(x, str) and len(x) and x[0] in {"=", "+", "-", "@"}
+                else x
+            )
+        )
+    return df
+
+
+def build_dataframe(rows: int, formula_ratio: float) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    formulas = rng.random(rows) < formula_ratio
+    return pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "country": [f"country_{i % 50}" for i in range(rows)],
+            "comment": np.where(
+                formulas,
+                [f'=HYPERLINK("http://{i}")' for i in range(rows)],
+                [f"comment {i}" for i in range(rows)],
+            ).astype(object),
+            "delta": [f"-{i}.5" for i in range(rows)],
+            "value": rng.random(rows),
+        }
+    )
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+@click.command()
+@click.option("--rows", default=100_000, help="Number of rows in the DataFrame.")
+@click.option("--repeat", default=3, help="Number of runs to average.")
+def main(rows: int, repeat: int) -> None:
+    print(f"Benchmarking formula escaping with {rows} rows")
+    print(f"{'formulas':>8} {'function':<18} {'legacy s':>9} {'vectorized s':>13}")
+
+    for formula_ratio in (0.0, 0.01, 0.5):
+        df = build_dataframe(rows, formula_ratio)
+        assert df_to_escaped_csv(df) == legacy_df_to_escaped_csv(df)
+
+        benchmarks = {
+            "df_to_escaped_csv": (
+                lambda: legacy_df_to_escaped_csv(df),  # noqa: B023
+                lambda: df_to_escaped_csv(df),  # noqa: B023
+            ),
+            "quote_formulas": (
+                lambda: legacy_quote_formulas(df.copy()),  # noqa: B023
+                lambda: quote_formulas(df.copy()),  # noqa: B023
+            ),
+        }
+        for name, (legacy, vectorized) in benchmarks.items():
+            print(
+                f"{formula_ratio:8.0%} {name:<18} "
+                f"{timed(legacy, repeat):9.3f} {timed(vectorized, repeat):13.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
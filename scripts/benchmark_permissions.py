@@ -0,0 +1,203 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the access checks of a user with many roles and view menus.
+
+Compares the queries run for each check with the permission snapshots, built once
+and cached across requests. The roles, view menus and user are added to the
+metadata database of the configured app, and removed afterwards, so it should be
+run against a scratch metadata database, eg, a SQLite one. The snapshots are only
+cached across requests with a `CACHE_CONFIG`, eg, Redis.
+"""
+
+import random
+import time
+from typing import Any, Callable
+
+import click
+from flask import current_app, Flask, g
+from flask_appbuilder.security.sqla.models import (
+    assoc_permissionview_role,
+    assoc_user_role,
+)
+from sqlalchemy import insert
+
+from superset import db, security_manager
+
+PREFIX = "benchmark_permissions"
+
+
+def add_fixtures(roles: int, view_menus: int) -> Any:
+    """
+    Add a user with the roles, each granted the access to a share of the datasets.
+    """
+    sm = security_manager
+    permission = sm.add_permission("datasource_access")
+    db.session.execute(
+        insert(sm.viewmenu_model.__table__),
+        [{"name": f"[{PREFIX}].[table_{i}](id:{i})"} for i in range(view_menus)],
+    )
+    view_menu_ids = [
+        id_
+        for (id_,) in db.session.query(sm.viewmenu_model.id).filter(
+            sm.viewmenu_model.name.like(f"[{PREFIX}].%")
+        )
+    ]
+    db.session.execute(
+        insert(sm.permissionview_model.__table__),
+        [
+            {"permission_id": permission.id, "view_menu_id": id_}
+            for id_ in view_menu_ids
+        ],
+    )
+    pvm_ids = [
+        id_
+        for (id_,) in db.session.query(sm.permissionview_model.id).filter(
+            sm.permissionview_model.view_menu_id.in_(view_menu_ids)
+        )
+    ]
+    db.session.execute(
+        insert(sm.role_model.__table__),
+        [{"name": f"{PREFIX}_{i}"} for i in range(roles)],
+    )
+    role_ids = [
+        id_
+        for (id_,) in db.session.query(sm.role_model.id).filter(
+            sm.role_model.name.like(f"{PREFIX}_%")
+        )
+    ]
+    db.session.execute(
+        insert(assoc_permissionview_role),
+        [
+            {"permission_view_id": pvm_id, "role_id": role_ids[i % len(role_ids)]}
+            for i, pvm_id in enumerate(pvm_ids)
+        ],
+    )
+    user = sm.user_model(
+        first_name=PREFIX,
+        last_name=PREFIX,
+        username=PREFIX,
+        email=f"{PREFIX}@example.com",
+        active=True,
+    )
+    db.session.add(user)
+    db.session.flush()
+    db.session.execute(
+        insert(assoc_user_role),
+        [{"user_id": user.id, "role_id": role_id} for role_id in role_ids],
+    )
+    db.session.commit()
+    return user
+
+
+def remove_fixtures(user: Any) -> None:
+    sm = security_manager
+    view_menu_ids = db.session.query(sm.viewmenu_model.id).filter(
+        sm.viewmenu_model.name.like(f"[{PREFIX}].%")
+    )
+    pvm_ids = db.session.query(sm.permissionview_model.id).filter(
+        sm.permissionview_model.view_menu_id.in_(view_menu_ids)
+    )
+    db.session.execute(
+        assoc_permissionview_role.delete().where(
+            assoc_permissionview_role.c.permission_view_id.in_(pvm_ids)
+        )
+    )
+    db.session.execute(
+        assoc_user_role.delete().where(assoc_user_role.c.user_id == user.id)
+    )
+    db.session.query(sm.permissionview_model).filter(
+        sm.permissionview_model.view_menu_id.in_(view_menu_ids)
+    ).delete(synchronize_session=False)
+    db.session.query(sm.viewmenu_model).filter(
+        sm.viewmenu_model.name.like(f"[{PREFIX}].%")
+    ).delete(synchronize_session=False)
+    db.session.query(sm.role_model).filter(
+        sm.role_model.name.like(f"{PREFIX}_%")
+    ).delete(synchronize_session=False)
+    db.session.delete(user)
+    db.session.commit()
+
+
+def run_request(app: Flask, user: Any, view_menus: list[str]) -> Callable[[], Any]:
+    """
+    Return a function running the access checks of a request, eg, listing datasets
+    and checking the access to the datasets of a dashboard.
+
+    The request contexts share the app context pushed by `main`, and so its `g`, so
+    the values memoized per request are cleared for the snapshots to be read from the
+    cache by each request.
+    """
+
+    def check_access() -> None:
+        with app.test_request_context():
+            g.pop("permissions_version", None)
+            g.pop("permission_snapshots", None)
+            g.user = user
+            security_manager.user_view_menu_names("datasource_access")
+            for view_menu in view_menus:
+                security_manager.can_access("datasource_access", view_menu)
+
+    return check_access
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+@click.command()
+@click.option("--roles", default=200, help="Number of roles of the user.")
+@click.option("--view-menus", default=50_000, help="Number of view menus.")
+@click.option("--checks", default=50, help="Number of access checks per request.")
+@click.option("--repeat", default=5, help="Number of requests to time.")
+def main(roles: int, view_menus: int, checks: int, repeat: int) -> None:
+    # pylint: disable=import-outside-toplevel
+    from superset.app import create_app
+
+    app = create_app()
+    with app.app_context():
+        user = add_fixtures(roles, view_menus)
+        try:
+            names = [
+                f"[{PREFIX}].[table_{i}](id:{i})"
+                for i in random.sample(range(view_menus), checks)
+            ]
+            check_access = run_request(app, user, names)
+            print(
+                f"Benchmarking {checks} access checks per request for a user with "
+                f"{roles} roles and {view_menus} view menus"
+            )
+
+            current_app.config["PERMISSION_SNAPSHOT_CACHE_ENABLED"] = False
+            results = {"Queries": measure(check_access, repeat)}
+
+            current_app.config["PERMISSION_SNAPSHOT_CACHE_ENABLED"] = True
+            security_manager.invalidate_permission_snapshots()
+            results["Snapshot (built)"] = measure(check_access, 1)
+            results["Snapshot (cached)"] = measure(check_access, repeat)
+
+            for name, duration in results.items():
+                print(f"{name:<20} {duration * 1000:10.1f} ms per request")
+        finally:
+            remove_fixtures(user)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,106 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the construction of ``SupersetResultSet`` from DBAPI rows.
+
+Compares the columnar transposition used by ``SupersetResultSet`` with the
+previous implementation, which copied all rows into a NumPy structured array
+of Python objects before building the Arrow arrays.
+"""
+
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable
+
+import click
+import numpy as np
+import pyarrow as pa
+
+from superset.db_engine_specs.base import BaseEngineSpec
+from superset.result_set import stringify_values, SupersetResultSet
+
+
+def legacy_arrays(data: list[tuple[Any, ...]], column_names: list[str]) -> pa.Table:
+    """
+    Build the Arrow table the way ``SupersetResultSet`` used to.
+    """
+    array = np.array(data, dtype=[(name, "object") for name in column_names])
+    pa_data = []
+    for column in column_names:
+        try:
+            pa_data.append(pa.array(array[column].tolist()))
+        except (pa.lib.ArrowInvalid, pa.lib.ArrowTypeError, TypeError, ValueError):
+            pa_data.append(pa.array(stringify_values(array[column]).tolist()))
+        if pa.types.is_nested(pa_data[-1].type):
+            pa_data[-1] = pa.array(stringify_values(array[column]).tolist())
+    return pa.Table.from_arrays(pa_data, names=column_names)
+
+
+def generate_rows(rows: int) -> list[tuple[Any, ...]]:
+    start = datetime(2024, 1, 1)
+    return [
+        (
+            i,
+            i * 0.5,
+            f"name_{i % 1000}",
+            start + timedelta(seconds=i),
+            Decimal(i) / 100,
+            i % 2 == 0 if i % 10 else None,
+        )
+        for i in range(rows)
+    ]
+
+
+def measure(func: Callable[[], Any]) -> tuple[float, float]:
+    """
+    Return the wall time and the peak traced memory, from separate runs.
+    """
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak / 1024**2
+
+
+@click.command()
+@click.option("--rows", default=500_000, help="Number of rows to generate.")
+def main(rows: int) -> None:
+    column_names = ["id", "value", "name", "ts", "amount", "flag"]
+    description = [(name, None, None, None, None, None, None) for name in column_names]
+    # report precision and scale for the decimal column, like most drivers do
+    description[4] = ("amount", None, None, None, 38, 2, None)
+    data = generate_rows(rows)
+    print(f"Benchmarking {rows} rows x {len(column_names)} columns")
+
+    results = {
+        "Structured array (legacy)": measure(lambda: legacy_arrays(data, column_names)),
+        "Columnar transposition": measure(
+            lambda: SupersetResultSet(data, description, BaseEngineSpec)  # type: ignore
+        ),
+    }
+    for name, (duration, peak) in results.items():
+        print(f"{name:<28} {duration:8.2f} s {peak:10.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -112,6 +112,7 @@ class AsyncQueryManager:
         self._jwt_cookie_domain: Optional[str]
         self._jwt_cookie_samesite: Optional[Literal["None", "Lax", "Strict"]] = None
         self._jwt_secret: str
+        self._cancelled_job_timeout: int = 0
         self._load_chart_data_into_cache_job: Any = None
         # pylint: disable=invalid-name
         self._load_explore_json_into_cache_job: Any = None
@@ -147,6 +148,7 @@ class AsyncQueryManager:
         ]
         self._jwt_cookie_domain = app.config["GLOBAL_ASYNC_QUERIES_JWT_COOKIE_DOMAIN"]
         self._jwt_secret = app.config["GLOBAL_ASYNC_QUERIES_JWT_SECRET"]
+        self._cancelled_job_timeout = app.config["SQLLAB_ASYNC_TIME_LIMIT_SEC"]
 
         if app.config["GLOBAL_ASYNC_QUERIES_REGISTER_REQUEST_HANDLERS"]:
             self.register_request_handlers(app)
@@ -257,6 +259,31 @@ class AsyncQueryManager:
         )
         return job_metadata
 
+    def cancel_job(self, channel_id: str, job_id: str) -> None:
+        """
+        Cancels a job of a channel, its queries are cancelled if they're running, see
+        `CHART_QUERY_CANCELLATION_ENABLED`, and it isn't run if it's pending.
+        """
+        if not self._cache:
+            raise CacheBackendNotInitialized("Cache backend not initialized")
+
+        self._cache.set(
+            f"{self._stream_prefix}cancelled:{channel_id}:{job_id}",
+            True,
+            timeout=self._cancelled_job_timeout,
+        )
+
+    def is_job_cancelled(self, job_metadata: dict[str, Any]) -> bool:
+        if not self._cache:
+            raise CacheBackendNotInitialized("Cache backend not initialized")
+
+        return bool(
+            self._cache.get(
+                f"{self._stream_prefix}cancelled:"
+                f"{job_metadata['channel_id']}:{job_metadata['job_id']}"
+            )
+        )
+
     def read_events(
         self, channel: str, last_id: Optional[str]
     ) -> list[Optional[dict[str, Any]]]:
@@ -18,9 +18,18 @@ from __future__ import annotations
 
 import contextlib
 import logging
+from collections.abc import Iterator
+from functools import partial
 from typing import Any, TYPE_CHECKING
 
-from flask import current_app as app, g, make_response, request, Response
+from flask import (
+    current_app as app,
+    g,
+    make_response,
+    request,
+    Response,
+    stream_with_context,
+)
 from flask_appbuilder.api import expose, protect
 from flask_babel import gettext as _
 from marshmallow import ValidationError
@@ -30,10 +39,16 @@ from superset.async_events.async_query_manager import AsyncQueryTokenException
 from superset.charts.api import ChartRestApi
 from superset.charts.client_processing import apply_client_processing
 from superset.charts.data.query_context_cache_loader import QueryContextCacheLoader
-from superset.charts.schemas import ChartDataQueryContextSchema
+from superset.charts.schemas import (
+    ChartDataBatchQueryContextSchema,
+    ChartDataQueryContextSchema,
+)
 from superset.commands.chart.data.create_async_job_command import (
     CreateAsyncChartDataJobCommand,
 )
+from superset.commands.chart.data.get_batch_data_command import (
+    ChartDataBatchCommand,
+)
 from superset.commands.chart.data.get_data_command import ChartDataCommand
 from superset.commands.chart.exceptions import (
     ChartDataCacheLoadError,
@@ -43,13 +58,18 @@ from superset.common.chart_data import ChartDataResultFormat, ChartDataResultTyp
 from superset.connectors.sqla.models import BaseDatasource
 from superset.daos.exceptions import DatasourceNotFound
 from superset.exceptions import QueryObjectValidationError
-from superset.extensions import event_logger
+from superset.extensions import async_query_manager, event_logger
+from superset.extensions.query_canceller import (
+    cancel_queries_when,
+    is_client_disconnected,
+)
 from superset.models.sql_lab import Query
 from superset.utils import json
 from superset.utils.core import (
     create_zip,
     DatasourceType,
     get_user_id,
+    stream_zip,
 )
 from superset.utils.decorators import logs_context
 from superset.views.base import CsvResponse, generate_download_headers, XlsxResponse
@@ -62,7 +82,13 @@ logger = logging.getLogger(__name__)
 
 
 class ChartDataRestApi(ChartRestApi):
-    include_route_methods = {"get_data", "data", "data_from_cache"}
+    include_route_methods = {
+        "get_data",
+        "data",
+        "data_batch",
+        "data_from_cache",
+        "cancel_data_job",
+    }
 
     @expose("/<int:pk>/data/", methods=("GET",))
     @protect()
@@ -261,6 +287,86 @@ class ChartDataRestApi(ChartRestApi):
             command, form_data=form_data, datasource=query_context.datasource
         )
 
+    @expose("/data/batch", methods=("POST",))
+    @protect()
+    @statsd_metrics
+    @event_logger.log_this_with_context(
+        action=lambda self, *args, **kwargs: f"{self.__class__.__name__}"
+        f".data_batch",
+        log_to_statsd=False,
+    )
+    def data_batch(self) -> Response:
+        """
+        Take many query contexts, eg, the charts of a dashboard, and stream their
+        payload data responses as they're available.
+        ---
+        post:
+          summary: Return payload data responses for many query contexts
+          description: >-
+            Takes a list of query contexts constructed in the client, and streams a
+            JSON object per line (NDJSON) for each of them, in the order they
+            complete. Each object has the `index` of its query context in the
+            request and its HTTP `status`, with the `result` of the queries, or an
+            error `message`. Identical query contexts are run once, and only the
+            JSON result format is supported.
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: "#/components/schemas/ChartDataBatchQueryContextSchema"
+          responses:
+            200:
+              description: Query results, one JSON object per line
+              content:
+                application/x-ndjson:
+                  schema:
+                    $ref: "#/components/schemas/ChartDataBatchResponseSchema"
+            400:
+              $ref: '#/components/responses/400'
+            401:
+              $ref: '#/components/responses/401'
+            500:
+              $ref: '#/components/responses/500'
+        """
+        if not request.is_json:
+            return self.response_400(message=_("Request is not JSON"))
+        try:
+            body = ChartDataBatchQueryContextSchema().load(request.json)
+        except ValidationError as error:
+            return self.response_400(
+                message=_(
+                    "Request is incorrect: %(error)s", error=error.normalized_messages()
+                )
+            )
+
+        command = ChartDataBatchCommand(
+            body["query_contexts"], dashboard_id=body.get("dashboard_id")
+        )
+        is_guest_user = security_manager.is_guest_user()
+
+        def stream_results() -> Iterator[str]:
+            with cancel_queries_when(
+                partial(is_client_disconnected, request.environ)
+            ):
+                for result in command.run():
+                    if is_guest_user:
+                        for query in result.get("result", []):
+                            query.pop("query", None)
+                    yield (
+                        json.dumps(
+                            result,
+                            default=json.json_int_dttm_ser,
+                            ignore_nan=True,
+                        )
+                        + "\n"
+                    )
+
+        return Response(
+            stream_with_context(stream_results()),
+            mimetype="application/x-ndjson",
+        )
+
     @expose("/data/<cache_key>", methods=("GET",))
     @protect()
     @statsd_metrics
@@ -319,6 +425,57 @@ class ChartDataRestApi(ChartRestApi):
 
         return self._get_data_response(command, True)
 
+    @expose("/data/jobs/<job_id>", methods=("DELETE",))
+    @protect()
+    @statsd_metrics
+    @event_logger.log_this_with_context(
+        action=lambda self, *args, **kwargs: f"{self.__class__.__name__}"
+        f".cancel_data_job",
+        log_to_statsd=False,
+    )
+    def cancel_data_job(self, job_id: str) -> Response:
+        """
+        Cancel an async chart data job.
+        ---
+        delete:
+          summary: Cancel an async chart data job
+          description: >-
+            Cancels a chart data job of the async channel of the user, eg, because
+            the chart was closed or its filters changed. The job isn't run if it's
+            pending, and its queries are cancelled in the database if they're
+            running and the database supports it.
+          parameters:
+          - in: path
+            schema:
+              type: string
+            name: job_id
+          responses:
+            200:
+              description: Job cancelled
+              content:
+                application/json:
+                  schema:
+                    type: object
+                    properties:
+                      message:
+                        type: string
+            401:
+              $ref: '#/components/responses/401'
+            404:
+              $ref: '#/components/responses/404'
+            500:
+              $ref: '#/components/responses/500'
+        """
+        if not is_feature_enabled("GLOBAL_ASYNC_QUERIES"):
+            return self.response_404()
+        try:
+            channel_id = async_query_manager.parse_channel_id_from_request(request)
+        except AsyncQueryTokenException:
+            return self.response_401()
+
+        async_query_manager.cancel_job(channel_id, job_id)
+        return self.response(200, message="OK")
+
     def _run_async(
         self, form_data: dict[str, Any], command: ChartDataCommand
     ) -> Response:
@@ -378,7 +535,7 @@ class ChartDataRestApi(ChartRestApi):
 
             # return multi-query results bundled as a zip file
             def _process_data(query_data: Any) -> Any:
-                if result_format == ChartDataResultFormat.CSV:
+                if isinstance(query_data, str):
                     encoding = app.config["CSV_EXPORT"].get("encoding", "utf-8")
                     return query_data.encode(encoding)
                 return query_data
@@ -387,6 +544,21 @@ class ChartDataRestApi(ChartRestApi):
                 f"query_{idx + 1}.{result_format}": _process_data(query["data"])
                 for idx, query in enumerate(result["queries"])
             }
+            if app.config["CHART_DATA_EXPORT_CHUNK_SIZE"]:
+                # post-processed files are built in memory, and can't be streamed
+                return Response(
+                    stream_zip(
+                        {
+                            filename: [contents]
+                            if isinstance(contents, bytes)
+                            else contents
+                            for filename, contents in files.items()
+                        }
+                    ),
+                    headers=generate_download_headers("zip"),
+                    mimetype="application/zip",
+                )
+
             return Response(
                 create_zip(files),
                 headers=generate_download_headers("zip"),
@@ -419,7 +591,10 @@ class ChartDataRestApi(ChartRestApi):
         datasource: BaseDatasource | Query | None = None,
     ) -> Response:
         try:
-            result = command.run(force_cached=force_cached)
+            with cancel_queries_when(
+                partial(is_client_disconnected, request.environ)
+            ):
+                result = command.run(force_cached=force_cached)
         except ChartDataCacheLoadError as exc:
             return self.response_422(message=exc.message)
         except ChartDataQueryFailedError as exc:
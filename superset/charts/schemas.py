@@ -1430,6 +1430,24 @@ class ChartDataQueryContextSchema(Schema):
         return self.query_context_factory
 
 
+class ChartDataBatchQueryContextSchema(Schema):
+    dashboard_id = fields.Integer(
+        metadata={
+            "description": "The dashboard of the charts, used to check the access "
+            "to their datasources"
+        },
+        allow_none=True,
+    )
+    query_contexts = fields.List(
+        fields.Dict(),
+        metadata={
+            "description": "The query contexts, each following "
+            "`ChartDataQueryContextSchema`"
+        },
+        required=True,
+    )
+
+
 class AnnotationDataSchema(Schema):
     columns = fields.List(
         fields.String(),
@@ -1481,6 +1499,13 @@ class ChartDataResponseResult(Schema):
         required=True,
         allow_none=None,
     )
+    is_stale = fields.Boolean(
+        metadata={
+            "description": "Is the cached result past its cache timeout, and being "
+            "refreshed"
+        },
+        allow_none=True,
+    )
     query = fields.String(
         metadata={"description": "The executed query statement"},
         required=True,
@@ -1509,6 +1534,10 @@ class ChartDataResponseResult(Schema):
         metadata={"description": "Amount of rows in result set"},
         allow_none=False,
     )
+    rollup = fields.String(
+        metadata={"description": "The rollup table the query was routed to, if any"},
+        allow_none=True,
+    )
     data = fields.List(fields.Dict(), metadata={"description": "A list with results"})
     colnames = fields.List(
         fields.String(), metadata={"description": "A list of column names"}
@@ -1545,6 +1574,25 @@ class ChartDataResponseSchema(Schema):
     )
 
 
+class ChartDataBatchResponseSchema(Schema):
+    index = fields.Integer(
+        metadata={"description": "The index of the query context in the request"},
+    )
+    status = fields.Integer(
+        metadata={"description": "The HTTP status of the query context"},
+    )
+    message = fields.String(
+        metadata={"description": "The error message, if any"},
+    )
+    result = fields.List(
+        fields.Nested(ChartDataResponseResult),
+        metadata={
+            "description": "A list of results for each corresponding query in the "
+            "query context."
+        },
+    )
+
+
 class ChartDataAsyncResponseSchema(Schema):
     channel_id = fields.String(
         metadata={"description": "Unique session async channel ID"},
@@ -1682,7 +1730,9 @@ CHART_SCHEMAS = (
     ChartCacheWarmUpRequestSchema,
     ChartCacheWarmUpResponseSchema,
     ChartDataQueryContextSchema,
+    ChartDataBatchQueryContextSchema,
     ChartDataResponseSchema,
+    ChartDataBatchResponseSchema,
     ChartDataAsyncResponseSchema,
     # TODO: These should optimally be included in the QueryContext schema as an `anyOf`
     #  in ChartDataPostProcessingOperation.options, but since `anyOf` is not
@@ -0,0 +1,217 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from flask import current_app
+from flask_babel import gettext as _
+from marshmallow import ValidationError
+
+from superset import security_manager
+from superset.charts.schemas import ChartDataQueryContextSchema
+from superset.commands.base import BaseCommand
+from superset.commands.chart.data.get_data_command import ChartDataCommand
+from superset.commands.chart.exceptions import (
+    ChartDataCacheLoadError,
+    ChartDataQueryFailedError,
+)
+from superset.common.chart_data import ChartDataResultFormat
+from superset.common.query_context import QueryContext
+from superset.common.query_context_factory import QueryContextFactory
+from superset.common.query_merge_planner import QueryMergePlanner
+from superset.daos.exceptions import DatasourceNotFound
+from superset.exceptions import QueryObjectValidationError, SupersetSecurityException
+from superset.models.sql_lab import Query
+from superset.utils.cache import generate_cache_key
+from superset.utils.concurrency import iter_concurrently
+
+logger = logging.getLogger(__name__)
+
+
+class ChartDataBatchCommand(BaseCommand):
+    """
+    Returns the data of many charts, eg, the charts of a dashboard.
+
+    The datasources of the query contexts are loaded once, and the access to each
+    datasource is checked once. Identical query contexts are run once, and the others
+    concurrently, in up to `CHART_DATA_QUERY_MAX_WORKERS` threads and
+    `max_concurrent_queries` per database. With `CHART_DATA_MERGE_QUERIES`, the
+    query objects differing only by their metrics are merged across the query
+    contexts. The results are yielded per query context, in the order they complete.
+    """
+
+    _form_datas: list[dict[str, Any]]
+    _dashboard_id: int | None
+    _query_contexts: dict[int, QueryContext]
+    _errors: dict[int, dict[str, Any]]
+
+    def __init__(
+        self,
+        form_datas: list[dict[str, Any]],
+        dashboard_id: int | None = None,
+    ):
+        self._form_datas = form_datas
+        self._dashboard_id = dashboard_id
+        self._query_contexts = {}
+        self._errors = {}
+
+    def run(self) -> Iterator[dict[str, Any]]:
+        self.validate()
+
+        for idx, error in self._errors.items():
+            yield {"index": idx, **error}
+
+        # identical query contexts are run once
+        groups: dict[str, list[int]] = {}
+        for idx, query_context in self._query_contexts.items():
+            key = generate_cache_key(
+                {**query_context.cache_values, "force": query_context.force}
+            )
+            groups.setdefault(key, []).append(idx)
+        indexes = list(groups.values())
+
+        # the query objects differing only by their metrics are merged across charts
+        query_merge_planner = None
+        if current_app.config["CHART_DATA_MERGE_QUERIES"]:
+            query_merge_planner = QueryMergePlanner()
+            for query_context in self._query_contexts.values():
+                for query_obj in query_context.queries:
+                    query_merge_planner.add_query_object(
+                        query_context.datasource, query_obj
+                    )
+
+        semaphores: dict[int, threading.Semaphore] = {}
+        for query_context in self._query_contexts.values():
+            database = query_context.datasource.database
+            if database.id not in semaphores and database.max_concurrent_queries:
+                semaphores[database.id] = threading.Semaphore(
+                    database.max_concurrent_queries
+                )
+
+        def get_result(idx: int) -> dict[str, Any]:
+            query_context = self._query_contexts[idx]
+            database = query_context.datasource.database
+            try:
+                with semaphores.get(database.id) or contextlib.nullcontext():
+                    result = ChartDataCommand(query_context).run(
+                        query_merge_planner=query_merge_planner
+                    )
+            except ChartDataCacheLoadError as ex:
+                return {"status": 422, "message": ex.message}
+            except ChartDataQueryFailedError as ex:
+                return {"status": 400, "message": ex.message}
+            except Exception:  # pylint: disable=broad-except
+                # the results of the other query contexts are still streamed
+                logger.exception("Failed to load the data of a chart")
+                return {"status": 500, "message": _("An error occurred")}
+            return {"status": 200, "result": result["queries"]}
+
+        # the worker threads mustn't lazy load the state of the query contexts
+        if len(indexes) > 1:
+            for query_context in self._query_contexts.values():
+                query_context.load_state()
+
+        for group_idx, result in iter_concurrently(
+            get_result,
+            [idxs[0] for idxs in indexes],
+            max_workers=current_app.config["CHART_DATA_QUERY_MAX_WORKERS"],
+        ):
+            for idx in indexes[group_idx]:
+                yield {"index": idx, **result}
+
+    def validate(self) -> None:
+        if self._query_contexts or self._errors:
+            return
+
+        # the datasources are loaded once for all the query contexts
+        schema = ChartDataQueryContextSchema()
+        schema.query_context_factory = QueryContextFactory(cache_datasources=True)
+        accessible_datasources: dict[str, bool] = {}
+
+        for idx, form_data in enumerate(self._form_datas):
+            try:
+                if self._dashboard_id is not None:
+                    form_data = {
+                        **form_data,
+                        "form_data": {
+                            "dashboardId": self._dashboard_id,
+                            **(form_data.get("form_data") or {}),
+                        },
+                    }
+                query_context = schema.load(form_data)
+                if query_context.result_format != ChartDataResultFormat.JSON:
+                    raise QueryObjectValidationError(
+                        _(
+                            "Unsupported result_format: %(result_format)s",
+                            result_format=query_context.result_format,
+                        )
+                    )
+                self._raise_for_access(query_context, accessible_datasources)
+            except DatasourceNotFound:
+                self._errors[idx] = {"status": 404, "message": _("Not found")}
+            except QueryObjectValidationError as ex:
+                self._errors[idx] = {"status": 400, "message": ex.message}
+            except ValidationError as ex:
+                self._errors[idx] = {
+                    "status": 400,
+                    "message": _(
+                        "Request is incorrect: %(error)s",
+                        error=ex.normalized_messages(),
+                    ),
+                }
+            except (KeyError, TypeError):
+                self._errors[idx] = {
+                    "status": 400,
+                    "message": _("Request is incorrect"),
+                }
+            except SupersetSecurityException as ex:
+                self._errors[idx] = {"status": 403, "message": ex.message}
+            else:
+                self._query_contexts[idx] = query_context
+
+    @staticmethod
+    def _raise_for_access(
+        query_context: QueryContext,
+        accessible_datasources: dict[str, bool],
+    ) -> None:
+        """
+        Raise an exception if the user cannot access the query context.
+
+        The access to each datasource is checked once. When it's denied, eg, for guest
+        users, or users granted access through the dashboard, the access is checked
+        for each query context.
+        """
+        datasource = query_context.datasource
+        if isinstance(datasource, Query) or security_manager.is_guest_user():
+            ChartDataCommand(query_context).validate()
+            return
+
+        if datasource.uid not in accessible_datasources:
+            accessible_datasources[datasource.uid] = (
+                security_manager.can_access_datasource(datasource)
+            )
+        if not accessible_datasources[datasource.uid]:
+            ChartDataCommand(query_context).validate()
+            return
+
+        for query in query_context.queries:
+            query.validate()
@@ -38,6 +38,7 @@ from superset.commands.report.exceptions import (
     AlertQueryTimeout,
     AlertValidatorConfigError,
 )
+from superset.extensions.admission_control import override_workload, Workload
 from superset.reports.models import ReportSchedule, ReportScheduleValidatorType
 from superset.tasks.utils import get_executor
 from superset.utils import json
@@ -175,7 +176,7 @@ class AlertCommand(BaseCommand):
                 model=self._report_schedule,
             )
             user = security_manager.find_user(username)
-            with override_user(user):
+            with override_user(user), override_workload(Workload.ALERT):
                 start = default_timer()
                 df = self._report_schedule.database.get_df(sql=limited_rendered_sql)
                 stop = default_timer()
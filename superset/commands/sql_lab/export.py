@@ -16,8 +16,9 @@
 # under the License.
 from __future__ import annotations
 
+import codecs
 import logging
-from typing import Any, cast, TypedDict
+from typing import Any, cast, Generator, TypedDict, Union
 
 import pandas as pd
 from flask import current_app as app
@@ -30,7 +31,8 @@ from superset.exceptions import SupersetErrorException, SupersetSecurityExceptio
 from superset.models.sql_lab import Query
 from superset.sql.parse import SQLScript
 from superset.sqllab.limiting_factor import LimitingFactor
-from superset.utils import core as utils, csv
+from superset.utils import csv
+from superset.utils.compression import decompress
 from superset.views.utils import _deserialize_results_payload
 
 logger = logging.getLogger(__name__)
@@ -38,8 +40,10 @@ logger = logging.getLogger(__name__)
 
 class SqlExportResult(TypedDict):
     query: Query
-    count: int
-    data: list[Any]
+    # `None` when the CSV is streamed, in which case `data` is a generator that
+    # returns the number of rows once exhausted
+    count: int | None
+    data: Union[bytes, Generator[bytes, None, int]]
 
 
 class SqlResultExportCommand(BaseCommand):
@@ -93,8 +97,9 @@ class SqlResultExportCommand(BaseCommand):
             blob = results_backend.get(self._query.results_key)
         if blob:
             logger.info("Decompressing")
-            payload = utils.zlib_decompress(
-                blob, decode=not results_backend_use_msgpack
+            decompressed = decompress(blob)
+            payload = (
+                decompressed if results_backend_use_msgpack else decompressed.decode()
             )
             obj = _deserialize_results_payload(
                 payload, self._query, cast(bool, results_backend_use_msgpack)
@@ -124,6 +129,21 @@ class SqlResultExportCommand(BaseCommand):
             }:
                 # remove extra row from `increased_limit`
                 limit -= 1
+
+            if chunk_size := app.config["SQLLAB_CSV_EXPORT_CHUNK_SIZE"]:
+                logger.info("Streaming CSV in chunks of %i rows", chunk_size)
+                if limit is not None:
+                    sql = self._query.database.apply_limit_to_sql(
+                        sql, limit, force=True
+                    )
+                return {
+                    "query": self._query,
+                    "count": None,
+                    "data": self._stream_csv(
+                        sql, limit, chunk_size, dict(app.config["CSV_EXPORT"])
+                    ),
+                }
+
             df = self._query.database.get_df(
                 sql,
                 self._query.catalog,
@@ -139,3 +159,42 @@ class SqlResultExportCommand(BaseCommand):
             "count": len(df.index),
             "data": csv_data,
         }
+
+    def _stream_csv(
+        self,
+        sql: str,
+        limit: int | None,
+        chunk_size: int,
+        csv_export: dict[str, Any],
+    ) -> Generator[bytes, None, int]:
+        """
+        Run the query and yield the encoded CSV in chunks, returning the row count.
+        """
+        # an incremental encoder only writes the BOM of encodings like `utf-8-sig`
+        # once
+        encoder = codecs.getincrementalencoder(csv_export.get("encoding", "utf-8"))()
+        header = csv_export.pop("header", True)
+        count = 0
+
+        for df in self._query.database.iter_df(
+            sql,
+            self._query.catalog,
+            self._query.schema,
+            chunk_size=chunk_size,
+        ):
+            if limit is not None:
+                df = df[: limit - count]
+            csv_string = csv.df_to_escaped_csv(
+                df,
+                index=False,
+                header=header if count == 0 else False,
+                **csv_export,
+            )
+            count += len(df.index)
+            yield encoder.encode(csv_string)
+
+            # stop reading from the cursor once the limit is reached
+            if limit is not None and count >= limit:
+                break
+
+        return count
@@ -28,7 +28,7 @@ from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import SerializationError, SupersetErrorException
 from superset.models.sql_lab import Query
 from superset.sqllab.utils import apply_display_max_row_configuration_if_require
-from superset.utils import core as utils
+from superset.utils.compression import decompress
 from superset.utils.dates import now_as_float
 from superset.views.utils import _deserialize_results_payload
 
@@ -38,6 +38,8 @@ logger = logging.getLogger(__name__)
 class SqlExecutionResultsCommand(BaseCommand):
     _key: str
     _rows: int | None
+    _offset: int
+    _limit: int | None
     _blob: Any
     _query: Query
 
@@ -45,9 +47,13 @@ class SqlExecutionResultsCommand(BaseCommand):
         self,
         key: str,
         rows: int | None = None,
+        offset: int = 0,
+        limit: int | None = None,
     ) -> None:
         self._key = key
         self._rows = rows
+        self._offset = offset
+        self._limit = limit
 
     def validate(self) -> None:
         if not results_backend:
@@ -100,12 +106,15 @@ class SqlExecutionResultsCommand(BaseCommand):
     ) -> dict[str, Any]:
         """Runs arbitrary sql and returns data as json"""
         self.validate()
-        payload = utils.zlib_decompress(
-            self._blob, decode=not results_backend_use_msgpack
-        )
+        decompressed = decompress(self._blob)
+        payload = decompressed if results_backend_use_msgpack else decompressed.decode()
         try:
             obj = _deserialize_results_payload(
-                payload, self._query, cast(bool, results_backend_use_msgpack)
+                payload,
+                self._query,
+                cast(bool, results_backend_use_msgpack),
+                offset=self._offset,
+                limit=self._get_limit(),
             )
         except SerializationError as ex:
             raise SupersetErrorException(
@@ -125,3 +134,11 @@ class SqlExecutionResultsCommand(BaseCommand):
             obj = apply_display_max_row_configuration_if_require(obj, self._rows)
 
         return obj
+
+    def _get_limit(self) -> int | None:
+        """
+        Return the number of rows to read, which is capped by ``rows`` if present.
+        """
+        if self._rows and self._limit is not None:
+            return min(self._rows, self._limit)
+        return self._rows or self._limit
@@ -17,7 +17,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, ClassVar, TYPE_CHECKING
+from typing import Any, ClassVar, Iterator, TYPE_CHECKING
 
 import pandas as pd
 
@@ -31,6 +31,7 @@ from superset.models.slice import Slice
 from superset.utils.core import GenericDataType
 
 if TYPE_CHECKING:
+    from superset.common.query_merge_planner import QueryMergePlanner
     from superset.connectors.sqla.models import BaseDatasource
     from superset.models.helpers import QueryResult
 
@@ -90,16 +91,19 @@ class QueryContext:
         self,
         df: pd.DataFrame,
         coltypes: list[GenericDataType],
-    ) -> str | list[dict[str, Any]]:
+    ) -> str | bytes | Iterator[bytes] | list[dict[str, Any]]:
         return self._processor.get_data(df, coltypes)
 
     def get_payload(
         self,
         cache_query_context: bool | None = False,
         force_cached: bool = False,
+        query_merge_planner: QueryMergePlanner | None = None,
     ) -> dict[str, Any]:
         """Returns the query results with both metadata and data"""
-        return self._processor.get_payload(cache_query_context, force_cached)
+        return self._processor.get_payload(
+            cache_query_context, force_cached, query_merge_planner
+        )
 
     def get_cache_timeout(self) -> int | None:
         if self.custom_cache_timeout is not None:
@@ -112,6 +116,17 @@ class QueryContext:
             return self.datasource.database.cache_timeout
         return None
 
+    def get_stale_cache_timeout(self) -> int | None:
+        if (
+            stale_timeout := getattr(self.datasource, "extra_dict", {}).get(
+                "stale_cache_timeout"
+            )
+        ) is not None:
+            return stale_timeout
+        if hasattr(self.datasource, "database"):
+            return self.datasource.database.stale_cache_timeout
+        return None
+
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> str | None:
         return self._processor.query_cache_key(query_obj, **kwargs)
 
@@ -137,3 +152,6 @@ class QueryContext:
 
     def raise_for_access(self) -> None:
         self._processor.raise_for_access()
+
+    def load_state(self) -> None:
+        self._processor.load_state()
@@ -34,15 +34,26 @@ if TYPE_CHECKING:
     from superset.connectors.sqla.models import BaseDatasource
 
 
-def create_query_object_factory() -> QueryObjectFactory:
-    return QueryObjectFactory(current_app.config, DatasourceDAO())
+def create_query_object_factory(
+    datasources: dict[tuple[str, Any], BaseDatasource] | None = None,
+) -> QueryObjectFactory:
+    return QueryObjectFactory(current_app.config, DatasourceDAO(), datasources)
 
 
 class QueryContextFactory:  # pylint: disable=too-few-public-methods
+    """
+    Creates query contexts from their JSON representation.
+
+    With `cache_datasources`, each datasource is loaded once for all the query
+    contexts created by the factory, eg, the charts of a dashboard.
+    """
+
     _query_object_factory: QueryObjectFactory
+    _datasources: dict[tuple[str, Any], BaseDatasource] | None
 
-    def __init__(self) -> None:
-        self._query_object_factory = create_query_object_factory()
+    def __init__(self, cache_datasources: bool = False) -> None:
+        self._datasources = {} if cache_datasources else None
+        self._query_object_factory = create_query_object_factory(self._datasources)
 
     def create(  # pylint: disable=too-many-arguments
         self,
@@ -105,10 +116,17 @@ class QueryContextFactory:  # pylint: disable=too-few-public-methods
         )
 
     def _convert_to_model(self, datasource: DatasourceDict) -> BaseDatasource:
-        return DatasourceDAO.get_datasource(
+        key = (datasource["type"], datasource["id"])
+        if self._datasources is not None and key in self._datasources:
+            return self._datasources[key]
+
+        datasource_model_instance = DatasourceDAO.get_datasource(
             datasource_type=DatasourceType(datasource["type"]),
             database_id_or_uuid=datasource["id"],
         )
+        if self._datasources is not None:
+            self._datasources[key] = datasource_model_instance
+        return datasource_model_instance
 
     def _get_slice(self, slice_id: Any) -> Slice | None:
         return ChartDAO.find_by_id(slice_id)
@@ -19,25 +19,29 @@ from __future__ import annotations
 import copy
 import logging
 import re
-from datetime import datetime
-from typing import Any, cast, ClassVar, TYPE_CHECKING, TypedDict
+from datetime import datetime, timedelta
+from typing import Any, cast, ClassVar, Iterator, TYPE_CHECKING, TypedDict
 
 import numpy as np
 import pandas as pd
-from flask import current_app
+from flask import current_app, g
 from flask_babel import gettext as _
 from pandas import DateOffset
 
-from superset.common.chart_data import ChartDataResultFormat
+from superset.common.chart_data import ChartDataResultFormat, ChartDataResultType
 from superset.common.db_query_status import QueryStatus
 from superset.common.query_actions import get_query_results
+from superset.common.query_merge_planner import QueryMergePlanner
+from superset.common.query_object import get_impersonation_cache_key
 from superset.common.utils import dataframe_utils
 from superset.common.utils.query_cache_manager import QueryCacheManager
 from superset.common.utils.time_range_utils import (
     get_since_until_from_query_object,
     get_since_until_from_time_range,
+    get_time_buckets,
+    TIME_GRAIN_PERIODS,
 )
-from superset.connectors.sqla.models import BaseDatasource
+from superset.connectors.sqla.models import BaseDatasource, SqlaTable
 from superset.constants import CACHE_DISABLED_TIMEOUT, CacheRegion, TimeGrain
 from superset.daos.annotation_layer import AnnotationLayerDAO
 from superset.daos.chart import ChartDAO
@@ -47,11 +51,12 @@ from superset.exceptions import (
     SupersetException,
 )
 from superset.extensions import cache_manager, feature_flag_manager, security_manager
-from superset.models.helpers import QueryResult
+from superset.models.helpers import QueryResult, QueryStringExtended
 from superset.models.sql_lab import Query
-from superset.superset_typing import AdhocColumn, AdhocMetric
+from superset.superset_typing import AdhocColumn, AdhocMetric, Column, Metric
 from superset.utils import csv, excel
 from superset.utils.cache import generate_cache_key, set_and_log_cache
+from superset.utils.concurrency import load_orm_state, map_concurrently
 from superset.utils.core import (
     DatasourceType,
     DateColumn,
@@ -59,10 +64,14 @@ from superset.utils.core import (
     error_msg_from_exception,
     FilterOperator,
     GenericDataType,
+    get_base_axis_columns,
     get_base_axis_labels,
+    get_column_name,
     get_column_names_from_columns,
     get_column_names_from_metrics,
+    get_metric_name,
     get_metric_names,
+    get_user_id,
     get_x_axis_label,
     is_adhoc_column,
     is_adhoc_metric,
@@ -71,6 +80,8 @@ from superset.utils.core import (
     TIME_COMPARISON,
 )
 from superset.utils.date_parser import get_past_or_future, normalize_time_delta
+from superset.utils.hashing import md5_sha_from_dict
+from superset.utils.json import json_int_dttm_ser
 from superset.utils.pandas_postprocessing.utils import unescape_separator
 from superset.views.utils import get_viz
 from superset.viz import viz_types
@@ -102,6 +113,9 @@ AGGREGATED_JOIN_GRAINS = {
 # Right suffix used for joining offset results
 R_SUFFIX = "__right_suffix"
 
+# Maximum number of time buckets of the query objects cached incrementally
+INCREMENTAL_CACHE_MAX_BUCKETS = 1000
+
 
 class CachedTimeOffset(TypedDict):
     df: pd.DataFrame
@@ -117,10 +131,13 @@ class QueryContextProcessor:
 
     _query_context: QueryContext
     _qc_datasource: BaseDatasource
+    _query_merge_planner: QueryMergePlanner | None
 
     def __init__(self, query_context: QueryContext):
         self._query_context = query_context
         self._qc_datasource = query_context.datasource
+        self._query_merge_planner = None
+        self._df_payloads: dict[str, dict[str, Any]] | None = None
 
     cache_type: ClassVar[str] = "df"
     enforce_numerical_metrics: ClassVar[bool] = True
@@ -135,6 +152,12 @@ class QueryContextProcessor:
             query_obj.validate()
 
         cache_key = self.query_cache_key(query_obj)
+        # the identical query objects of a payload share the data of their DataFrame,
+        # and each gets its own columns since they're renamed in place, eg, for CSV
+        if self._df_payloads is not None and cache_key in self._df_payloads:
+            payload = self._df_payloads[cache_key]
+            return {**payload, "df": payload["df"].copy(deep=False)}
+
         timeout = self.get_cache_timeout()
         force_query = self._query_context.force or timeout == CACHE_DISABLED_TIMEOUT
         cache = QueryCacheManager.get(
@@ -144,38 +167,32 @@ class QueryContextProcessor:
             force_cached=force_cached,
         )
 
-        if query_obj and cache_key and not cache.is_loaded:
-            try:
-                if invalid_columns := [
-                    col
-                    for col in get_column_names_from_columns(query_obj.columns)
-                    + get_column_names_from_metrics(query_obj.metrics or [])
-                    if (
-                        col not in self._qc_datasource.column_names
-                        and col != DTTM_ALIAS
-                    )
-                ]:
-                    raise QueryObjectValidationError(
-                        _(
-                            "Columns missing in dataset: %(invalid_columns)s",
-                            invalid_columns=invalid_columns,
-                        )
-                    )
+        # serve expired values while they're refreshed in the background
+        if (
+            cache_key
+            and cache.is_loaded
+            and timeout > 0
+            and (stale_timeout := self.get_stale_cache_timeout())
+            and cache.is_expired(timeout)
+        ):
+            cache.is_stale = True
+            self.refresh_stale_cache(stale_timeout)
 
-                query_result = self.get_query_result(query_obj)
-                annotation_data = self.get_annotation_data(query_obj)
-                cache.set_query_result(
+        if query_obj and cache_key and not cache.is_loaded:
+            coalescing_timeout = current_app.config["DATA_CACHE_COALESCING_TIMEOUT"]
+            if coalescing_timeout and not force_query:
+                # concurrent requests for the query wait for the first one to load it
+                with QueryCacheManager.coalesce(
                     key=cache_key,
-                    query_result=query_result,
-                    annotation_data=annotation_data,
-                    force_query=force_query,
-                    timeout=self.get_cache_timeout(),
-                    datasource_uid=self._qc_datasource.uid,
                     region=CacheRegion.DATA,
-                )
-            except QueryObjectValidationError as ex:
-                cache.error_message = str(ex)
-                cache.status = QueryStatus.FAILED
+                    timeout=coalescing_timeout,
+                ) as cache:
+                    if not cache.is_loaded:
+                        self._load_query_result(
+                            query_obj, cache, cache_key, force_query
+                        )
+            else:
+                self._load_query_result(query_obj, cache, cache_key, force_query)
 
         # the N-dimensional DataFrame has converted into flat DataFrame
         # by `flatten operator`, "comma" in the column is escaped by `escape_separator`
@@ -224,7 +241,7 @@ class QueryContextProcessor:
         )
         cache.df.columns = [unescape_separator(col) for col in cache.df.columns.values]
 
-        return {
+        payload = {
             "cache_key": cache_key,
             "cached_dttm": cache.cache_dttm,
             "cache_timeout": self.get_cache_timeout(),
@@ -235,15 +252,62 @@ class QueryContextProcessor:
             "annotation_data": cache.annotation_data,
             "error": cache.error_message,
             "is_cached": cache.is_cached,
+            "is_stale": cache.is_stale,
             "query": cache.query,
             "status": cache.status,
             "stacktrace": cache.stacktrace,
             "rowcount": len(cache.df.index),
             "sql_rowcount": cache.sql_rowcount,
+            "rollup": cache.rollup,
             "from_dttm": query_obj.from_dttm,
             "to_dttm": query_obj.to_dttm,
             "label_map": label_map,
         }
+        if self._df_payloads is not None and cache_key:
+            self._df_payloads[cache_key] = payload
+            return {**payload, "df": payload["df"].copy(deep=False)}
+        return payload
+
+    def _load_query_result(
+        self,
+        query_obj: QueryObject,
+        cache: QueryCacheManager,
+        cache_key: str,
+        force_query: bool,
+    ) -> None:
+        """Runs a query object and caches its result"""
+        try:
+            if invalid_columns := [
+                col
+                for col in get_column_names_from_columns(query_obj.columns)
+                + get_column_names_from_metrics(query_obj.metrics or [])
+                if (col not in self._qc_datasource.column_names and col != DTTM_ALIAS)
+            ]:
+                raise QueryObjectValidationError(
+                    _(
+                        "Columns missing in dataset: %(invalid_columns)s",
+                        invalid_columns=invalid_columns,
+                    )
+                )
+
+            query_result = self.get_query_result(query_obj)
+            annotation_data = self.get_annotation_data(query_obj)
+            timeout = self.get_cache_timeout()
+            if timeout > 0 and (stale_timeout := self.get_stale_cache_timeout()):
+                # keep the value around while it's stale
+                timeout += stale_timeout
+            cache.set_query_result(
+                key=cache_key,
+                query_result=query_result,
+                annotation_data=annotation_data,
+                force_query=force_query,
+                timeout=timeout,
+                datasource_uid=self._qc_datasource.uid,
+                region=CacheRegion.DATA,
+            )
+        except QueryObjectValidationError as ex:
+            cache.error_message = str(ex)
+            cache.status = QueryStatus.FAILED
 
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> str | None:
         """
@@ -273,11 +337,13 @@ class QueryContextProcessor:
         # support multiple queries from different data sources.
 
         query = ""
-        if isinstance(query_context.datasource, Query):
-            # todo(hugh): add logic to manage all sip68 models here
-            result = query_context.datasource.exc_query(query_object.to_dict())
-        else:
-            result = query_context.datasource.query(query_object.to_dict())
+        # the time buckets of incremental results are normalized beforehand
+        is_normalized = (
+            result := self.get_incremental_query_result(query_object)
+        ) is not None
+        if result is None:
+            result = self.query_datasource(query_object.to_dict())
+        if not isinstance(query_context.datasource, Query):
             query = result.query + ";\n\n"
 
         df = result.df
@@ -287,7 +353,8 @@ class QueryContextProcessor:
         # If the datetime format is unix, the parse will use the corresponding
         # parsing logic
         if not df.empty:
-            df = self.normalize_df(df, query_object)
+            if not is_normalized:
+                df = self.normalize_df(df, query_object)
 
             if query_object.time_offsets:
                 time_offsets = self.processing_time_offsets(df, query_object)
@@ -309,6 +376,331 @@ class QueryContextProcessor:
         result.to_dttm = query_object.to_dttm
         return result
 
+    def query_datasource(self, query_dict: dict[str, Any]) -> QueryResult:
+        """
+        Runs a query on the datasource, before any post-processing.
+
+        When `DATA_CACHE_RAW_QUERY_RESULTS` is enabled, successful results are cached
+        by their SQL, so that they're shared by the queries rendering to the same SQL.
+        """
+        datasource = self._qc_datasource
+        if isinstance(datasource, Query):
+            # todo(hugh): add logic to manage all sip68 models here
+            return datasource.exc_query(query_dict)
+
+        if self._query_merge_planner and (
+            result := self._query_merge_planner.get_query_result(
+                datasource, query_dict
+            )
+        ):
+            return result
+
+        timeout = self.get_cache_timeout()
+        if not (
+            current_app.config["DATA_CACHE_RAW_QUERY_RESULTS"]
+            and isinstance(datasource, SqlaTable)
+            and timeout != CACHE_DISABLED_TIMEOUT
+        ):
+            return datasource.query(query_dict)
+
+        # the query is compiled once, for both the cache key and running it on a miss
+        query_str_ext = datasource.get_query_str_extended(query_dict)
+        cache_key = self.raw_query_cache_key(query_dict, query_str_ext)
+        cache = QueryCacheManager.get(
+            key=cache_key,
+            region=CacheRegion.DATA,
+            force_query=self._query_context.force,
+        )
+        if cache.is_loaded:
+            current_app.config["STATS_LOGGER"].incr("loaded_raw_from_cache")
+            return QueryResult(
+                df=cache.df,
+                query=cache.query,
+                duration=timedelta(0),
+                applied_template_filters=cache.applied_template_filters,
+                applied_filter_columns=cache.applied_filter_columns,
+                rejected_filter_columns=cache.rejected_filter_columns,
+                rollup=cache.rollup,
+            )
+
+        result = datasource.query(query_dict, query_str_ext=query_str_ext)
+        if result.status != QueryStatus.FAILED:
+            # the result is post-processed in place, so it's cached beforehand
+            QueryCacheManager.set(
+                key=cache_key,
+                value={
+                    "df": result.df,
+                    "query": result.query,
+                    "applied_template_filters": result.applied_template_filters,
+                    "applied_filter_columns": result.applied_filter_columns,
+                    "rejected_filter_columns": result.rejected_filter_columns,
+                    "rollup": result.rollup,
+                },
+                timeout=timeout,
+                datasource_uid=datasource.uid,
+                region=CacheRegion.DATA,
+            )
+        return result
+
+    def raw_query_cache_key(
+        self,
+        query_dict: dict[str, Any],
+        query_str_ext: QueryStringExtended,
+    ) -> str:
+        """
+        Returns the cache key of the raw result of a query, made out of its compiled
+        SQL and of what changes its result without changing its SQL: the database,
+        the user when results are cached per user, and the labels of the columns.
+        """
+        datasource = self._qc_datasource
+        database = datasource.database
+        cache_dict = {
+            "sql": query_str_ext.prequeries + [query_str_ext.sql],
+            "database": database.id,
+            "catalog": getattr(datasource, "catalog", None),
+            "schema": datasource.schema,
+            "column_order": (query_dict.get("extras") or {}).get("column_order"),
+            "rls": security_manager.get_rls_cache_key(datasource),
+        }
+        if impersonation_key := get_impersonation_cache_key(database):
+            cache_dict["impersonation_key"] = impersonation_key
+        return md5_sha_from_dict(cache_dict, default=json_int_dttm_ser)
+
+    def get_incremental_query_result(  # noqa: C901
+        self, query_object: QueryObject
+    ) -> QueryResult | None:
+        """
+        Returns the normalized result of a query object assembled from its time
+        buckets, or `None` if the query object can't be cached incrementally.
+
+        With `incremental_cache` enabled in the `extra` of a dataset, the rows of
+        queries grouped by the time grain of their x-axis, and filtered on the same
+        column, are cached bucket by bucket, so that moving time ranges such as
+        "Last 30 days" only query the buckets missing from the cache. The buckets cut
+        by the time range, and the ones ending less than
+        `incremental_cache_mutable_period` seconds ago, are queried every time.
+
+        Buckets are never split between queries, so that they're correct for
+        non-additive metrics (eg, `COUNT(DISTINCT ...)`) too. The full query is run
+        instead when the rows don't align with the buckets, eg, because the time grain
+        of the database is shifted, or might have been truncated by the row limit.
+        The charts with their cache disabled run the full query too.
+        """
+        timeout = self.get_cache_timeout()
+        if timeout == CACHE_DISABLED_TIMEOUT or not (
+            bucketing := self.get_incremental_time_buckets(query_object)
+        ):
+            return None
+
+        time_filter_idx, buckets = bucketing
+        datasource = self._qc_datasource
+        from_dttm, to_dttm = cast(
+            tuple[datetime, datetime], get_since_until_from_query_object(query_object)
+        )
+        mutable_period = datasource.extra_dict.get("incremental_cache_mutable_period")
+        mutable_from = datetime.now() - timedelta(seconds=mutable_period or 0)
+        x_axis_label = cast(str, get_x_axis_label(query_object.columns))
+        row_limit = query_object.row_limit
+
+        bucket_dfs: list[pd.DataFrame | None] = [None] * len(buckets)
+        cache_keys: list[str | None] = [None] * len(buckets)
+        results: list[QueryResult | QueryCacheManager] = []
+        for idx, (start, end) in enumerate(buckets):
+            if start < from_dttm or end > to_dttm or end > mutable_from:
+                continue
+            cache_keys[idx] = self.query_cache_key(
+                self.get_time_bucket_query_object(
+                    query_object, time_filter_idx, start, end
+                ),
+                incremental=True,
+            )
+            cache = QueryCacheManager.get(
+                key=cache_keys[idx],
+                region=CacheRegion.DATA,
+                force_query=self._query_context.force,
+            )
+            if cache.is_loaded:
+                bucket_dfs[idx] = cache.df
+                results.append(cache)
+
+        # query the missing buckets, grouped in ranges of consecutive buckets
+        idx = 0
+        while idx < len(buckets):
+            if bucket_dfs[idx] is not None:
+                idx += 1
+                continue
+            range_end = idx
+            while range_end < len(buckets) and bucket_dfs[range_end] is None:
+                range_end += 1
+
+            result = self.query_datasource(
+                self.get_time_bucket_query_object(
+                    query_object,
+                    time_filter_idx,
+                    max(buckets[idx][0], from_dttm),
+                    min(buckets[range_end - 1][1], to_dttm),
+                ).to_dict()
+            )
+            if result.status == QueryStatus.FAILED:
+                return result
+            if row_limit and len(result.df.index) >= row_limit:
+                return None
+
+            df = result.df
+            starts = np.array(
+                [start for start, _ in buckets[idx:range_end]], dtype="datetime64[ns]"
+            )
+            if not df.empty:
+                df = self.normalize_df(df, query_object)
+                if (
+                    not dataframe_utils.is_datetime_series(df.get(x_axis_label))
+                    or df[x_axis_label].dt.tz is not None
+                ):
+                    return None
+                timestamps = df[x_axis_label].to_numpy(dtype="datetime64[ns]")
+                positions = np.searchsorted(starts, timestamps, side="right") - 1
+                if (positions < 0).any() or (starts[positions] != timestamps).any():
+                    current_app.config["STATS_LOGGER"].incr(
+                        "incremental_cache_misaligned"
+                    )
+                    return None
+            else:
+                positions = np.array([], dtype=int)
+
+            for position in range(range_end - idx):
+                bucket_df = df[positions == position].reset_index(drop=True)
+                bucket_dfs[idx + position] = bucket_df
+                QueryCacheManager.set(
+                    key=cache_keys[idx + position],
+                    value={
+                        "df": bucket_df,
+                        "query": result.query,
+                        "applied_template_filters": result.applied_template_filters,
+                        "applied_filter_columns": result.applied_filter_columns,
+                        "rejected_filter_columns": result.rejected_filter_columns,
+                    },
+                    timeout=timeout,
+                    datasource_uid=datasource.uid,
+                    region=CacheRegion.DATA,
+                )
+            results.append(result)
+            idx = range_end
+
+        dfs = [df for df in bucket_dfs if df is not None and not df.empty]
+        df = (
+            pd.concat(dfs, ignore_index=True)
+            if dfs
+            else cast(pd.DataFrame, bucket_dfs[0])
+        )
+        if row_limit and len(df.index) > row_limit:
+            return None
+
+        if query_object.orderby:
+            labels = [
+                get_metric_name(cast(Metric, col))
+                if is_adhoc_metric(cast(Metric, col))
+                else get_column_name(cast(Column, col))
+                for col, _ in query_object.orderby
+            ]
+            if not set(labels).issubset(df.columns):
+                return None
+            df = df.sort_values(
+                labels,
+                ascending=[ascending for _, ascending in query_object.orderby],
+                kind="stable",
+                ignore_index=True,
+            )
+
+        current_app.config["STATS_LOGGER"].incr("loaded_incrementally")
+        return QueryResult(
+            df=df,
+            query=";\n\n".join(dict.fromkeys(result.query for result in results)),
+            duration=sum(
+                (
+                    result.duration
+                    for result in results
+                    if isinstance(result, QueryResult)
+                ),
+                timedelta(0),
+            ),
+            applied_template_filters=results[0].applied_template_filters,
+            applied_filter_columns=results[0].applied_filter_columns,
+            rejected_filter_columns=results[0].rejected_filter_columns,
+        )
+
+    def get_incremental_time_buckets(
+        self, query_object: QueryObject
+    ) -> tuple[int, list[tuple[datetime, datetime]]] | None:
+        """
+        Returns the index of the time filter and the time buckets of a query object
+        that can be cached incrementally, or `None`.
+        """
+        datasource = self._qc_datasource
+        if (
+            isinstance(datasource, Query)
+            or not getattr(datasource, "extra_dict", {}).get("incremental_cache")
+            or query_object.is_timeseries
+            or query_object.is_rowcount
+            or query_object.series_limit
+            or query_object.row_offset
+        ):
+            return None
+
+        x_axis = get_base_axis_columns(query_object.columns)
+        if len(x_axis) != 1:
+            return None
+        x_axis_column = cast(AdhocColumn, x_axis[0])
+        time_grain = x_axis_column.get("timeGrain")
+        if time_grain not in TIME_GRAIN_PERIODS:
+            return None
+
+        # the time range must be filtered on the x-axis
+        column_name = x_axis_column["sqlExpression"]
+        time_filters = [
+            idx
+            for idx, flt in enumerate(query_object.filter)
+            if flt.get("op") == FilterOperator.TEMPORAL_RANGE
+        ]
+        if (
+            len(time_filters) != 1
+            or query_object.filter[time_filters[0]].get("col") != column_name
+            or query_object.granularity not in {None, column_name}
+        ):
+            return None
+
+        from_dttm, to_dttm = get_since_until_from_query_object(query_object)
+        if not from_dttm or not to_dttm or from_dttm >= to_dttm:
+            return None
+
+        buckets = get_time_buckets(from_dttm, to_dttm, time_grain)
+        if len(buckets) > INCREMENTAL_CACHE_MAX_BUCKETS:
+            return None
+        return time_filters[0], buckets
+
+    @staticmethod
+    def get_time_bucket_query_object(
+        query_object: QueryObject,
+        time_filter_idx: int,
+        from_dttm: datetime,
+        to_dttm: datetime,
+    ) -> QueryObject:
+        """
+        Returns a copy of a query object restricted to a time range, without
+        post-processing.
+        """
+        query_object_clone = copy.copy(query_object)
+        query_object_clone.time_range = None
+        query_object_clone.from_dttm = from_dttm
+        query_object_clone.to_dttm = to_dttm
+        query_object_clone.inner_from_dttm = None
+        query_object_clone.inner_to_dttm = None
+        query_object_clone.post_processing = []
+        query_object_clone.time_offsets = []
+        query_object_clone.annotation_layers = []
+        query_object_clone.filter = copy.deepcopy(query_object.filter)
+        query_object_clone.filter[time_filter_idx]["val"] = f"{from_dttm} : {to_dttm}"
+        return query_object_clone
+
     def normalize_df(self, df: pd.DataFrame, query_object: QueryObject) -> pd.DataFrame:
         # todo: should support "python_date_format" and "get_column" in each datasource
         def _get_timestamp_format(
@@ -469,11 +861,12 @@ class QueryContextProcessor:
         absolute date range offsets (e.g., "2015-01-03 : 2015-01-04").
         """
         query_context = self._query_context
-        # ensure query_object is immutable
-        query_object_clone = copy.copy(query_object)
-        queries: list[str] = []
-        cache_keys: list[str | None] = []
+        queries: list[str] = [""] * len(query_object.time_offsets)
+        cache_keys: list[str | None] = [None] * len(query_object.time_offsets)
         offset_dfs: dict[str, pd.DataFrame] = {}
+        pending_offsets: list[
+            tuple[int, str, str, QueryObject, QueryCacheManager, str | None]
+        ] = []
 
         outer_from_dttm, outer_to_dttm = get_since_until_from_query_object(query_object)
         if not outer_from_dttm or not outer_to_dttm:
@@ -489,7 +882,10 @@ class QueryContextProcessor:
         # use columns that are not metrics as join keys
         join_keys = [col for col in df.columns if col not in metric_names]
 
-        for offset in query_object.time_offsets:
+        for idx, offset in enumerate(query_object.time_offsets):
+            # ensure query_object is immutable, and that the query of each offset,
+            # hence its cache key, doesn't depend on the other offsets
+            query_object_clone = copy.copy(query_object)
             try:
                 original_offset = offset
                 is_date_range_offset = self.is_valid_date_range(offset)
@@ -664,17 +1060,18 @@ class QueryContextProcessor:
 
             if cache.is_loaded:
                 offset_dfs[offset] = cache.df
-                queries.append(cache.query)
-                cache_keys.append(cache_key)
+                queries[idx] = cache.query
+                cache_keys[idx] = cache_key
                 continue
 
-            query_object_clone_dct = query_object_clone.to_dict()
+            pending_offsets.append(
+                (idx, offset, original_offset, query_object_clone, cache, cache_key)
+            )
 
-            # rename metrics: SUM(value) => SUM(value) 1 year ago
-            metrics_mapping = {
-                metric: TIME_COMPARISON.join([metric, original_offset])
-                for metric in metric_names
-            }
+        # the offsets missing from the cache are queried concurrently
+        query_object_clone_dcts = []
+        for _, _, _, query_object_clone, _, _ in pending_offsets:
+            query_object_clone_dct = query_object_clone.to_dict()
 
             # When the original query has limit or offset we wont apply those
             # to the subquery so we prevent data inconsistency due to missing records
@@ -682,14 +1079,31 @@ class QueryContextProcessor:
             if query_object.row_limit or query_object.row_offset:
                 query_object_clone_dct["row_limit"] = current_app.config["ROW_LIMIT"]
                 query_object_clone_dct["row_offset"] = 0
+            query_object_clone_dcts.append(query_object_clone_dct)
+
+        if len(query_object_clone_dcts) > 1:
+            self.load_state()
+        results = map_concurrently(
+            self.query_datasource,
+            query_object_clone_dcts,
+            max_workers=self.get_max_query_workers(),
+        )
 
-            if isinstance(self._qc_datasource, Query):
-                result = self._qc_datasource.exc_query(query_object_clone_dct)
-            else:
-                result = self._qc_datasource.query(query_object_clone_dct)
+        for (
+            idx,
+            offset,
+            original_offset,
+            query_object_clone,
+            cache,
+            cache_key,
+        ), result in zip(pending_offsets, results):
+            queries[idx] = result.query
 
-            queries.append(result.query)
-            cache_keys.append(None)
+            # rename metrics: SUM(value) => SUM(value) 1 year ago
+            metrics_mapping = {
+                metric: TIME_COMPARISON.join([metric, original_offset])
+                for metric in metric_names
+            }
 
             offset_metrics_df = result.df
             if offset_metrics_df.empty:
@@ -989,7 +1403,7 @@ class QueryContextProcessor:
 
     def get_data(
         self, df: pd.DataFrame, coltypes: list[GenericDataType]
-    ) -> str | list[dict[str, Any]]:
+    ) -> str | bytes | Iterator[bytes] | list[dict[str, Any]]:
         if self._query_context.result_format in ChartDataResultFormat.table_like():
             include_index = not isinstance(df.index, pd.RangeIndex)
             columns = list(df.columns)
@@ -997,6 +1411,13 @@ class QueryContextProcessor:
             if verbose_map:
                 df.columns = [verbose_map.get(column, column) for column in columns]
 
+            # post-processed results are transformed by the API, so they need to be
+            # in memory
+            chunk_size = current_app.config["CHART_DATA_EXPORT_CHUNK_SIZE"]
+            result_type = self._query_context.result_type
+            if chunk_size and result_type != ChartDataResultType.POST_PROCESSED:
+                return self.get_data_chunks(df, coltypes, include_index, chunk_size)
+
             result = None
             if self._query_context.result_format == ChartDataResultFormat.CSV:
                 result = csv.df_to_escaped_csv(
@@ -1009,6 +1430,27 @@ class QueryContextProcessor:
 
         return df.to_dict(orient="records")
 
+    def get_data_chunks(
+        self,
+        df: pd.DataFrame,
+        coltypes: list[GenericDataType],
+        include_index: bool,
+        chunk_size: int,
+    ) -> Iterator[bytes]:
+        """
+        Return an iterator over the encoded CSV or XLSX file, for streaming exports.
+        """
+        if self._query_context.result_format == ChartDataResultFormat.CSV:
+            return csv.df_to_escaped_csv_chunks(
+                df,
+                chunk_size,
+                index=include_index,
+                **current_app.config["CSV_EXPORT"],
+            )
+
+        excel.apply_column_types(df, coltypes)
+        return excel.df_to_excel_chunks(df, **current_app.config["EXCEL_EXPORT"])
+
     def ensure_totals_available(self) -> None:
         queries_needing_totals = []
         totals_queries = []
@@ -1036,8 +1478,8 @@ class QueryContextProcessor:
 
         totals_query.row_limit = None
 
-        result = self._query_context.get_query_result(totals_query)
-        df = result.df
+        # the totals query is cached, so it isn't run again with the other queries
+        df = self.get_df_payload(totals_query)["df"]
 
         totals = {
             col: df[col].sum() for col in df.columns if df[col].dtype.kind in "biufc"
@@ -1054,20 +1496,28 @@ class QueryContextProcessor:
         self,
         cache_query_context: bool | None = False,
         force_cached: bool = False,
+        query_merge_planner: QueryMergePlanner | None = None,
     ) -> dict[str, Any]:
-        """Returns the query results with both metadata and data"""
+        """
+        Returns the query results with both metadata and data.
 
-        self.ensure_totals_available()
+        With `CHART_DATA_MERGE_QUERIES`, the query objects differing only by their
+        metrics are merged, across the query contexts sharing `query_merge_planner`.
+        """
+        if (
+            query_merge_planner is None
+            and current_app.config["CHART_DATA_MERGE_QUERIES"]
+        ):
+            query_merge_planner = QueryMergePlanner()
+            for query_obj in self._query_context.queries:
+                query_merge_planner.add_query_object(self._qc_datasource, query_obj)
+        self._query_merge_planner = query_merge_planner
 
-        query_results = [
-            get_query_results(
-                query_obj.result_type or self._query_context.result_type,
-                self._query_context,
-                query_obj,
-                force_cached,
-            )
-            for query_obj in self._query_context.queries
-        ]
+        self._df_payloads = {}
+        try:
+            query_results = self._get_query_results(force_cached)
+        finally:
+            self._df_payloads = None
 
         return_value = {"queries": query_results}
 
@@ -1091,6 +1541,64 @@ class QueryContextProcessor:
 
         return return_value
 
+    def _get_query_results(self, force_cached: bool) -> list[dict[str, Any]]:
+        """
+        Returns the results of the query objects, running the unique ones
+        concurrently.
+
+        The identical query objects are run once, and the payloads of the duplicates
+        are built again from the same DataFrame, since the data of some result
+        formats, eg, chunked CSV exports, can only be read once.
+        """
+
+        def get_results(query_obj: QueryObject) -> dict[str, Any]:
+            return get_query_results(
+                query_obj.result_type or self._query_context.result_type,
+                self._query_context,
+                query_obj,
+                force_cached,
+            )
+
+        self.ensure_totals_available()
+
+        queries = self._query_context.queries
+        query_keys = [self.query_object_key(query_obj) for query_obj in queries]
+        unique_queries = dict(zip(query_keys, queries))
+        if len(unique_queries) > 1:
+            self.load_state()
+        results = dict(
+            zip(
+                unique_queries,
+                map_concurrently(
+                    get_results,
+                    list(unique_queries.values()),
+                    max_workers=self.get_max_query_workers(),
+                ),
+            )
+        )
+        return [
+            results.pop(key) if key in results else get_results(query_obj)
+            for key, query_obj in zip(query_keys, queries)
+        ]
+
+    def query_object_key(self, query_obj: QueryObject) -> str:
+        """
+        Returns a key identifying the result of a query object in the query context.
+        """
+        return md5_sha_from_dict(
+            {
+                "result_type": query_obj.result_type
+                or self._query_context.result_type,
+                "query_object": query_obj.to_dict(),
+                "time_range": query_obj.time_range,
+                "post_processing": query_obj.post_processing,
+                "time_offsets": query_obj.time_offsets,
+                "annotation_layers": query_obj.annotation_layers,
+            },
+            default=json_int_dttm_ser,
+            ignore_nan=True,
+        )
+
     def get_cache_timeout(self) -> int:
         if cache_timeout_rv := self._query_context.get_cache_timeout():
             return cache_timeout_rv
@@ -1102,6 +1610,68 @@ class QueryContextProcessor:
             return data_cache_timeout
         return current_app.config["CACHE_DEFAULT_TIMEOUT"]
 
+    def get_stale_cache_timeout(self) -> int | None:
+        if (stale_timeout := self._query_context.get_stale_cache_timeout()) is not None:
+            return stale_timeout
+        return current_app.config["DATA_CACHE_STALE_TIMEOUT"]
+
+    def load_state(self) -> None:
+        """
+        Loads the state of the datasource, and of the user, used by the queries, so
+        that they can run in worker threads.
+        """
+        if self.get_max_query_workers() <= 1:
+            return
+
+        load_orm_state(self._qc_datasource, "columns", "metrics", "database")
+        if user := g.get("user"):
+            load_orm_state(user, "roles", "groups")
+            security_manager.get_user_roles(user)
+
+    def get_max_query_workers(self) -> int:
+        """
+        Returns the number of queries of the datasource that can run concurrently.
+        """
+        max_workers = current_app.config["CHART_DATA_QUERY_MAX_WORKERS"]
+        if max_workers > 1 and not isinstance(self._qc_datasource, Query):
+            database = self._qc_datasource.database
+            if max_concurrent_queries := database.max_concurrent_queries:
+                max_workers = min(max_workers, max_concurrent_queries)
+        return max_workers
+
+    def refresh_stale_cache(self, stale_timeout: int) -> None:
+        """
+        Refresh the stale cache values of the query context in a Celery task, unless
+        it's already being refreshed.
+
+        The task runs all the queries of the query context again, so it's queued once
+        per query context rather than once per stale query object.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.tasks.async_queries import refresh_chart_data_cache
+
+        cache_key = self.cache_key()
+        if not QueryCacheManager.acquire_refresh(
+            cache_key, stale_timeout, CacheRegion.DATA
+        ):
+            return
+
+        job_metadata: dict[str, Any] = {"user_id": get_user_id()}
+        if guest_user := security_manager.get_current_guest_user_if_guest():
+            job_metadata["guest_token"] = guest_user.guest_token
+        form_data = {
+            "form_data": self._query_context.form_data,
+            "custom_cache_timeout": self._query_context.custom_cache_timeout,
+            **self._query_context.cache_values,
+            "force": True,
+        }
+        try:
+            refresh_chart_data_cache.delay(job_metadata, form_data, cache_key)
+            current_app.config["STATS_LOGGER"].incr("refreshing_stale_cache")
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not refresh cache key %s", cache_key, exc_info=True)
+            QueryCacheManager.release_refresh(cache_key, CacheRegion.DATA)
+
     def cache_key(self, **extra: Any) -> str:
         """
         The QueryContext cache key is made out of the key/values from
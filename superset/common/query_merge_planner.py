@@ -0,0 +1,161 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import copy
+import threading
+from dataclasses import dataclass, field
+from typing import Any, TYPE_CHECKING
+
+from flask import current_app
+
+from superset.common.db_query_status import QueryStatus
+from superset.models.helpers import QueryResult
+from superset.superset_typing import Metric
+from superset.utils.core import get_metric_name
+from superset.utils.hashing import md5_sha_from_dict
+from superset.utils.json import json_int_dttm_ser
+
+if TYPE_CHECKING:
+    from superset.common.query_object import QueryObject
+    from superset.connectors.sqla.models import BaseDatasource
+
+
+@dataclass
+class MergedQuery:
+    """
+    The query objects of a datasource differing only by their metrics.
+    """
+
+    metrics: dict[str, Metric] = field(default_factory=dict)
+    metric_sets: set[frozenset[str]] = field(default_factory=set)
+    first_metric: str | None = None
+    is_mergeable: bool = True
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    result: QueryResult | None = None
+    is_loaded: bool = False
+
+
+class QueryMergePlanner:
+    """
+    Merges the query objects differing only by their metrics, eg, the charts of a
+    dashboard showing different KPIs of the same dataset with the same filters.
+
+    The query objects are registered with `add_query_object` before they run. The
+    first query of a group of query objects with different metrics then selects the
+    metrics of all of them, and the others are served from its result, keeping only
+    their own metrics.
+    """
+
+    def __init__(self) -> None:
+        self._merged_queries: dict[str, MergedQuery] = {}
+
+    @staticmethod
+    def get_merge_key(datasource: BaseDatasource, query_dict: dict[str, Any]) -> str:
+        return md5_sha_from_dict(
+            {
+                "datasource": datasource.uid,
+                **query_dict,
+                "metrics": None,
+            },
+            default=json_int_dttm_ser,
+            ignore_nan=True,
+        )
+
+    def add_query_object(
+        self,
+        datasource: BaseDatasource,
+        query_object: QueryObject,
+    ) -> None:
+        """
+        Registers a query object that might be merged with the others.
+        """
+        if not query_object.metrics or query_object.is_rowcount:
+            return
+
+        key = self.get_merge_key(datasource, query_object.to_dict())
+        merged_query = self._merged_queries.setdefault(key, MergedQuery())
+        for metric in query_object.metrics:
+            label = get_metric_name(metric)
+            # metrics with the same label must be the same
+            if merged_query.metrics.setdefault(label, metric) != metric:
+                merged_query.is_mergeable = False
+        merged_query.metric_sets.add(
+            frozenset(get_metric_name(metric) for metric in query_object.metrics)
+        )
+
+        # the series are limited by the first metric, unless another one is set, so
+        # the queries are only merged if their first metric is the same
+        first_metric = get_metric_name(query_object.metrics[0])
+        if merged_query.first_metric is None:
+            merged_query.first_metric = first_metric
+        elif (
+            query_object.series_limit
+            and not query_object.series_limit_metric
+            and merged_query.first_metric != first_metric
+        ):
+            merged_query.is_mergeable = False
+
+    def get_query_result(
+        self,
+        datasource: BaseDatasource,
+        query_dict: dict[str, Any],
+    ) -> QueryResult | None:
+        """
+        Returns the result of a query from the merged query of its group, or `None`
+        if the query isn't merged with others.
+        """
+        if not query_dict.get("metrics") or query_dict.get("is_rowcount"):
+            return None
+
+        merged_query = self._merged_queries.get(
+            self.get_merge_key(datasource, query_dict)
+        )
+        labels = [get_metric_name(metric) for metric in query_dict["metrics"]]
+        if (
+            not merged_query
+            or not merged_query.is_mergeable
+            or len(merged_query.metric_sets) < 2
+            or not set(labels).issubset(merged_query.metrics)
+        ):
+            return None
+
+        with merged_query.lock:
+            if not merged_query.is_loaded:
+                result = datasource.query(
+                    {**query_dict, "metrics": list(merged_query.metrics.values())}
+                )
+                merged_query.is_loaded = True
+                if result.status != QueryStatus.FAILED:
+                    merged_query.result = result
+                    current_app.config["STATS_LOGGER"].incr("merged_query")
+
+        # failed queries run on their own, to report their own errors
+        if merged_query.result is None:
+            return None
+
+        # the metrics of the query replace the ones of the merged query, in order
+        columns: list[str] = []
+        for col in merged_query.result.df.columns:
+            if col not in merged_query.metrics:
+                columns.append(col)
+            elif labels[0] not in columns:
+                columns.extend(labels)
+
+        result = copy.copy(merged_query.result)
+        result.df = merged_query.result.df[columns]
+        return result
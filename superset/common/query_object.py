@@ -51,6 +51,7 @@ from superset.utils.json import json_int_dttm_ser
 
 if TYPE_CHECKING:
     from superset.connectors.sqla.models import BaseDatasource
+    from superset.models.core import Database
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +59,26 @@ logger = logging.getLogger(__name__)
 #  https://github.com/python/mypy/issues/5288
 
 
+def get_impersonation_cache_key(database: Database) -> Any:
+    """
+    Returns the key identifying the current user in the cache keys of queries on a
+    database, if results must be cached per user: when the database impersonates users
+    and the CACHE_IMPERSONATION flag is on, when the CACHE_QUERY_BY_USER flag is on, or
+    when per_user_caching is enabled on the database.
+    """
+    extra = json.loads(database.extra or "{}")
+    if (
+        (
+            feature_flag_manager.is_feature_enabled("CACHE_IMPERSONATION")
+            and database.impersonate_user
+        )
+        or feature_flag_manager.is_feature_enabled("CACHE_QUERY_BY_USER")
+        or extra.get("per_user_caching", False)
+    ):
+        return database.db_engine_spec.get_impersonation_key(getattr(g, "user", None))
+    return None
+
+
 class DeprecatedField(NamedTuple):
     old_name: str
     new_name: str
@@ -458,23 +479,12 @@ class QueryObject:  # pylint: disable=too-many-instance-attributes
         #  the database
         try:
             database = self.datasource.database  # type: ignore
-            extra = json.loads(database.extra or "{}")
-            if (
-                (
-                    feature_flag_manager.is_feature_enabled("CACHE_IMPERSONATION")
-                    and database.impersonate_user
+            if key := get_impersonation_cache_key(database):
+                logger.debug(
+                    "Adding impersonation key to QueryObject cache dict: %s", key
                 )
-                or feature_flag_manager.is_feature_enabled("CACHE_QUERY_BY_USER")
-                or extra.get("per_user_caching", False)
-            ):
-                if key := database.db_engine_spec.get_impersonation_key(
-                    getattr(g, "user", None)
-                ):
-                    logger.debug(
-                        "Adding impersonation key to QueryObject cache dict: %s", key
-                    )
 
-                    cache_dict["impersonation_key"] = key
+                cache_dict["impersonation_key"] = key
         except AttributeError:
             # datasource or database do not exist
             pass
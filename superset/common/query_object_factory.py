@@ -40,14 +40,17 @@ if TYPE_CHECKING:
 class QueryObjectFactory:  # pylint: disable=too-few-public-methods
     _config: dict[str, Any]
     _datasource_dao: DatasourceDAO
+    _datasources: dict[tuple[str, Any], BaseDatasource] | None
 
     def __init__(
         self,
         app_configurations: dict[str, Any],
         _datasource_dao: DatasourceDAO,
+        datasources: dict[tuple[str, Any], BaseDatasource] | None = None,
     ):
         self._config = app_configurations
         self._datasource_dao = _datasource_dao
+        self._datasources = datasources
 
     def create(  # pylint: disable=too-many-arguments
         self,
@@ -89,10 +92,17 @@ class QueryObjectFactory:  # pylint: disable=too-few-public-methods
         )
 
     def _convert_to_model(self, datasource: DatasourceDict) -> BaseDatasource:
-        return self._datasource_dao.get_datasource(
+        key = (datasource["type"], datasource["id"])
+        if self._datasources is not None and key in self._datasources:
+            return self._datasources[key]
+
+        datasource_model_instance = self._datasource_dao.get_datasource(
             datasource_type=DatasourceType(datasource["type"]),
             database_id_or_uuid=datasource["id"],
         )
+        if self._datasources is not None:
+            self._datasources[key] = datasource_model_instance
+        return datasource_model_instance
 
     def _process_extras(
         self,
@@ -17,6 +17,10 @@
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from typing import Any
 
 from flask import current_app
@@ -25,13 +29,14 @@ from pandas import DataFrame
 
 from superset.common.db_query_status import QueryStatus
 from superset.constants import CacheRegion
-from superset.exceptions import CacheLoadError
+from superset.exceptions import CacheLoadError, DataFrameCodecDecodeException
 from superset.extensions import cache_manager
 from superset.models.helpers import QueryResult
 from superset.stats_logger import BaseStatsLogger
 from superset.superset_typing import Column
 from superset.utils.cache import set_and_log_cache
 from superset.utils.core import error_msg_from_exception, get_stacktrace
+from superset.utils.dataframe_codec import decode_dataframe, encode_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +72,8 @@ class QueryCacheManager:
         cache_dttm: str | None = None,
         cache_value: dict[str, Any] | None = None,
         sql_rowcount: int | None = None,
+        is_stale: bool = False,
+        rollup: str | None = None,
     ) -> None:
         self.df = df
         self.query = query
@@ -83,6 +90,17 @@ class QueryCacheManager:
         self.cache_dttm = cache_dttm
         self.cache_value = cache_value
         self.sql_rowcount = sql_rowcount
+        self.is_stale = is_stale
+        self.rollup = rollup
+
+    def is_expired(self, timeout: int) -> bool:
+        """
+        Whether the cached value is older than ``timeout`` seconds
+        """
+        if not self.cache_dttm:
+            return False
+        cached_at = datetime.fromisoformat(self.cache_dttm)
+        return datetime.utcnow() - cached_at >= timedelta(seconds=timeout)
 
     # pylint: disable=too-many-arguments
     def set_query_result(
@@ -107,6 +125,7 @@ class QueryCacheManager:
             self.error_message = query_result.error_message
             self.df = query_result.df
             self.sql_rowcount = query_result.sql_rowcount
+            self.rollup = query_result.rollup
             self.annotation_data = {} if annotation_data is None else annotation_data
 
             if self.status != QueryStatus.FAILED:
@@ -125,6 +144,7 @@ class QueryCacheManager:
                 "rejected_filter_columns": self.rejected_filter_columns,
                 "annotation_data": self.annotation_data,
                 "sql_rowcount": self.sql_rowcount,
+                "rollup": self.rollup,
             }
             if self.is_loaded and key and self.status != QueryStatus.FAILED:
                 self.set(
@@ -160,7 +180,9 @@ class QueryCacheManager:
             logger.debug("Cache key: %s", key)
             current_app.config["STATS_LOGGER"].incr("loading_from_cache")
             try:
-                query_cache.df = cache_value["df"]
+                query_cache.df = decode_dataframe(
+                    cache_value["df"], current_app.config["DATA_CACHE_DATAFRAME_CODEC"]
+                )
                 query_cache.query = cache_value["query"]
                 query_cache.annotation_data = cache_value.get("annotation_data", {})
                 query_cache.applied_template_filters = cache_value.get(
@@ -176,12 +198,13 @@ class QueryCacheManager:
                 query_cache.is_loaded = True
                 query_cache.is_cached = cache_value is not None
                 query_cache.sql_rowcount = cache_value.get("sql_rowcount", None)
+                query_cache.rollup = cache_value.get("rollup")
                 query_cache.cache_dttm = (
                     cache_value["dttm"] if cache_value is not None else None
                 )
                 query_cache.cache_value = cache_value
                 current_app.config["STATS_LOGGER"].incr("loaded_from_cache")
-            except KeyError as ex:
+            except (KeyError, DataFrameCodecDecodeException) as ex:
                 logger.exception(ex)
                 logger.error(
                     "Error reading cache: %s",
@@ -197,6 +220,67 @@ class QueryCacheManager:
             raise CacheLoadError("Error loading data from cache")
         return query_cache
 
+    @classmethod
+    @contextmanager
+    def coalesce(
+        cls,
+        key: str,
+        timeout: int,
+        region: CacheRegion = CacheRegion.DEFAULT,
+        poll_interval: float = 0.1,
+    ) -> Iterator[QueryCacheManager]:
+        """
+        Coalesce concurrent loads of a key missing from the cache.
+
+        The first caller takes a lease on the key and gets an empty cache manager, to
+        load and cache the value itself; the lease is released when the context exits.
+        The other callers wait up to ``timeout`` seconds for the value to be cached and
+        get it as soon as it is. If the lease is released without a value they take it
+        over, and if the wait times out they get an empty cache manager.
+        """
+        stats_logger = current_app.config["STATS_LOGGER"]
+        lease_key = f"{key}__lease"
+        deadline = time.monotonic() + timeout
+        while True:
+            # `add` is atomic in the shared backends, eg, `SET NX` on Redis
+            if _cache[region].add(lease_key, True, timeout=timeout):
+                stats_logger.incr("coalescing_leader")
+                try:
+                    yield cls()
+                finally:
+                    _cache[region].delete(lease_key)
+                return
+
+            query_cache = cls.get(key, region)
+            if query_cache.is_loaded:
+                stats_logger.incr("coalesced")
+                yield query_cache
+                return
+
+            if time.monotonic() >= deadline:
+                logger.warning("Timed out waiting for cache key %s to be loaded", key)
+                stats_logger.incr("coalescing_timeout")
+                yield cls()
+                return
+
+            time.sleep(poll_interval)
+
+    @staticmethod
+    def acquire_refresh(
+        key: str,
+        timeout: int,
+        region: CacheRegion = CacheRegion.DEFAULT,
+    ) -> bool:
+        """
+        Flag a key as being refreshed for up to ``timeout`` seconds, returning
+        ``False`` if it already is
+        """
+        return bool(_cache[region].add(f"{key}__refresh", True, timeout=timeout))
+
+    @staticmethod
+    def release_refresh(key: str, region: CacheRegion = CacheRegion.DEFAULT) -> None:
+        _cache[region].delete(f"{key}__refresh")
+
     @staticmethod
     def set(
         key: str | None,
@@ -209,6 +293,15 @@ class QueryCacheManager:
         set value to specify cache region, proxy for `set_and_log_cache`
         """
         if key:
+            if "df" in value:
+                value = {
+                    **value,
+                    "df": encode_dataframe(
+                        value["df"],
+                        current_app.config["DATA_CACHE_DATAFRAME_CODEC"],
+                        current_app.config["DATA_CACHE_COMPRESSION"],
+                    ),
+                }
             set_and_log_cache(_cache[region], key, value, timeout, datasource_uid)
 
     @staticmethod
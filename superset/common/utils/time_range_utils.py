@@ -19,9 +19,11 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, cast
 
+import pandas as pd
 from flask import current_app
 
 from superset.common.query_object import QueryObject
+from superset.constants import TimeGrain
 from superset.utils.core import FilterOperator
 from superset.utils.date_parser import get_since_until
 
@@ -77,3 +79,35 @@ def get_since_until_from_query_object(
         time_shift=query_object.time_shift,
         extras=query_object.extras,
     )
+
+
+# pandas period frequencies of the time grains whose buckets can be computed
+TIME_GRAIN_PERIODS: dict[str, str] = {
+    TimeGrain.SECOND: "s",
+    TimeGrain.MINUTE: "min",
+    TimeGrain.HOUR: "h",
+    TimeGrain.DAY: "D",
+    TimeGrain.MONTH: "M",
+    TimeGrain.QUARTER: "Q",
+    TimeGrain.YEAR: "Y",
+}
+
+
+def get_time_buckets(
+    from_dttm: datetime,
+    to_dttm: datetime,
+    time_grain: str,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Returns the bounds of the time buckets of a time grain overlapping a time range.
+
+    The first and last buckets may start before `from_dttm` and end after `to_dttm`,
+    eg, the daily buckets of 2024-01-01 12:00 to 2024-01-03 00:00 are the ones of
+    January 1st and 2nd.
+    """
+    periods = pd.period_range(from_dttm, to_dttm, freq=TIME_GRAIN_PERIODS[time_grain])
+    return [
+        (period.start_time.to_pydatetime(), (period + 1).start_time.to_pydatetime())
+        for period in periods
+        if period.start_time < to_dttm
+    ]
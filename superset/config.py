@@ -74,6 +74,7 @@ if TYPE_CHECKING:
     from superset.models.core import Database
     from superset.models.dashboard import Dashboard
     from superset.models.slice import Slice
+    from superset.utils.dataframe_codec import DataFrameCodec
 
     DialectExtensions = dict[str, Dialects | type[Dialect]]
 
@@ -652,6 +653,103 @@ SSH_TUNNEL_LOCAL_BIND_ADDRESS = "127.0.0.1"
 SSH_TUNNEL_TIMEOUT_SEC = 10.0
 #: Timeout (seconds) for transport socket (``socket.settimeout``)
 SSH_TUNNEL_PACKET_TIMEOUT_SEC = 1.0
+# To share the SSH tunnels across queries, instead of opening a tunnel for each query,
+# use "superset.extensions.ssh.PooledSSHManager" as SSH_TUNNEL_MANAGER_CLASS.
+#: Timeout (seconds) after which the unused shared tunnels are closed
+SSH_TUNNEL_POOL_IDLE_TIMEOUT_SEC = 300.0
+#: Interval (seconds) of the keepalive packets of the shared tunnels
+SSH_TUNNEL_KEEPALIVE_SEC = 30.0
+
+# ------------------------------
+# Database engine pool
+# ------------------------------
+# By default, a new SQLAlchemy engine, without a connection pool, is created for each
+# query to an analytical database, so that each query opens a new connection. When
+# enabled, the engines are kept with their connections across queries, for the
+# databases not setting a `poolclass` in their engine parameters, nor connecting
+# through an SSH tunnel. The size of the pools can be set with the `pool_size` and
+# `max_overflow` engine parameters of the databases.
+DB_ENGINE_POOL_ENABLED = False
+DB_ENGINE_POOL_CLASS = "superset.extensions.engine_pool.EnginePool"
+#: Maximum number of engines kept, the least recently used ones are disposed
+DB_ENGINE_POOL_MAX_ENGINES = 100
+#: Timeout (seconds) after which unused engines are disposed
+DB_ENGINE_POOL_IDLE_TIMEOUT_SEC = 300
+
+# ------------------------------
+# Database admission control
+# ------------------------------
+# Limits the concurrent queries of the databases setting an `admission_control`
+# object in their extra, eg, `{"slots": {"dashboard": 8, "sql_lab": 2}}`, with the
+# slots of the dashboard, explore, sql_lab, alert and warmup workloads. The queries
+# waiting for a slot are admitted by the priority of their workload, in that order,
+# then favoring the users running the fewest queries. The total of the slots is also
+# limited by the `max_concurrent_queries` of the databases. The slots are shared
+# across the workers through Redis, which is required for the limits to apply.
+DB_ADMISSION_CONTROL_CLASS = "superset.extensions.admission_control.AdmissionController"
+DB_ADMISSION_CONTROL_REDIS_URL: str | None = None
+#: Default timeout (seconds) after which a query waiting for a slot is rejected, it
+#: can be set with the `max_wait` of the `admission_control` of the databases
+DB_ADMISSION_CONTROL_MAX_WAIT_SEC = 30
+#: Duration (seconds) after which the slots of dead workers are released, it must
+#: be longer than the queries
+DB_ADMISSION_CONTROL_LEASE_SEC = 3600
+
+# ------------------------------
+# Chart query cancellation
+# ------------------------------
+# When enabled, the chart queries running in the databases are cancelled when their
+# results aren't needed anymore: when the client of a chart data request disconnects,
+# eg, because the user navigated away or changed a filter, or when an async chart
+# data job is cancelled. It's supported by the engine specs implementing
+# `get_cancel_query_id` and `cancel_query`, at the cost of a query to get the id of
+# each chart query, eg, the id of its connection.
+CHART_QUERY_CANCELLATION_ENABLED = False
+CHART_QUERY_CANCELLATION_CLASS = "superset.extensions.query_canceller.QueryCanceller"
+#: Interval (seconds) at which the running chart queries are checked
+CHART_QUERY_CANCELLATION_POLL_SEC = 1.0
+
+# ------------------------------
+# Compiled query cache
+# ------------------------------
+# When enabled, the SQL of the chart queries, and their extra cache keys, are cached
+# in each process, so that the same queries, eg, of a busy dashboard, aren't built,
+# rendered and compiled again. They are keyed by the dataset, its columns, metrics and
+# database, with their last changes, the query object and the row level security
+# filters of the user. The queries of templated datasets and query objects are also
+# keyed by the user, the URL parameters and the form data of the request, so the
+# templates must not depend on anything else, eg, the current time, the same way as
+# for the cache of the chart data. The queries depending on the data, ie, with
+# prequeries, aren't cached.
+COMPILED_QUERY_CACHE_ENABLED = False
+#: Maximum number of queries cached, the least recently used ones are evicted
+COMPILED_QUERY_CACHE_SIZE = 1000
+#: Timeout (seconds) after which the cached queries are compiled again
+COMPILED_QUERY_CACHE_TIMEOUT_SEC = 300
+
+# ------------------------------
+# Row level security filter cache
+# ------------------------------
+# Caches the row level security filters of each set of roles in each worker, instead
+# of querying them for every query of a dataset. The workers reload them once the
+# rules are changed, through a version stored in the cache of `CACHE_CONFIG`, so the
+# cache must be shared by the workers, eg, Redis, for the changes to apply at once.
+RLS_FILTER_CACHE_ENABLED = False
+#: Timeout (seconds) after which the filters are reloaded, even if unchanged
+RLS_FILTER_CACHE_TIMEOUT_SEC = 300
+
+# ------------------------------
+# Permission snapshot cache
+# ------------------------------
+# Builds the permissions of each user, through their roles and groups, once, and
+# caches them in the cache of `CACHE_CONFIG`, instead of querying them for every access
+# check, eg, of the datasets of a dashboard. The snapshots are built again once the
+# permissions, or the roles of the users, are changed, through a version stored in the
+# same cache, so the cache must be shared by the workers, eg, Redis, for the changes
+# to apply at once.
+PERMISSION_SNAPSHOT_CACHE_ENABLED = False
+#: Timeout (seconds) after which the snapshots are built again, even if unchanged
+PERMISSION_SNAPSHOT_CACHE_TIMEOUT_SEC = 300
 
 
 # Feature flags may also be set via 'SUPERSET_FEATURE_' prefixed environment vars.
@@ -920,12 +1018,76 @@ UPLOAD_CHUNK_SIZE = 4096
 # each cache config.
 CACHE_DEFAULT_TIMEOUT = int(timedelta(days=1).total_seconds())
 
+# Any of the caches below can be fronted by a bounded in-process (L1) cache, by adding
+# `CACHE_L1_MAX_BYTES` to its config. Each process then keeps up to that many bytes of
+# recently used values, evicted in LRU order, for at most `CACHE_L1_TIMEOUT` seconds
+# (60 by default). With Redis backends, writes are broadcast so that other processes
+# drop the values from their L1 cache; with other backends a value replaced by another
+# process can be served for up to `CACHE_L1_TIMEOUT` seconds. The L1 cache saves the
+# round trip to the backend, but values are still unpickled on every read, so that
+# callers get their own copy to mutate; the DataFrames of the data cache are kept
+# encoded, so that unpickling them is mostly a copy of their bytes. Eg:
+#
+# DATA_CACHE_CONFIG = {
+#     "CACHE_TYPE": "RedisCache",
+#     "CACHE_REDIS_URL": "redis://localhost:6379/0",
+#     "CACHE_L1_MAX_BYTES": 256 * 1024 * 1024,
+#     "CACHE_L1_TIMEOUT": 30,
+# }
+
 # Default cache for Superset objects
 CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 
 # Cache for datasource metadata and query results
 DATA_CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 
+# How should DataFrames be stored in the data cache? By default they're pickled by the
+# cache backend. Set to `ArrowIPCDataFrameCodec()` or `ParquetDataFrameCodec()` from
+# `superset.utils.dataframe_codec` to store them as compressed Arrow IPC or Parquet,
+# which is usually much smaller and faster to load. Entries stored with any of the
+# codecs (or pickled) can still be read after changing this setting.
+DATA_CACHE_DATAFRAME_CODEC: DataFrameCodec | None = None
+
+# Compression codec applied to DataFrames encoded with `DATA_CACHE_DATAFRAME_CODEC`,
+# one of `zlib`, `zstd`, `lz4` or `none`. Leave it to `None` when the DataFrame codec
+# already compresses its payload, as the Arrow IPC and Parquet codecs do by default.
+DATA_CACHE_COMPRESSION: str | None = None
+
+# Coalesce concurrent cache misses on the same chart data query. The first request
+# missing the cache takes a lease on the cache key (an atomic `add` in the data cache,
+# eg, `SET NX` on Redis) and runs the query, while the others wait up to this number
+# of seconds for its result to be cached before running the query themselves. Requires
+# a data cache shared by all workers; set to `None` to disable.
+DATA_CACHE_COALESCING_TIMEOUT: int | None = None
+
+# Serve chart data from the cache for up to this number of seconds after its cache
+# timeout, while a Celery task refreshes it, instead of running the query during the
+# request. Stale results are flagged with `is_stale` in the chart data response. It can
+# be overridden with `stale_cache_timeout` in the `extra` of datasets and databases;
+# set to `None` to disable.
+DATA_CACHE_STALE_TIMEOUT: int | None = None
+
+# Cache the raw results of chart data queries in the data cache, keyed by their SQL,
+# in addition to the post-processed results. Queries rendering to the same SQL, eg,
+# charts differing only by their post-processing, then share the raw result, and
+# changing the post-processing of a chart doesn't run its query again.
+DATA_CACHE_RAW_QUERY_RESULTS = False
+
+# Run up to this number of queries of a chart data request concurrently, eg, the
+# queries of its time comparisons, in threads of the web server. It's limited per
+# database by `max_concurrent_queries` in the `extra` of the database; set to 1 to
+# run them one after another. The datasources and the user are loaded from the
+# metadata database before the queries run in other threads, which then mustn't use
+# other ORM instances of the request, since the sessions aren't thread safe, eg, in
+# a custom `SQL_QUERY_MUTATOR`, Jinja context addons or security manager.
+CHART_DATA_QUERY_MAX_WORKERS = 1
+
+# Merge the chart data queries differing only by their metrics, eg, the queries of
+# KPI charts on the same dataset with the same filters, grouping and time range, in
+# a chart data request or a batch request for a dashboard. The first one to run
+# selects the metrics of all of them, and the others are served from its result.
+CHART_DATA_MERGE_QUERIES = False
+
 # Cache for dashboard filter state. `CACHE_TYPE` defaults to `SupersetMetastoreCache`
 # that stores the values in the key-value table in the Superset metastore, as it's
 # required for Superset to operate correctly, but can be replaced by any
@@ -1009,11 +1171,25 @@ ALLOWED_EXTENSIONS = {*EXCEL_EXTENSIONS, *CSV_EXTENSIONS, *COLUMNAR_EXTENSIONS}
 # note: index option should not be overridden
 CSV_EXPORT = {"encoding": "utf-8-sig"}
 
+# When results of a SQL Lab query are not available in the results backend, the CSV
+# export runs the query again. If set, the results are read with a server-side
+# cursor (when supported by the database) and the CSV is streamed to the client in
+# chunks of this many rows, so that memory usage doesn't depend on the size of the
+# results. Set to `None` to build the whole CSV in memory.
+SQLLAB_CSV_EXPORT_CHUNK_SIZE: int | None = None
+
 # Excel Options: key/value pairs that will be passed as argument to DataFrame.to_excel
 # method.
 # note: index option should not be overridden
 EXCEL_EXPORT: dict[str, Any] = {}
 
+# If set, CSV and XLSX exports of chart data are streamed to the client instead of
+# being built in memory: CSV files are written in chunks of this many rows, and XLSX
+# files are written row by row to a temporary file. Only the `sheet_name`, `index`,
+# `header` and `na_rep` options of `EXCEL_EXPORT` are supported when streaming. Set
+# to `None` to build the whole file in memory.
+CHART_DATA_EXPORT_CHUNK_SIZE: int | None = None
+
 # ---------------------------------------------------
 # Time grain configurations
 # ---------------------------------------------------
@@ -1312,6 +1488,20 @@ RESULTS_BACKEND: BaseCache | None = None
 # in order to disable should breaking issues be discovered.
 RESULTS_BACKEND_USE_MSGPACK = True
 
+# Store results with more rows than this in the results backend as separately
+# compressed pages of Arrow record batches, so that a range of rows can be read
+# through the `offset` and `limit` parameters of `/api/v1/sqllab/results/` without
+# loading the whole result. Requires `RESULTS_BACKEND_USE_MSGPACK`. Set to `None` to
+# always store results as a single entry.
+SQLLAB_RESULTS_BACKEND_PAGE_SIZE: int | None = None
+
+# Compression codec for entries in the results backend: one of `zlib`, `zstd`, `lz4`
+# (requires the `lz4` package) or `none`. zstd and lz4 are much faster than zlib and
+# compress Arrow payloads better. Entries are tagged with the codec that compressed
+# them, so results stored with any codec can be read after changing this setting;
+# `zlib` entries can also be read by older versions of Superset.
+RESULTS_BACKEND_COMPRESSION = "zlib"
+
 # The S3 bucket where you want to store your external hive tables created
 # from CSV files. For example, 'companyname-superset'
 CSV_TO_HIVE_UPLOAD_S3_BUCKET = None
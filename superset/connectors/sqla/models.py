@@ -28,7 +28,7 @@ from typing import Any, Callable, cast, Optional, Union
 
 import pandas as pd
 import sqlalchemy as sa
-from flask import current_app
+from flask import current_app, g, has_request_context, request
 from flask_appbuilder import Model
 from flask_appbuilder.security.sqla.models import User
 from flask_babel import gettext as __, lazy_gettext as _
@@ -59,7 +59,9 @@ from sqlalchemy.orm import (
     reconstructor,
     relationship,
     RelationshipProperty,
+    Session,
 )
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.schema import UniqueConstraint
 from sqlalchemy.sql import column, ColumnElement, literal_column, quoted_name, table
@@ -71,6 +73,8 @@ from sqlalchemy.types import JSON
 from superset import db, is_feature_enabled, security_manager
 from superset.commands.dataset.exceptions import DatasetNotFoundError
 from superset.common.db_query_status import QueryStatus
+from superset.connectors.sqla.query_cache import is_templated, query_cache
+from superset.connectors.sqla.rollups import get_rollups, Rollup
 from superset.connectors.sqla.utils import (
     get_columns_description,
     get_physical_table_metadata,
@@ -89,6 +93,7 @@ from superset.exceptions import (
 )
 from superset.jinja_context import (
     BaseTemplateProcessor,
+    context_addons,
     ExtraCache,
     get_template_processor,
 )
@@ -100,8 +105,11 @@ from superset.models.helpers import (
     ExploreMixin,
     ImportExportMixin,
     QueryResult,
+    QueryStringExtended,
+    SqlaQuery,
 )
 from superset.models.slice import Slice
+from superset.security.rls import rls_filter_cache
 from superset.sql.parse import Table
 from superset.superset_typing import (
     AdhocColumn,
@@ -112,6 +120,8 @@ from superset.superset_typing import (
 )
 from superset.utils import core as utils, json
 from superset.utils.backports import StrEnum
+from superset.utils.decorators import stats_timing
+from superset.utils.hashing import md5_sha_from_dict
 
 config = current_app.config  # Backward compatibility for tests
 metadata = Model.metadata  # pylint: disable=no-member
@@ -1431,6 +1441,78 @@ class SqlaTable(
 
         return super().get_from_clause(template_processor)
 
+    @property
+    def rollups(self) -> list[Rollup]:
+        return get_rollups(self.extra_dict)
+
+    def get_rollup(self, query_obj: dict[str, Any]) -> Rollup | None:
+        """
+        Returns the smallest rollup of the dataset with the same results as the dataset
+        for a query, if any.
+
+        The row level security filters of the dataset reference its own columns, so the
+        queries of the users with such filters aren't routed to rollups.
+        """
+        rollups = [
+            rollup
+            for rollup in self.rollups
+            if set(rollup.dimensions).issubset(self.column_names)
+            and (
+                not self.always_filter_main_dttm
+                or not self.main_dttm_col
+                or self.main_dttm_col in rollup.dimensions
+            )
+            and rollup.can_answer(query_obj)
+        ]
+        if not rollups or self.get_sqla_row_level_filters():
+            return None
+        return rollups[0]
+
+    def get_rollup_table(self, rollup: Rollup) -> SqlaTable:
+        """
+        Returns a transient dataset querying a rollup, with the dimensions of the
+        dataset and the metrics of the rollup.
+        """
+        columns_by_name = {col.column_name: col for col in self.columns}
+        rollup_table = SqlaTable(
+            table_name=rollup.table_name,
+            schema=rollup.schema or self.schema,
+            catalog=rollup.catalog or self.catalog,
+            main_dttm_col=(
+                self.main_dttm_col
+                if self.main_dttm_col in rollup.dimensions
+                else rollup.time_column
+            ),
+            always_filter_main_dttm=self.always_filter_main_dttm,
+            columns=[
+                TableColumn(
+                    column_name=name,
+                    type=columns_by_name[name].type,
+                    is_dttm=columns_by_name[name].is_dttm,
+                    python_date_format=columns_by_name[name].python_date_format,
+                )
+                for name in rollup.dimensions
+            ],
+            metrics=[
+                SqlMetric(metric_name=name, expression=expression)
+                for name, expression in rollup.metrics.items()
+            ],
+        )
+        # the database is set without its backref, to keep the table out of the session
+        set_committed_value(rollup_table, "database", self.database)
+        rollup_table.database_id = self.database_id
+        return rollup_table
+
+    def get_sqla_query(self, **kwargs: Any) -> SqlaQuery:  # type: ignore[override]
+        """
+        Routes the query to the smallest rollup able to answer it, if any, otherwise
+        queries the dataset.
+        """
+        if rollup := self.get_rollup(kwargs):
+            sqlaq = self.get_rollup_table(rollup).get_sqla_query(**kwargs)
+            return sqlaq._replace(rollup=rollup.table_name)
+        return super().get_sqla_query(**kwargs)
+
     def adhoc_metric_to_sqla(
         self,
         metric: AdhocMetric,
@@ -1598,9 +1680,22 @@ class SqlaTable(
 
         return or_(*groups)
 
-    def query(self, query_obj: QueryObjectDict) -> QueryResult:
+    def query(
+        self,
+        query_obj: QueryObjectDict,
+        query_str_ext: QueryStringExtended | None = None,
+    ) -> QueryResult:
+        """
+        Runs a query object, or its already compiled queries if given, eg, when they
+        were compiled to build the cache key of the result.
+        """
         qry_start_dttm = datetime.now()
-        query_str_ext = self.get_query_str_extended(query_obj)
+        if query_str_ext is None:
+            query_str_ext = self.get_query_str_extended(query_obj)
+        if self.rollups:
+            current_app.config["STATS_LOGGER"].incr(
+                "rollup_hit" if query_str_ext.rollup else "rollup_miss"
+            )
         sql = query_str_ext.sql
         status = QueryStatus.SUCCESS
         errors = None
@@ -1681,6 +1776,7 @@ class SqlaTable(
             query=sql,
             errors=errors,
             error_message=error_message,
+            rollup=query_str_ext.rollup,
         )
 
     def get_sqla_table_object(self) -> Table:
@@ -1912,10 +2008,120 @@ class SqlaTable(
         """
         extra_cache_keys = super().get_extra_cache_keys(query_obj)
         if self.has_extra_cache_key_calls(query_obj):
-            sqla_query = self.get_sqla_query(**query_obj)
-            extra_cache_keys += sqla_query.extra_cache_keys
+            key = self.get_query_cache_key(query_obj, kind="extra_cache_keys")
+            if key and (cached := query_cache.get(key)) is not None:
+                extra_cache_keys += cached
+            else:
+                sqla_query = self.get_sqla_query(**query_obj)
+                extra_cache_keys += sqla_query.extra_cache_keys
+                if key and not sqla_query.prequeries:
+                    query_cache.set(key, sqla_query.extra_cache_keys)
         return list(set(extra_cache_keys))
 
+    def get_template_context_key(self) -> dict[str, Any]:
+        """
+        Returns the values of the template context depending on the request, eg, the
+        user and the URL parameters.
+        """
+        roles = security_manager.get_user_roles() if g.get("user") else []
+        return {
+            "user_id": utils.get_user_id(),
+            "username": utils.get_username(),
+            "roles": sorted(role.name for role in roles),
+            "url_params": (
+                request.args.to_dict(flat=False) if has_request_context() else None
+            ),
+            "form_data": g.get("form_data"),
+            # the form data of the chart data requests is read from their body
+            "json": request.get_json(silent=True) if has_request_context() else None,
+            "context_addons": context_addons(),
+        }
+
+    def get_query_cache_key(
+        self,
+        query_obj: QueryObjectDict,
+        **kwargs: Any,
+    ) -> str | None:
+        """
+        Returns the key of the queries compiled for a query object, or None if they
+        aren't cached, see `COMPILED_QUERY_CACHE_ENABLED`.
+
+        The key changes with the dataset, its columns, metrics and database, the row
+        level security filters of the user and, if the dataset or the query object are
+        templated, with the template context.
+        """
+        if not current_app.config["COMPILED_QUERY_CACHE_ENABLED"]:
+            return None
+
+        with stats_timing(
+            "sqla.query.time_computing_cache_key",
+            current_app.config["STATS_LOGGER"],
+        ):
+            rls_filters = [
+                [filter_.id, filter_.group_key, filter_.clause]
+                for filter_ in security_manager.get_rls_filters(self)
+            ]
+            if is_feature_enabled("EMBEDDED_SUPERSET"):
+                rls_filters += [
+                    [rule.get("dataset"), None, rule["clause"]]
+                    for rule in security_manager.get_guest_rls_filters(self)
+                ]
+
+            templated = is_templated(
+                self.sql,
+                self.fetch_values_predicate,
+                *(col.expression for col in self.columns),
+                *(metric.expression for metric in self.metrics),
+                *(clause for *_, clause in rls_filters),
+                json.dumps(query_obj, default=repr),
+            )
+            cache_dict = {
+                "dataset": [
+                    self.id,
+                    self.changed_on,
+                    [[col.id, col.changed_on] for col in self.columns],
+                    [[metric.id, metric.changed_on] for metric in self.metrics],
+                ],
+                "database": [self.database_id, self.database.changed_on],
+                "query_obj": query_obj,
+                "rls_filters": rls_filters,
+                "template_context": (
+                    self.get_template_context_key() if templated else None
+                ),
+                **kwargs,
+            }
+            return md5_sha_from_dict(cache_dict, default=repr, ignore_nan=True)
+
+    def get_query_str_extended(
+        self,
+        query_obj: QueryObjectDict,
+        mutate: bool = True,
+    ) -> QueryStringExtended:
+        """
+        Returns the compiled queries of a query object, from the cache if possible.
+
+        The queries depending on the data, ie, with prequeries, aren't cached. The
+        queries are cached before being mutated, since `SQL_QUERY_MUTATOR` may depend
+        on the user.
+        """
+        stats_logger = current_app.config["STATS_LOGGER"]
+        key = self.get_query_cache_key(query_obj, kind="query")
+        if key and (cached := query_cache.get(key)) is not None:
+            stats_logger.incr("sqla.query.cache_hit")
+            query_str_ext = cached
+        else:
+            query_str_ext = super().get_query_str_extended(query_obj, mutate=False)
+            if key:
+                stats_logger.incr("sqla.query.cache_miss")
+                if not query_str_ext.prequeries:
+                    query_cache.set(key, query_str_ext)
+
+        if mutate:
+            query_str_ext = query_str_ext._replace(
+                sql=self.database.mutate_sql_based_on_config(query_str_ext.sql)
+            )
+        return query_str_ext
+
     @property
     def quote_identifier(self) -> Callable[[str], str]:
         return self.database.quote_identifier
@@ -2026,3 +2232,20 @@ class RowLevelSecurityFilter(Model, AuditMixinNullable):
         backref="row_level_security_filters",
     )
     clause = Column(utils.MediumText(), nullable=False)
+
+
+# the filters are reloaded once the rules, or the roles, are changed
+sa.event.listen(
+    RowLevelSecurityFilter, "after_insert", rls_filter_cache.on_rules_changed
+)
+sa.event.listen(
+    RowLevelSecurityFilter, "after_update", rls_filter_cache.on_rules_changed
+)
+sa.event.listen(
+    RowLevelSecurityFilter, "after_delete", rls_filter_cache.on_rules_changed
+)
+sa.event.listen(
+    security_manager.role_model, "after_delete", rls_filter_cache.on_rules_changed
+)
+sa.event.listen(Session, "after_commit", rls_filter_cache.on_session_commit)
+sa.event.listen(Session, "after_rollback", rls_filter_cache.on_session_rollback)
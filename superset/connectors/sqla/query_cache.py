@@ -0,0 +1,82 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from flask import current_app
+
+# the marker of the Jinja expressions and statements
+TEMPLATE_MARKERS = ("{{", "{%")
+
+
+def is_templated(*statements: str | None) -> bool:
+    """
+    Whether any of the statements is a Jinja template.
+    """
+    return any(
+        marker in statement
+        for statement in statements
+        if statement
+        for marker in TEMPLATE_MARKERS
+    )
+
+
+class QueryCache:
+    """
+    An in-process LRU cache of the queries compiled for the datasets.
+
+    The queries are the same for the same key for `COMPILED_QUERY_CACHE_TIMEOUT_SEC`,
+    and the least recently used ones are evicted beyond `COMPILED_QUERY_CACHE_SIZE`.
+    The cached values are copied, so that the callers can't mutate them.
+    """
+
+    def __init__(self) -> None:
+        self._values: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        timeout = current_app.config["COMPILED_QUERY_CACHE_TIMEOUT_SEC"]
+        with self._lock:
+            if (item := self._values.get(key)) is None:
+                return None
+            created, value = item
+            if time.monotonic() - created >= timeout:
+                del self._values[key]
+                return None
+            self._values.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        size = current_app.config["COMPILED_QUERY_CACHE_SIZE"]
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+            self._values.move_to_end(key)
+            while len(self._values) > size:
+                self._values.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+query_cache = QueryCache()
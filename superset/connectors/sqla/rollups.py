@@ -0,0 +1,241 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from superset.common.utils.time_range_utils import get_since_until_from_time_range
+from superset.constants import TimeGrain
+from superset.utils.core import DTTM_ALIAS, FilterOperator
+
+logger = logging.getLogger(__name__)
+
+# the time grains dividing a day, in seconds
+SUB_DAY_TIME_GRAINS: dict[str, int] = {
+    TimeGrain.SECOND: 1,
+    TimeGrain.FIVE_SECONDS: 5,
+    TimeGrain.THIRTY_SECONDS: 30,
+    TimeGrain.MINUTE: 60,
+    TimeGrain.FIVE_MINUTES: 300,
+    TimeGrain.TEN_MINUTES: 600,
+    TimeGrain.FIFTEEN_MINUTES: 900,
+    TimeGrain.THIRTY_MINUTES: 1800,
+    TimeGrain.HALF_HOUR: 1800,
+    TimeGrain.HOUR: 3600,
+    TimeGrain.SIX_HOURS: 21600,
+    TimeGrain.DAY: 86400,
+}
+
+# the weekly time grains, with the weekday their weeks start on
+WEEK_TIME_GRAINS: dict[str, int] = {
+    TimeGrain.WEEK: 0,
+    TimeGrain.WEEK_STARTING_SUNDAY: 6,
+    TimeGrain.WEEK_STARTING_MONDAY: 0,
+    TimeGrain.WEEK_ENDING_SATURDAY: 6,
+    TimeGrain.WEEK_ENDING_SUNDAY: 0,
+}
+
+# the calendar time grains, in months
+MONTH_TIME_GRAINS: dict[str, int] = {
+    TimeGrain.MONTH: 1,
+    TimeGrain.QUARTER: 3,
+    TimeGrain.QUARTER_YEAR: 3,
+    TimeGrain.YEAR: 12,
+}
+
+
+def is_time_grain_compatible(time_grain: str | None, rollup_grain: str | None) -> bool:
+    """
+    Whether each bucket of a time grain is a union of buckets of the time grain of a
+    rollup, eg, months are unions of days, but not of weeks.
+    """
+    if rollup_grain is None or time_grain == rollup_grain:
+        return True
+    if time_grain is None:
+        return False
+    if rollup_grain in SUB_DAY_TIME_GRAINS:
+        if time_grain in SUB_DAY_TIME_GRAINS:
+            return (
+                SUB_DAY_TIME_GRAINS[time_grain] % SUB_DAY_TIME_GRAINS[rollup_grain] == 0
+            )
+        return time_grain in WEEK_TIME_GRAINS or time_grain in MONTH_TIME_GRAINS
+    if rollup_grain in WEEK_TIME_GRAINS:
+        return WEEK_TIME_GRAINS.get(time_grain) == WEEK_TIME_GRAINS[rollup_grain]
+    if rollup_grain in MONTH_TIME_GRAINS and time_grain in MONTH_TIME_GRAINS:
+        return MONTH_TIME_GRAINS[time_grain] % MONTH_TIME_GRAINS[rollup_grain] == 0
+    return False
+
+
+def is_time_grain_aligned(dttm: datetime | None, rollup_grain: str | None) -> bool:
+    """
+    Whether a time bound falls on the start of a bucket of the time grain of a rollup,
+    so that the rollup has the same rows in the time range as the dataset.
+    """
+    if dttm is None or rollup_grain is None:
+        return True
+    if dttm.microsecond:
+        return False
+    seconds = dttm.hour * 3600 + dttm.minute * 60 + dttm.second
+    if rollup_grain in SUB_DAY_TIME_GRAINS:
+        return seconds % SUB_DAY_TIME_GRAINS[rollup_grain] == 0
+    if seconds:
+        return False
+    if rollup_grain in WEEK_TIME_GRAINS:
+        return dttm.weekday() == WEEK_TIME_GRAINS[rollup_grain]
+    if rollup_grain in MONTH_TIME_GRAINS:
+        return dttm.day == 1 and (dttm.month - 1) % MONTH_TIME_GRAINS[rollup_grain] == 0
+    return False
+
+
+@dataclass
+class Rollup:  # pylint: disable=too-many-instance-attributes
+    """
+    A pre-aggregated table of a dataset, eg, its rows grouped by day and country.
+
+    The dimensions are the columns of the dataset the table is grouped by, and have the
+    same names in the table. The time column, if any, is truncated to the time grain.
+    The metrics map the names of additive metrics of the dataset to their expressions
+    over the table, eg, `SUM(num)` to `SUM(sum__num)` and `COUNT(*)` to `SUM(count)`.
+    """
+
+    table_name: str
+    dimensions: list[str]
+    metrics: dict[str, str]
+    schema: str | None = None
+    catalog: str | None = None
+    time_column: str | None = None
+    time_grain: str | None = None
+    row_count: int | None = None
+
+    def is_dimension(self, column: Any, time_grain: str | None = None) -> bool:
+        """
+        Whether a column of a query, truncated to a time grain, is a dimension.
+        """
+        if isinstance(column, dict):
+            if column.get("columnType") == "BASE_AXIS":
+                time_grain = column.get("timeGrain")
+            column = column.get("sqlExpression")
+        if column not in self.dimensions:
+            return False
+        return column != self.time_column or is_time_grain_compatible(
+            time_grain, self.time_grain
+        )
+
+    def can_answer(  # pylint: disable=too-many-return-statements
+        self,
+        query_obj: dict[str, Any],
+    ) -> bool:
+        """
+        Whether the rollup has the same results as the dataset for a query.
+        """
+        metrics = query_obj.get("metrics") or []
+        if (
+            not metrics
+            or not all(isinstance(metric, str) for metric in metrics)
+            or not set(metrics).issubset(self.metrics)
+            or query_obj.get("is_rowcount")
+            or query_obj.get("apply_fetch_values_predicate")
+        ):
+            return False
+
+        extras = query_obj.get("extras") or {}
+        if extras.get("where") or extras.get("having"):
+            return False
+
+        for metric in (
+            query_obj.get("series_limit_metric"),
+            query_obj.get("timeseries_limit_metric"),
+        ):
+            # the adhoc metrics aren't stored in the rollups
+            if metric is not None and (
+                not isinstance(metric, str) or metric not in self.metrics
+            ):
+                return False
+
+        time_grain = extras.get("time_grain_sqla")
+        granularity = query_obj.get("granularity")
+        if granularity:
+            if granularity not in self.dimensions:
+                return False
+            if (
+                query_obj.get("is_timeseries")
+                and granularity == self.time_column
+                and not is_time_grain_compatible(time_grain, self.time_grain)
+            ):
+                return False
+            if self.time_column and not all(
+                is_time_grain_aligned(query_obj.get(key), self.time_grain)
+                for key in ("from_dttm", "to_dttm", "inner_from_dttm", "inner_to_dttm")
+            ):
+                return False
+
+        for column in (
+            *(query_obj.get("columns") or []),
+            *(query_obj.get("groupby") or []),
+            *(query_obj.get("series_columns") or []),
+        ):
+            if column != DTTM_ALIAS and not self.is_dimension(
+                column, time_grain if column == granularity else None
+            ):
+                return False
+
+        for column, _ in query_obj.get("orderby") or []:
+            if not isinstance(column, str) or (
+                column not in self.metrics and column not in self.dimensions
+            ):
+                return False
+
+        for flt in query_obj.get("filter") or []:
+            column = flt.get("col")
+            if not isinstance(column, str) or column not in self.dimensions:
+                return False
+            if column == self.time_column:
+                # the time column can only be filtered on bucket boundaries
+                if flt.get("op") != FilterOperator.TEMPORAL_RANGE:
+                    return False
+                bounds = get_since_until_from_time_range(
+                    time_range=flt.get("val"),
+                    time_shift=query_obj.get("time_shift"),
+                    extras=extras,
+                )
+                if not all(
+                    is_time_grain_aligned(dttm, self.time_grain) for dttm in bounds
+                ):
+                    return False
+
+        return True
+
+
+def get_rollups(extra: dict[str, Any]) -> list[Rollup]:
+    """
+    Returns the rollups defined in the extra of a dataset, smallest first.
+    """
+    rollups = []
+    for definition in extra.get("rollups") or []:
+        try:
+            rollups.append(Rollup(**definition))
+        except TypeError:
+            logger.warning("Invalid rollup definition: %s", definition)
+
+    # the rollups without a row count are tried last, in the order they are defined
+    return sorted(
+        rollups,
+        key=lambda rollup: (rollup.row_count is None, rollup.row_count or 0),
+    )
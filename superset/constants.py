@@ -149,7 +149,9 @@ MODEL_API_RW_METHOD_PERMISSION_MAP = {
     "cache_screenshot": "read",
     "screenshot": "read",
     "data": "read",
+    "data_batch": "read",
     "data_from_cache": "read",
+    "cancel_data_job": "read",
     "get_charts": "read",
     "get_datasets": "read",
     "get_tabs": "read",
@@ -162,7 +162,10 @@ extra_description = markdown(
     "7. The ``disable_drill_to_detail`` field is a boolean specifying whether or not"
     "drill to detail is disabled for the database."
     "8. The ``allow_multi_catalog`` indicates if the database allows changing "
-    "the default catalog when running queries and creating datasets.",
+    "the default catalog when running queries and creating datasets.<br/>"
+    "9. The ``stale_cache_timeout`` is the number of seconds chart data is still "
+    "served from the cache after its cache timeout, while it's refreshed in the "
+    "background. It overrides ``DATA_CACHE_STALE_TIMEOUT``.",
     True,
 )
 get_export_ids_schema = {"type": "array", "items": {"type": "integer"}}
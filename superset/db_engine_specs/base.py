@@ -29,6 +29,7 @@ from typing import (
     Callable,
     cast,
     ContextManager,
+    Iterator,
     NamedTuple,
     Optional,
     TYPE_CHECKING,
@@ -39,6 +40,7 @@ from urllib.parse import urlencode, urljoin
 from uuid import uuid4
 
 import pandas as pd
+import pyarrow as pa
 import requests
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
@@ -72,6 +74,7 @@ from superset.sql.parse import (
     Table,
 )
 from superset.superset_typing import (
+    DbapiDescription,
     OAuth2ClientConfig,
     OAuth2State,
     OAuth2TokenResponse,
@@ -441,6 +444,11 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
     # the `cancel_query` value in the `extra` field of the `query` object
     has_query_id_before_execute = True
 
+    # Can the driver return results as Arrow? When this is changed to true in a DB
+    # engine spec it MUST implement `fetch_arrow`, and result sets are then built
+    # directly from the Arrow table, without materializing Python objects.
+    supports_arrow_fetch = False
+
     @classmethod
     def get_rls_method(cls) -> RLSMethod:
         """
@@ -983,33 +991,117 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         try:
             if cls.limit_method == LimitMethod.FETCH_MANY and limit:
                 return cursor.fetchmany(limit)
-            data = cursor.fetchall()
-            description = cursor.description or []
-            # Create a mapping between column name and a mutator function to normalize
-            # values with. The first two items in the description row are
-            # the column name and type.
-            column_mutators = {
-                row[0]: func
-                for row in description
-                if (
-                    func := cls.column_type_mutators.get(
-                        type(cls.get_sqla_column_type(cls.get_datatype(row[1])))
-                    )
-                )
-            }
-            if column_mutators:
-                indexes = {row[0]: idx for idx, row in enumerate(description)}
-                for row_idx, row in enumerate(data):
-                    new_row = list(row)
-                    for col, func in column_mutators.items():
-                        col_idx = indexes[col]
-                        new_row[col_idx] = func(row[col_idx])
-                    data[row_idx] = tuple(new_row)
-
-            return data
+            return cls.mutate_column_types(cursor.fetchall(), cursor.description)
         except Exception as ex:
             raise cls.get_dbapi_mapped_exception(ex) from ex
 
+    @classmethod
+    def mutate_column_types(
+        cls,
+        data: list[tuple[Any, ...]],
+        description: DbapiDescription | None,
+    ) -> list[tuple[Any, ...]]:
+        """
+        Normalize values using the mutators in ``column_type_mutators``.
+
+        :param data: Rows fetched from the cursor
+        :param description: Description of the cursor
+        :return: Rows with the values normalized
+        """
+        description = description or []
+        # Create a mapping between column name and a mutator function to normalize
+        # values with. The first two items in the description row are
+        # the column name and type.
+        column_mutators = {
+            row[0]: func
+            for row in description
+            if (
+                func := cls.column_type_mutators.get(
+                    type(cls.get_sqla_column_type(cls.get_datatype(row[1])))
+                )
+            )
+        }
+        if column_mutators:
+            indexes = {row[0]: idx for idx, row in enumerate(description)}
+            for row_idx, row in enumerate(data):
+                new_row = list(row)
+                for col, func in column_mutators.items():
+                    col_idx = indexes[col]
+                    new_row[col_idx] = func(row[col_idx])
+                data[row_idx] = tuple(new_row)
+
+        return data
+
+    @classmethod
+    def fetch_data_chunks(
+        cls,
+        cursor: Any,
+        chunk_size: int,
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        """
+        Fetch the results of a cursor in chunks, so that results larger than the
+        available memory can be processed incrementally.
+
+        :param cursor: Cursor instance, ideally from ``get_streaming_cursor``
+        :param chunk_size: Maximum number of rows in each chunk
+        :return: Iterator over the chunks of rows
+        """
+        while True:
+            try:
+                data = cursor.fetchmany(chunk_size)
+            except Exception as ex:
+                raise cls.get_dbapi_mapped_exception(ex) from ex
+            if not data:
+                return
+            yield cls.mutate_column_types(list(data), cursor.description)
+
+    @classmethod
+    def get_streaming_cursor(cls, connection: Any) -> Any:
+        """
+        Return a cursor that reads results incrementally from the server.
+
+        Most DB API drivers buffer the whole result on the client when a query is
+        executed, regardless of how rows are fetched. Engines whose driver supports
+        server-side cursors should return one here, so that ``fetch_data_chunks``
+        keeps memory usage constant.
+
+        :param connection: Raw DB API connection
+        :return: Cursor instance
+        """
+        return connection.cursor()
+
+    @classmethod
+    def fetch_arrow(cls, cursor: Any, limit: int | None = None) -> pa.Table | None:
+        """
+        Fetch the results of a cursor as an Arrow table.
+
+        Only called when ``supports_arrow_fetch`` is true. Returning ``None`` makes
+        the caller fall back to ``fetch_data``.
+
+        :param cursor: Cursor instance
+        :param limit: Maximum number of rows to be returned by the cursor
+        :return: Result of query as an Arrow table
+        """
+        return None
+
+    @classmethod
+    def fetch_results(
+        cls, cursor: Any, limit: int | None = None
+    ) -> list[tuple[Any, ...]] | pa.Table:
+        """
+        Fetch the results of a cursor, as an Arrow table when supported.
+
+        :param cursor: Cursor instance
+        :param limit: Maximum number of rows to be returned by the cursor
+        :return: Result of query, either as an Arrow table or a list of rows
+        """
+        if cls.supports_arrow_fetch:
+            table = cls.fetch_arrow(cursor, limit)
+            if table is not None:
+                return table
+
+        return cls.fetch_data(cursor, limit)
+
     @classmethod
     def expand_data(
         cls, columns: list[ResultSetColumnType], data: list[dict[Any, Any]]
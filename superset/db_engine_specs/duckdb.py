@@ -22,6 +22,7 @@ from datetime import datetime
 from re import Pattern
 from typing import Any, TYPE_CHECKING, TypedDict
 
+import pyarrow as pa
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
 from flask import current_app as app
@@ -197,6 +198,7 @@ class DuckDBEngineSpec(DuckDBParametersMixin, BaseEngineSpec):
 
     sqlalchemy_uri_placeholder = "duckdb:////path/to/duck.db"
     supports_multivalues_insert = True
+    supports_arrow_fetch = True
 
     # DuckDB-specific column type mappings to ensure float/double types are recognized
     column_type_mappings = (
@@ -294,6 +296,32 @@ class DuckDBEngineSpec(DuckDBParametersMixin, BaseEngineSpec):
 
         return data
 
+    @classmethod
+    def fetch_arrow(cls, cursor: Any, limit: int | None = None) -> pa.Table | None:
+        """
+        Fetch results as Arrow record batches, stopping once ``limit`` is reached.
+
+        As in ``fetch_data``, the cursor description is restored after fetching.
+        """
+        description = cursor.description
+
+        try:
+            reader = cursor.fetch_record_batch()
+            batches: list[pa.RecordBatch] = []
+            num_rows = 0
+            for batch in reader:
+                batches.append(batch)
+                num_rows += batch.num_rows
+                if limit and num_rows >= limit:
+                    break
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+        except Exception as ex:
+            raise cls.get_dbapi_mapped_exception(ex) from ex
+
+        cursor.description = description
+
+        return table.slice(0, limit) if limit else table
+
     @classmethod
     def get_table_names(
         cls, database: Database, inspector: Inspector, schema: str | None
@@ -22,6 +22,7 @@ import re
 from datetime import datetime
 from re import Pattern
 from typing import Any, Optional, TYPE_CHECKING
+from uuid import uuid4
 
 from flask_babel import gettext as __
 from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, ENUM, JSON
@@ -241,6 +242,15 @@ class PostgresEngineSpec(BasicParametersMixin, PostgresBaseEngineSpec):
         ),
     )
 
+    @classmethod
+    def get_streaming_cursor(cls, connection: Any) -> Any:
+        # named cursors are declared on the server, and rows are only sent when fetched
+        try:
+            return connection.cursor(name=f"superset_{uuid4().hex}")
+        except TypeError:
+            # the driver doesn't support named cursors
+            return super().get_streaming_cursor(connection)
+
     @classmethod
     def get_schema_from_engine_params(
         cls,
@@ -223,6 +223,14 @@ class CacheLoadError(SupersetException):
     status = 404
 
 
+class DataFrameCodecDecodeException(SupersetException):
+    pass
+
+
+class CompressionCodecException(SupersetException):
+    pass
+
+
 class QueryClauseValidationException(SupersetException):
     status = 400
 
@@ -488,5 +496,22 @@ class SupersetResultsBackendNotConfigureException(SupersetErrorException):
         super().__init__(error)
 
 
+class DatabaseAdmissionTimeoutError(SupersetErrorException):
+    status = 429
+
+    def __init__(self, database_name: str, workload: str) -> None:
+        error = SupersetError(
+            message=_(
+                "The database %(database)s is too busy to run the query, please "
+                "try again later.",
+                database=database_name,
+            ),
+            error_type=SupersetErrorType.BACKEND_TIMEOUT_ERROR,
+            level=ErrorLevel.ERROR,
+            extra={"workload": workload},
+        )
+        super().__init__(error)
+
+
 class ScreenshotImageNotAvailableException(SupersetException):
     status = 404
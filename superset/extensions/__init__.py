@@ -41,6 +41,9 @@ from werkzeug.local import LocalProxy
 
 from superset.async_events.async_query_manager import AsyncQueryManager
 from superset.async_events.async_query_manager_factory import AsyncQueryManagerFactory
+from superset.extensions.admission_control import AdmissionControllerFactory
+from superset.extensions.engine_pool import EnginePoolFactory
+from superset.extensions.query_canceller import QueryCancellerFactory
 from superset.extensions.ssh import SSHManagerFactory
 from superset.extensions.stats_logger import BaseStatsLoggerManager
 from superset.security.manager import SupersetSecurityManager
@@ -127,6 +130,7 @@ class ProfilingExtension:  # pylint: disable=too-few-public-methods
 
 
 APP_DIR = os.path.join(os.path.dirname(__file__), os.path.pardir)
+admission_controller_factory = AdmissionControllerFactory()
 appbuilder = AppBuilder(update_perms=False)
 async_query_manager_factory = AsyncQueryManagerFactory()
 async_query_manager: AsyncQueryManager = LocalProxy(
@@ -138,12 +142,14 @@ csrf = CSRFProtect()
 db = get_sqla_class()()
 _event_logger: dict[str, Any] = {}
 encrypted_field_factory = EncryptedFieldFactory()
+engine_pool_factory = EnginePoolFactory()
 event_logger = LocalProxy(lambda: _event_logger.get("event_logger"))
 feature_flag_manager = FeatureFlagManager()
 machine_auth_provider_factory = MachineAuthProviderFactory()
 manifest_processor = UIManifestProcessor(APP_DIR)
 migrate = Migrate()
 profiling = ProfilingExtension()
+query_canceller_factory = QueryCancellerFactory()
 results_backend_manager = ResultsBackendManager()
 security_manager: SupersetSecurityManager = LocalProxy(lambda: appbuilder.sm)
 ssh_manager_factory = SSHManagerFactory()
@@ -0,0 +1,268 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, TYPE_CHECKING
+from uuid import uuid4
+
+import redis
+from flask import Flask, g, has_request_context, request
+
+from superset.exceptions import DatabaseAdmissionTimeoutError
+from superset.utils import json
+from superset.utils.backports import StrEnum
+from superset.utils.class_utils import load_class_from_name
+from superset.utils.core import (
+    get_query_source_from_request,
+    get_user_id,
+    QuerySource,
+)
+
+if TYPE_CHECKING:
+    from superset.models.core import Database
+
+
+class Workload(StrEnum):
+    """
+    The workloads sharing the slots of a database, by decreasing priority.
+    """
+
+    DASHBOARD = "dashboard"
+    EXPLORE = "explore"
+    SQL_LAB = "sql_lab"
+    ALERT = "alert"
+    WARMUP = "warmup"
+
+
+WORKLOAD_PRIORITIES = {workload: rank for rank, workload in enumerate(Workload)}
+
+# the waiters are refreshed while they poll, so the waiters of dead workers expire
+WAITER_TIMEOUT_SEC = 10
+
+# Admits a waiter if a slot of its workload, and of the database, is free for it.
+#
+# The waiters are ordered by the priority of their workload, then by the number of
+# slots held by their user, so that the users running many queries don't starve the
+# others, then by arrival. The number of slots is capped in the score, so that the
+# waiters never sort behind the waiters of a lower priority. The slots and waiters of
+# dead workers expire.
+ACQUIRE_SCRIPT = """
+local holders, queue, deadlines = KEYS[1], KEYS[2], KEYS[3]
+local token, user = ARGV[1], ARGV[2]
+local slots = cjson.decode(ARGV[3])
+local total, rank = tonumber(ARGV[4]), tonumber(ARGV[5])
+local lease, timeout = tonumber(ARGV[6]), tonumber(ARGV[7])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+redis.call('ZREMRANGEBYSCORE', holders, '-inf', now)
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', deadlines, '-inf', now)) do
+  redis.call('ZREM', queue, member)
+end
+redis.call('ZREMRANGEBYSCORE', deadlines, '-inf', now)
+
+local held, user_held = {}, 0
+local members = redis.call('ZRANGE', holders, 0, -1)
+for _, member in ipairs(members) do
+  local workload, member_user = string.match(member, '^([^|]*)|([^|]*)|')
+  held[workload] = (held[workload] or 0) + 1
+  if member_user == user then
+    user_held = user_held + 1
+  end
+end
+
+local workload = string.match(token, '^([^|]*)|')
+local score = rank * 1e11 + math.min(user_held, 9) * 1e10 + now
+redis.call('ZADD', queue, 'NX', score, token)
+redis.call('ZADD', deadlines, now + timeout, token)
+
+local free = math.huge
+if total > 0 then
+  free = total - #members
+end
+for _, member in ipairs(redis.call('ZRANGE', queue, 0, -1)) do
+  if free <= 0 then
+    break
+  end
+  local member_workload = string.match(member, '^([^|]*)|')
+  local cap = slots[member_workload]
+  if cap == nil or (held[member_workload] or 0) < cap then
+    if member == token then
+      redis.call('ZREM', queue, token)
+      redis.call('ZREM', deadlines, token)
+      redis.call('ZADD', holders, now + lease, token)
+      return {1, redis.call('ZCARD', queue)}
+    end
+    held[member_workload] = (held[member_workload] or 0) + 1
+    free = free - 1
+  end
+end
+return {0, redis.call('ZCARD', queue)}
+"""
+
+
+def get_workload(source: QuerySource | None = None) -> Workload:
+    """
+    Returns the workload of the current query.
+    """
+    if workload := g.get("admission_workload"):
+        return workload
+    if (
+        has_request_context()
+        and request.endpoint
+        and request.endpoint.endswith(".warm_up_cache")
+    ):
+        return Workload.WARMUP
+
+    source = source or get_query_source_from_request()
+    if source == QuerySource.DASHBOARD:
+        return Workload.DASHBOARD
+    if source == QuerySource.SQL_LAB:
+        return Workload.SQL_LAB
+    return Workload.EXPLORE
+
+
+@contextmanager
+def override_workload(workload: Workload) -> Iterator[None]:
+    """
+    Temporarily sets the workload of the queries, eg, of the alerts run by Celery.
+    """
+    previous = g.get("admission_workload")
+    g.admission_workload = workload
+    try:
+        yield
+    finally:
+        g.admission_workload = previous
+
+
+class AdmissionController:
+    """
+    Limits the concurrent queries of each database across the workers.
+
+    The databases opt in with an `admission_control` object in their extra, with the
+    `slots` of each workload, eg, `{"dashboard": 8, "sql_lab": 2}`, and optionally the
+    `max_wait` in seconds for a slot. The queries of all the workloads are also limited
+    by the `max_concurrent_queries` of the database. The slots are shared through
+    Redis, and a query waiting more than `max_wait` for a slot is rejected.
+    """
+
+    key_prefix = "superset:admission_control"
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__()
+        self.redis_url = app.config["DB_ADMISSION_CONTROL_REDIS_URL"]
+        self.max_wait = app.config["DB_ADMISSION_CONTROL_MAX_WAIT_SEC"]
+        self.lease = app.config["DB_ADMISSION_CONTROL_LEASE_SEC"]
+        self.stats_logger = app.config["STATS_LOGGER"]
+        self._redis: redis.Redis | None = None
+        self._acquire: Any = None
+        self._local = threading.local()
+
+    @property
+    def redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(self.redis_url)
+        return self._redis
+
+    def acquire(self, keys: list[str], args: list[Any]) -> tuple[bool, int]:
+        """
+        Tries to acquire a slot, returning whether it was and the queue depth.
+        """
+        if self._acquire is None:
+            self._acquire = self.redis.register_script(ACQUIRE_SCRIPT)
+        admitted, queue_depth = self._acquire(keys=keys, args=args)
+        return bool(admitted), int(queue_depth)
+
+    def get_keys(self, database_id: int) -> list[str]:
+        return [
+            f"{self.key_prefix}:{database_id}:{name}"
+            for name in ("holders", "queue", "deadlines")
+        ]
+
+    @contextmanager
+    def admit(
+        self,
+        database: Database,
+        source: QuerySource | None = None,
+    ) -> Iterator[None]:
+        """
+        Waits for a slot of the database for the current query, if it's configured.
+        """
+        config = database.get_extra().get("admission_control")
+        held: set[int] = self._local.__dict__.setdefault("held", set())
+        # the queries run while holding a slot, eg, to fetch metadata, are admitted
+        if not config or not self.redis_url or database.id in held:
+            yield
+            return
+
+        workload = get_workload(source)
+        user = str(get_user_id() or "")
+        token = f"{workload}|{user}|{uuid4().hex}"
+        keys = self.get_keys(database.id)
+        args = [
+            token,
+            user,
+            json.dumps(config.get("slots") or {}),
+            database.max_concurrent_queries or 0,
+            WORKLOAD_PRIORITIES[workload],
+            self.lease,
+            WAITER_TIMEOUT_SEC,
+        ]
+        max_wait = config.get("max_wait", self.max_wait)
+        stats_prefix = f"admission_control.{database.id}.{workload}"
+
+        start = time.monotonic()
+        delay = 0.05
+        while True:
+            admitted, queue_depth = self.acquire(keys, args)
+            self.stats_logger.gauge(f"{stats_prefix}.queue_depth", queue_depth)
+            waited = time.monotonic() - start
+            if admitted:
+                break
+            if waited >= max_wait:
+                self.redis.zrem(keys[1], token)
+                self.redis.zrem(keys[2], token)
+                self.stats_logger.incr(f"{stats_prefix}.rejected")
+                raise DatabaseAdmissionTimeoutError(database.database_name, workload)
+            time.sleep(min(delay, max_wait - waited))
+            delay = min(delay * 2, 1.0)
+
+        self.stats_logger.timing(f"{stats_prefix}.wait_time", waited * 1000)
+        held.add(database.id)
+        try:
+            yield
+        finally:
+            held.discard(database.id)
+            self.redis.zrem(keys[0], token)
+
+
+class AdmissionControllerFactory:
+    def __init__(self) -> None:
+        self._admission_controller = None
+
+    def init_app(self, app: Flask) -> None:
+        self._admission_controller = load_class_from_name(
+            app.config["DB_ADMISSION_CONTROL_CLASS"]
+        )(app)
+
+    @property
+    def instance(self) -> AdmissionController:
+        return self._admission_controller  # type: ignore
@@ -0,0 +1,177 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import URL
+
+from superset.utils.class_utils import load_class_from_name
+from superset.utils.hashing import md5_sha_from_dict
+
+
+@dataclass
+class PooledEngine:
+    engine: Engine
+    database_id: int | None
+    last_used: float
+
+
+class EnginePool:
+    """
+    A registry of SQLAlchemy engines keeping their connections open across queries.
+
+    The engines are keyed by everything they're created from: the database, the
+    effective URL, with its catalog and schema, the impersonated user and the engine
+    parameters, so that any change to them, eg, from another process, creates a new
+    engine. The least recently used engines are disposed beyond
+    `DB_ENGINE_POOL_MAX_ENGINES`, as are the engines unused for
+    `DB_ENGINE_POOL_IDLE_TIMEOUT_SEC`.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__()
+        self.max_engines = app.config["DB_ENGINE_POOL_MAX_ENGINES"]
+        self.idle_timeout = app.config["DB_ENGINE_POOL_IDLE_TIMEOUT_SEC"]
+        self.stats_logger = app.config["STATS_LOGGER"]
+        self._engines: OrderedDict[str, PooledEngine] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @staticmethod
+    def get_key(
+        database_id: int | None,
+        sqlalchemy_url: URL,
+        engine_kwargs: dict[str, Any],
+        effective_username: str | None = None,
+    ) -> str:
+        return md5_sha_from_dict(
+            {
+                "database_id": database_id,
+                "sqlalchemy_url": sqlalchemy_url.render_as_string(hide_password=False),
+                "engine_kwargs": engine_kwargs,
+                "effective_username": effective_username,
+            },
+            default=repr,
+        )
+
+    def get_engine(
+        self,
+        database_id: int | None,
+        sqlalchemy_url: URL,
+        engine_kwargs: dict[str, Any],
+        effective_username: str | None = None,
+    ) -> Engine:
+        """
+        Returns the engine for the parameters, creating it if needed.
+        """
+        key = self.get_key(
+            database_id, sqlalchemy_url, engine_kwargs, effective_username
+        )
+        now = time.monotonic()
+        disposed: list[Engine] = []
+
+        with self._lock:
+            # the engines of a forked process share the sockets of its parent, eg, in
+            # Celery or gunicorn workers, so they're dropped without being closed
+            if os.getpid() != self._pid:
+                for pooled_engine in self._engines.values():
+                    pooled_engine.engine.dispose(close=False)
+                self._engines.clear()
+                self._pid = os.getpid()
+
+            while self._engines:
+                oldest_key, oldest = next(iter(self._engines.items()))
+                if now - oldest.last_used < self.idle_timeout:
+                    break
+                del self._engines[oldest_key]
+                disposed.append(oldest.engine)
+                self.stats_logger.incr("engine_pool.reaped")
+
+            if pooled_engine := self._engines.get(key):
+                self.stats_logger.incr("engine_pool.hit")
+                pooled_engine.last_used = now
+                self._engines.move_to_end(key)
+            else:
+                self.stats_logger.incr("engine_pool.miss")
+                engine = create_engine(
+                    sqlalchemy_url,
+                    **{"pool_pre_ping": True, **engine_kwargs},
+                )
+                pooled_engine = PooledEngine(engine, database_id, now)
+                self._engines[key] = pooled_engine
+                while len(self._engines) > self.max_engines:
+                    _, evicted = self._engines.popitem(last=False)
+                    disposed.append(evicted.engine)
+                    self.stats_logger.incr("engine_pool.evicted")
+
+            self.emit_stats()
+
+        # the connections are closed outside of the lock, as they may be slow to close
+        for engine in disposed:
+            engine.dispose()
+
+        return pooled_engine.engine
+
+    def invalidate(self, database_id: int | None) -> None:
+        """
+        Disposes the engines of a database, eg, when its connection is updated.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key, pooled_engine in self._engines.items()
+                if pooled_engine.database_id == database_id
+            ]
+            disposed = [self._engines.pop(key).engine for key in keys]
+            self.emit_stats()
+
+        for engine in disposed:
+            engine.dispose()
+
+    def emit_stats(self) -> None:
+        checked_in = checked_out = 0
+        for pooled_engine in self._engines.values():
+            pool = pooled_engine.engine.pool
+            checked_in += getattr(pool, "checkedin", lambda: 0)()
+            checked_out += getattr(pool, "checkedout", lambda: 0)()
+
+        self.stats_logger.gauge("engine_pool.engines", len(self._engines))
+        self.stats_logger.gauge("engine_pool.connections.checked_in", checked_in)
+        self.stats_logger.gauge("engine_pool.connections.checked_out", checked_out)
+
+
+class EnginePoolFactory:
+    def __init__(self) -> None:
+        self._engine_pool = None
+
+    def init_app(self, app: Flask) -> None:
+        self._engine_pool = load_class_from_name(
+            app.config["DB_ENGINE_POOL_CLASS"]
+        )(app)
+
+    @property
+    def instance(self) -> EnginePool:
+        return self._engine_pool  # type: ignore
@@ -0,0 +1,228 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import logging
+import select
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, TYPE_CHECKING
+from uuid import uuid4
+
+from flask import Flask, g
+from sqlalchemy.orm.attributes import set_committed_value
+
+from superset.utils.class_utils import load_class_from_name
+from superset.utils.core import override_user, QuerySource
+
+if TYPE_CHECKING:
+    from flask_appbuilder.security.sqla.models import User
+
+    from superset.models.core import Database
+    from superset.models.sql_lab import Query
+
+logger = logging.getLogger(__name__)
+
+
+def is_client_disconnected(environ: dict[str, Any]) -> bool:
+    """
+    Whether the client of a request closed its connection, eg, because the user
+    navigated away or changed a filter.
+
+    The socket of the request, exposed by gunicorn and the Werkzeug server, is
+    readable without data once the client closed it, since the request was read.
+    """
+    sock = environ.get("gunicorn.socket") or environ.get("werkzeug.socket")
+    if not isinstance(sock, socket.socket):
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable) and sock.recv(1, socket.MSG_PEEK) == b""
+    except (OSError, ValueError):
+        # eg, TLS sockets can't be peeked
+        return False
+
+
+@contextmanager
+def cancel_queries_when(is_cancelled: Callable[[], bool]) -> Iterator[None]:
+    """
+    Cancels the queries run in the context once `is_cancelled` returns True.
+
+    The function is called from another thread, and mustn't depend on the Flask
+    contexts.
+    """
+    previous = g.get("is_query_cancelled")
+    g.is_query_cancelled = is_cancelled
+    try:
+        yield
+    finally:
+        g.is_query_cancelled = previous
+
+
+@dataclass
+class InFlightQuery:
+    database: Database
+    query: Query
+    cancel_query_id: str
+    is_cancelled: Callable[[], bool]
+    user: User | None
+    started: float
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    done: bool = False
+
+
+class QueryCanceller:
+    """
+    Cancels the chart queries running in the databases when their results aren't
+    needed anymore.
+
+    The queries run in a `cancel_queries_when` context are tracked with the id their
+    engine spec needs to cancel them, eg, the id of their connection, and a thread
+    polls their `is_cancelled` function every `CHART_QUERY_CANCELLATION_POLL_SEC`.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__()
+        self.app = app
+        self.enabled = app.config["CHART_QUERY_CANCELLATION_ENABLED"]
+        self.poll_interval = app.config["CHART_QUERY_CANCELLATION_POLL_SEC"]
+        self.stats_logger = app.config["STATS_LOGGER"]
+        self._queries: dict[str, InFlightQuery] = {}
+        self._lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+
+    @contextmanager
+    def track(
+        self,
+        database: Database,
+        cursor: Any,
+        catalog: str | None = None,
+        schema: str | None = None,
+    ) -> Iterator[None]:
+        """
+        Tracks the query about to run in a cursor until it's done.
+        """
+        is_cancelled = g.get("is_query_cancelled")
+        if not self.enabled or not is_cancelled:
+            yield
+            return
+
+        # pylint: disable=import-outside-toplevel
+        from superset.models.sql_lab import Query
+
+        # the engine specs expect a SQL Lab query, which is kept out of the session
+        query = Query(catalog=catalog, schema=schema, extra_json="{}")
+        set_committed_value(query, "database", database)
+        try:
+            cancel_query_id = database.db_engine_spec.get_cancel_query_id(cursor, query)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to get the cancel id of a query", exc_info=True)
+            cancel_query_id = None
+        if cancel_query_id is None:
+            yield
+            return
+
+        key = uuid4().hex
+        in_flight = InFlightQuery(
+            database=database,
+            query=query,
+            cancel_query_id=cancel_query_id,
+            is_cancelled=is_cancelled,
+            user=g.get("user"),
+            started=time.monotonic(),
+        )
+        with self._lock:
+            self._queries[key] = in_flight
+            if self._watcher is None or not self._watcher.is_alive():
+                self._watcher = threading.Thread(target=self._watch, daemon=True)
+                self._watcher.start()
+        try:
+            yield
+        finally:
+            # the connection may be reused once the query is done, so it mustn't be
+            # cancelled anymore
+            with in_flight.lock:
+                in_flight.done = True
+            with self._lock:
+                del self._queries[key]
+
+    def _watch(self) -> None:
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                queries = list(self._queries.values())
+                if not queries:
+                    self._watcher = None
+                    return
+
+            for in_flight in queries:
+                try:
+                    if in_flight.is_cancelled():
+                        self.cancel(in_flight)
+                except Exception:  # pylint: disable=broad-except
+                    logger.warning("Unable to cancel a query", exc_info=True)
+
+    def cancel(self, in_flight: InFlightQuery) -> bool:
+        """
+        Cancels an in-flight query in its database, returning whether it was.
+        """
+        database = in_flight.database
+        with in_flight.lock:
+            if in_flight.done:
+                return False
+
+            with self.app.app_context(), override_user(in_flight.user):
+                with database.get_sqla_engine(
+                    catalog=in_flight.query.catalog,
+                    schema=in_flight.query.schema,
+                    source=QuerySource.CHART,
+                ) as engine:
+                    with closing(engine.raw_connection()) as conn:
+                        with closing(conn.cursor()) as cursor:
+                            cancelled = database.db_engine_spec.cancel_query(
+                                cursor, in_flight.query, in_flight.cancel_query_id
+                            )
+            # it isn't cancelled again while the query is interrupted
+            in_flight.done = True
+
+        if cancelled:
+            self.stats_logger.incr("chart_query_cancellation.cancelled")
+            self.stats_logger.timing(
+                "chart_query_cancellation.query_time",
+                (time.monotonic() - in_flight.started) * 1000,
+            )
+        else:
+            self.stats_logger.incr("chart_query_cancellation.failed")
+        return cancelled
+
+
+class QueryCancellerFactory:
+    def __init__(self) -> None:
+        self._query_canceller = None
+
+    def init_app(self, app: Flask) -> None:
+        self._query_canceller = load_class_from_name(
+            app.config["CHART_QUERY_CANCELLATION_CLASS"]
+        )(app)
+
+    @property
+    def instance(self) -> QueryCanceller:
+        return self._query_canceller  # type: ignore
@@ -16,8 +16,14 @@
 # under the License.
 
 import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from io import StringIO
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING
 
 import sshtunnel
 from flask import Flask
@@ -25,12 +31,16 @@ from paramiko import RSAKey
 
 from superset.databases.utils import make_url_safe
 from superset.utils.class_utils import load_class_from_name
+from superset.utils.hashing import md5_sha_from_dict
 
 if TYPE_CHECKING:
     from superset.databases.ssh_tunnel.models import SSHTunnel
 
 
 class SSHManager:
+    # whether the tunnels outlive the engine contexts, keeping their local ports
+    reuses_tunnels = False
+
     def __init__(self, app: Flask) -> None:
         super().__init__()
         self.local_bind_address = app.config["SSH_TUNNEL_LOCAL_BIND_ADDRESS"]
@@ -52,6 +62,15 @@ class SSHManager:
         ssh_tunnel: "SSHTunnel",
         sqlalchemy_database_uri: str,
     ) -> sshtunnel.SSHTunnelForwarder:
+        return sshtunnel.open_tunnel(
+            **self.get_tunnel_params(ssh_tunnel, sqlalchemy_database_uri)
+        )
+
+    def get_tunnel_params(
+        self,
+        ssh_tunnel: "SSHTunnel",
+        sqlalchemy_database_uri: str,
+    ) -> dict[str, Any]:
         from superset.utils.ssh_tunnel import get_default_port
 
         url = make_url_safe(sqlalchemy_database_uri)
@@ -73,7 +92,116 @@ class SSHManager:
             )
             params["ssh_pkey"] = private_key
 
-        return sshtunnel.open_tunnel(**params)
+        return params
+
+
+@dataclass
+class PooledTunnel:
+    server: sshtunnel.SSHTunnelForwarder
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    users: int = 0
+    last_used: float = 0.0
+    is_started: bool = False
+    timer: threading.Timer | None = None
+
+
+class PooledSSHManager(SSHManager):
+    """
+    An SSH manager sharing its tunnels across the engine contexts of the process.
+
+    The tunnels are keyed by their SSH server, credentials and remote bind address.
+    They're kept alive with keepalive packets, restarted when their transport is down,
+    and closed after `SSH_TUNNEL_POOL_IDLE_TIMEOUT_SEC` without engine contexts.
+    """
+
+    reuses_tunnels = True
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        self.idle_timeout = app.config["SSH_TUNNEL_POOL_IDLE_TIMEOUT_SEC"]
+        self.keepalive = app.config["SSH_TUNNEL_KEEPALIVE_SEC"]
+        self.stats_logger = app.config["STATS_LOGGER"]
+        self._tunnels: dict[str, PooledTunnel] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @staticmethod
+    def get_key(ssh_tunnel: "SSHTunnel", sqlalchemy_database_uri: str) -> str:
+        url = make_url_safe(sqlalchemy_database_uri)
+        return md5_sha_from_dict(
+            {
+                "server_address": ssh_tunnel.server_address,
+                "server_port": ssh_tunnel.server_port,
+                "username": ssh_tunnel.username,
+                "password": ssh_tunnel.password,
+                "private_key": ssh_tunnel.private_key,
+                "private_key_password": ssh_tunnel.private_key_password,
+                "remote_bind_address": [url.host, url.port],
+            }
+        )
+
+    @contextmanager
+    def create_tunnel(  # type: ignore[override]
+        self,
+        ssh_tunnel: "SSHTunnel",
+        sqlalchemy_database_uri: str,
+    ) -> Iterator[sshtunnel.SSHTunnelForwarder]:
+        key = self.get_key(ssh_tunnel, sqlalchemy_database_uri)
+        with self._lock:
+            # the tunnels of a forked process share the sockets of its parent, eg, in
+            # Celery or gunicorn workers, so they're dropped without being stopped
+            if os.getpid() != self._pid:
+                self._tunnels.clear()
+                self._pid = os.getpid()
+
+            if not (tunnel := self._tunnels.get(key)):
+                params = self.get_tunnel_params(ssh_tunnel, sqlalchemy_database_uri)
+                params["set_keepalive"] = self.keepalive
+                tunnel = PooledTunnel(server=sshtunnel.open_tunnel(**params))
+                self._tunnels[key] = tunnel
+            tunnel.users += 1
+
+        try:
+            with tunnel.lock:
+                if not tunnel.server.is_active:
+                    if tunnel.is_started:
+                        self.stats_logger.incr("ssh_tunnel_pool.restart")
+                        tunnel.server.restart()
+                    else:
+                        self.stats_logger.incr("ssh_tunnel_pool.miss")
+                        tunnel.server.start()
+                        tunnel.is_started = True
+                else:
+                    self.stats_logger.incr("ssh_tunnel_pool.hit")
+            yield tunnel.server
+        finally:
+            with self._lock:
+                tunnel.users -= 1
+                tunnel.last_used = time.monotonic()
+                if not tunnel.users and not tunnel.timer:
+                    self._schedule_close(key, tunnel, self.idle_timeout)
+
+    def _schedule_close(self, key: str, tunnel: PooledTunnel, delay: float) -> None:
+        tunnel.timer = threading.Timer(delay, self._close_idle, (key, tunnel))
+        tunnel.timer.daemon = True
+        tunnel.timer.start()
+
+    def _close_idle(self, key: str, tunnel: PooledTunnel) -> None:
+        with self._lock:
+            tunnel.timer = None
+            if tunnel.users or self._tunnels.get(key) is not tunnel:
+                return
+            idle = time.monotonic() - tunnel.last_used
+            if idle < self.idle_timeout:
+                self._schedule_close(key, tunnel, self.idle_timeout - idle)
+                return
+            del self._tunnels[key]
+
+        self.stats_logger.incr("ssh_tunnel_pool.closed")
+        with tunnel.lock:
+            if tunnel.is_started:
+                # the connections of pooled engines may still use the tunnel
+                tunnel.server.stop(force=True)
 
 
 class SSHManagerFactory:
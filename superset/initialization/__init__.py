@@ -45,6 +45,7 @@ from superset.core.api.types.rest_api import HostRestApi
 from superset.databases.utils import make_url_safe
 from superset.extensions import (
     _event_logger,
+    admission_controller_factory,
     APP_DIR,
     appbuilder,
     async_query_manager_factory,
@@ -53,10 +54,12 @@ from superset.extensions import (
     csrf,
     db,
     encrypted_field_factory,
+    engine_pool_factory,
     feature_flag_manager,
     machine_auth_provider_factory,
     manifest_processor,
     migrate,
+    query_canceller_factory,
     profiling,
     results_backend_manager,
     ssh_manager_factory,
@@ -568,6 +571,9 @@ class SupersetAppInitializer:  # pylint: disable=too-many-public-methods
         self.configure_auth_provider()
         self.configure_async_queries()
         self.configure_ssh_manager()
+        self.configure_engine_pool()
+        self.configure_admission_controller()
+        self.configure_query_canceller()
         self.configure_stats_manager()
 
         # Hook that provides administrators a handle on the Flask APP
@@ -739,6 +745,15 @@ class SupersetAppInitializer:  # pylint: disable=too-many-public-methods
     def configure_ssh_manager(self) -> None:
         ssh_manager_factory.init_app(self.superset_app)
 
+    def configure_engine_pool(self) -> None:
+        engine_pool_factory.init_app(self.superset_app)
+
+    def configure_admission_controller(self) -> None:
+        admission_controller_factory.init_app(self.superset_app)
+
+    def configure_query_canceller(self) -> None:
+        query_canceller_factory.init_app(self.superset_app)
+
     def configure_stats_manager(self) -> None:
         stats_logger_manager.init_app(self.superset_app)
 
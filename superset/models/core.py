@@ -30,10 +30,11 @@ from copy import deepcopy
 from datetime import datetime
 from functools import lru_cache
 from inspect import signature
-from typing import Any, Callable, cast, Optional, TYPE_CHECKING
+from typing import Any, Callable, cast, Iterator, Optional, TYPE_CHECKING
 
 import numpy
 import pandas as pd
+import pyarrow as pa
 import sqlalchemy as sqla
 import sshtunnel
 from flask import current_app as app, g, has_app_context
@@ -56,7 +57,8 @@ from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.url import URL
 from sqlalchemy.exc import NoSuchModuleError
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, Session
+from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.pool import NullPool
 from sqlalchemy.schema import UniqueConstraint
 from sqlalchemy.sql import ColumnElement, expression, Select
@@ -67,9 +69,12 @@ from superset.constants import LRU_CACHE_MAX_SIZE, PASSWORD_MASK
 from superset.databases.utils import make_url_safe
 from superset.db_engine_specs.base import MetricType, TimeGrain
 from superset.extensions import (
+    admission_controller_factory,
     cache_manager,
     encrypted_field_factory,
+    engine_pool_factory,
     event_logger,
+    query_canceller_factory,
     security_manager,
     ssh_manager_factory,
 )
@@ -364,6 +369,14 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
     def table_cache_timeout(self) -> int | None:
         return self.metadata_cache_timeout.get("table_cache_timeout")
 
+    @property
+    def stale_cache_timeout(self) -> int | None:
+        return self.get_extra().get("stale_cache_timeout")
+
+    @property
+    def max_concurrent_queries(self) -> int | None:
+        return self.get_extra().get("max_concurrent_queries")
+
     @property
     def default_schemas(self) -> list[str]:
         return self.get_extra().get("default_schemas", [])
@@ -475,6 +488,12 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                         nullpool=nullpool,
                         source=source,
                         sqlalchemy_uri=sqlalchemy_uri,
+                        # the local port of the tunnel changes with each tunnel,
+                        # unless the tunnels are reused across engine contexts
+                        pooled=(
+                            not ssh_context
+                            or ssh_manager_factory.instance.reuses_tunnels
+                        ),
                     )
 
     def _get_sqla_engine(  # pylint: disable=too-many-locals  # noqa: C901
@@ -484,6 +503,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         nullpool: bool = True,
         source: utils.QuerySource | None = None,
         sqlalchemy_uri: str | None = None,
+        pooled: bool = True,
     ) -> Engine:
         sqlalchemy_url = make_url_safe(
             sqlalchemy_uri if sqlalchemy_uri else self.sqlalchemy_uri_decrypted
@@ -492,7 +512,12 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
 
         extra = self.get_extra(source)
         engine_kwargs = extra.get("engine_params", {})
-        if nullpool:
+        pooled = (
+            pooled
+            and app.config["DB_ENGINE_POOL_ENABLED"]
+            and "poolclass" not in engine_kwargs
+        )
+        if nullpool and not pooled:
             engine_kwargs["poolclass"] = NullPool
         connect_args = engine_kwargs.setdefault("connect_args", {})
 
@@ -546,6 +571,13 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                 source,
             )
         try:
+            if pooled:
+                return engine_pool_factory.instance.get_engine(
+                    self.id,
+                    sqlalchemy_url,
+                    engine_kwargs,
+                    effective_username if self.impersonate_user else None,
+                )
             return create_engine(sqlalchemy_url, **engine_kwargs)
         except Exception as ex:
             raise self.db_engine_spec.get_dbapi_mapped_exception(ex) from ex
@@ -576,24 +608,26 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         nullpool: bool = True,
         source: utils.QuerySource | None = None,
     ) -> Connection:
-        with self.get_sqla_engine(
-            catalog=catalog,
-            schema=schema,
-            nullpool=nullpool,
-            source=source,
-        ) as engine:
-            with check_for_oauth2(self):
-                with closing(engine.raw_connection()) as conn:
-                    # pre-session queries are used to set the selected catalog/schema
-                    for prequery in self.db_engine_spec.get_prequeries(
-                        database=self,
-                        catalog=catalog,
-                        schema=schema,
-                    ):
-                        cursor = conn.cursor()
-                        cursor.execute(prequery)
-
-                    yield conn
+        with admission_controller_factory.instance.admit(self, source):
+            with self.get_sqla_engine(
+                catalog=catalog,
+                schema=schema,
+                nullpool=nullpool,
+                source=source,
+            ) as engine:
+                with check_for_oauth2(self):
+                    with closing(engine.raw_connection()) as conn:
+                        # pre-session queries are used to set the selected
+                        # catalog/schema
+                        for prequery in self.db_engine_spec.get_prequeries(
+                            database=self,
+                            catalog=catalog,
+                            schema=schema,
+                        ):
+                            cursor = conn.cursor()
+                            cursor.execute(prequery)
+
+                        yield conn
 
     def get_default_catalog(self) -> str | None:
         """
@@ -675,7 +709,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         catalog: str | None = None,
         schema: str | None = None,
         fetch_last_result: bool = False,
-    ) -> tuple[Any, list[tuple[Any, ...]] | None, DbapiDescription | None]:
+    ) -> tuple[Any, list[tuple[Any, ...]] | pa.Table | None, DbapiDescription | None]:
         """
         Internal method to execute SQL with mutation and logging.
 
@@ -684,10 +718,37 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         :param schema: Optional schema name
         :param fetch_last_result: Whether to fetch results from last statement
         :return: Tuple of (cursor, rows, description) where rows and description
-        are None if not fetching.
+        are None if not fetching. Rows are an Arrow table when the engine spec
+        supports fetching results as Arrow.
         """
         script = SQLScript(sql, self.db_engine_spec.engine)
+        log_query = self._get_query_logger(catalog, schema)
 
+        with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
+            cursor = conn.cursor()
+            rows = None
+            description = None
+
+            with query_canceller_factory.instance.track(self, cursor, catalog, schema):
+                for i, statement in enumerate(script.statements):
+                    self._execute_statement(cursor, statement.format(), log_query)
+
+                    # Fetch results from last statement if requested
+                    if fetch_last_result and i == len(script.statements) - 1:
+                        # Capture cursor.description while it's still valid
+                        description = cursor.description
+                        rows = self.db_engine_spec.fetch_results(cursor)
+                    else:
+                        # Consume results without storing
+                        cursor.fetchall()
+
+            return cursor, rows, description
+
+    def _get_query_logger(
+        self,
+        catalog: str | None,
+        schema: str | None,
+    ) -> Callable[[str], None]:
         with self.get_sqla_engine(catalog=catalog, schema=schema) as engine:
             engine_url = engine.url
 
@@ -703,35 +764,23 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                     security_manager,
                 )
 
-        with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
-            cursor = conn.cursor()
-            rows = None
-            description = None
+        return _log_query
 
-            for i, statement in enumerate(script.statements):
-                sql_ = self.mutate_sql_based_on_config(
-                    statement.format(),
-                    is_split=True,
-                )
-                _log_query(sql_)
-
-                with event_logger.log_context(
-                    action="execute_sql",
-                    database=self,
-                    object_ref=__name__,
-                ):
-                    self.db_engine_spec.execute(cursor, sql_, self)
-
-                # Fetch results from last statement if requested
-                if fetch_last_result and i == len(script.statements) - 1:
-                    # Capture cursor.description while it's still valid
-                    description = cursor.description
-                    rows = self.db_engine_spec.fetch_data(cursor)
-                else:
-                    # Consume results without storing
-                    cursor.fetchall()
+    def _execute_statement(
+        self,
+        cursor: Any,
+        sql: str,
+        log_query: Callable[[str], None],
+    ) -> None:
+        sql_ = self.mutate_sql_based_on_config(sql, is_split=True)
+        log_query(sql_)
 
-            return cursor, rows, description
+        with event_logger.log_context(
+            action="execute_sql",
+            database=self,
+            object_ref=__name__,
+        ):
+            self.db_engine_spec.execute(cursor, sql_, self)
 
     def execute_sql_statements(
         self,
@@ -780,6 +829,51 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
 
         return self.post_process_df(df)
 
+    def iter_df(
+        self,
+        sql: str,
+        catalog: str | None = None,
+        schema: str | None = None,
+        chunk_size: int = 10000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Run a query and yield the results of its last statement in DataFrames of up
+        to ``chunk_size`` rows.
+
+        Unlike ``get_df``, the results are read with a server-side cursor when the
+        engine supports it, so that memory usage doesn't depend on the number of rows.
+        At least one DataFrame is yielded, so that the columns of empty results are
+        known.
+        """
+        script = SQLScript(sql, self.db_engine_spec.engine)
+        log_query = self._get_query_logger(catalog, schema)
+
+        with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
+            *statements, last_statement = script.statements
+            for statement in statements:
+                with closing(conn.cursor()) as cursor:
+                    self._execute_statement(cursor, statement.format(), log_query)
+                    cursor.fetchall()
+
+            with closing(self.db_engine_spec.get_streaming_cursor(conn)) as cursor:
+                self._execute_statement(cursor, last_statement.format(), log_query)
+
+                empty = True
+                for rows in self.db_engine_spec.fetch_data_chunks(cursor, chunk_size):
+                    empty = False
+                    yield self._rows_to_df(cursor.description, rows)
+
+                if empty:
+                    yield self._rows_to_df(cursor.description, [])
+
+    def _rows_to_df(
+        self,
+        description: DbapiDescription,
+        rows: list[tuple[Any, ...]],
+    ) -> pd.DataFrame:
+        result_set = SupersetResultSet(rows, description, self.db_engine_spec)
+        return self.post_process_df(result_set.to_pandas_df())
+
     @event_logger.log_this
     def fetch_rows(self, cursor: Any, last: bool) -> list[tuple[Any, ...]] | None:
         if not last:
@@ -792,7 +886,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
     def load_into_dataframe(
         self,
         description: DbapiDescription,
-        data: list[tuple[Any, ...]],
+        data: list[tuple[Any, ...]] | pa.Table,
     ) -> pd.DataFrame:
         result_set = SupersetResultSet(
             data,
@@ -1304,6 +1398,50 @@ sqla.event.listen(Database, "after_insert", security_manager.database_after_inse
 sqla.event.listen(Database, "after_update", security_manager.database_after_update)
 sqla.event.listen(Database, "after_delete", security_manager.database_after_delete)
 
+# the permission snapshots are built again once the permissions of the roles, the
+# roles of the users and groups, or the names of the view menus are changed
+sqla.event.listen(
+    security_manager.role_model, "after_update", security_manager.on_role_after_update
+)
+sqla.event.listen(
+    security_manager.role_model, "after_delete", security_manager.on_role_after_update
+)
+sqla.event.listen(
+    security_manager.user_model,
+    "after_update",
+    security_manager.on_role_assignment_after_update,
+)
+sqla.event.listen(
+    security_manager.group_model,
+    "after_update",
+    security_manager.on_role_assignment_after_update,
+)
+sqla.event.listen(
+    security_manager.viewmenu_model,
+    "after_update",
+    security_manager.on_view_menu_after_update,
+)
+sqla.event.listen(Session, "after_commit", security_manager.permissions_after_commit)
+sqla.event.listen(
+    Session, "after_rollback", security_manager.permissions_after_rollback
+)
+
+
+def invalidate_engines(
+    mapper: Mapper,
+    connection: Connection,
+    target: Database,
+) -> None:
+    """
+    Disposes the pooled engines of a database when it's updated or deleted.
+    """
+    if engine_pool_factory.instance:
+        engine_pool_factory.instance.invalidate(target.id)
+
+
+sqla.event.listen(Database, "after_update", invalidate_engines)
+sqla.event.listen(Database, "after_delete", invalidate_engines)
+
 
 class DatabaseUserOAuth2Tokens(Model, AuditMixinNullable):
     """
@@ -100,6 +100,7 @@ from superset.utils.core import (
     SqlExpressionType,
 )
 from superset.utils.dates import datetime_to_epoch
+from superset.utils.decorators import stats_timing
 from superset.utils.rls import apply_rls
 
 
@@ -604,6 +605,7 @@ class QueryResult:  # pylint: disable=too-few-public-methods
         errors: Optional[list[dict[str, Any]]] = None,
         from_dttm: Optional[datetime] = None,
         to_dttm: Optional[datetime] = None,
+        rollup: Optional[str] = None,
     ) -> None:
         self.df = df
         self.query = query
@@ -616,6 +618,7 @@ class QueryResult:  # pylint: disable=too-few-public-methods
         self.errors = errors or []
         self.from_dttm = from_dttm
         self.to_dttm = to_dttm
+        self.rollup = rollup
         self.sql_rowcount = len(self.df.index) if not self.df.empty else 0
 
 
@@ -714,6 +717,7 @@ class QueryStringExtended(NamedTuple):
     labels_expected: list[str]
     prequeries: list[str]
     sql: str
+    rollup: Optional[str] = None
 
 
 class SqlaQuery(NamedTuple):
@@ -725,6 +729,7 @@ class SqlaQuery(NamedTuple):
     labels_expected: list[str]
     prequeries: list[str]
     sqla_query: Select
+    rollup: Optional[str] = None
 
 
 class ExploreMixin:  # pylint: disable=too-many-public-methods
@@ -974,17 +979,20 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
         query_obj: QueryObjectDict,
         mutate: bool = True,
     ) -> QueryStringExtended:
-        sqlaq = self.get_sqla_query(**query_obj)
-        sql = self.database.compile_sqla_query(
-            sqlaq.sqla_query,
-            catalog=self.catalog,
-            schema=self.schema,
-            is_virtual=bool(self.sql),
-        )
-        sql = self._apply_cte(sql, sqlaq.cte)
+        stats_logger = app.config["STATS_LOGGER"]
+        with stats_timing("sqla.query.time_building_query", stats_logger):
+            sqlaq = self.get_sqla_query(**query_obj)
+        with stats_timing("sqla.query.time_compiling_query", stats_logger):
+            sql = self.database.compile_sqla_query(
+                sqlaq.sqla_query,
+                catalog=self.catalog,
+                schema=self.schema,
+                is_virtual=bool(self.sql),
+            )
+            sql = self._apply_cte(sql, sqlaq.cte)
 
-        if mutate:
-            sql = self.database.mutate_sql_based_on_config(sql)
+            if mutate:
+                sql = self.database.mutate_sql_based_on_config(sql)
         return QueryStringExtended(
             applied_template_filters=sqlaq.applied_template_filters,
             applied_filter_columns=sqlaq.applied_filter_columns,
@@ -992,6 +1000,7 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
             labels_expected=sqlaq.labels_expected,
             prequeries=sqlaq.prequeries,
             sql=sql,
+            rollup=sqlaq.rollup,
         )
 
     def _normalize_prequery_result_type(
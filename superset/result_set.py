@@ -17,8 +17,11 @@
 """Superset wrapper around pyarrow.Table."""
 
 import datetime
+import decimal
 import logging
-from typing import Any, Optional
+from collections.abc import Iterable, Sequence
+from operator import itemgetter
+from typing import Any, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -99,19 +102,64 @@ def convert_to_string(value: Any) -> str:
     return str(value)
 
 
+def transpose_rows(data: DbapiResult, num_columns: int) -> list[list[Any]]:
+    """
+    Transpose a list of DBAPI rows into a list of columns.
+
+    The columns are built directly from the row tuples, avoiding the
+    intermediate NumPy structured array of Python objects that was previously
+    built for every result. Rows must all have ``num_columns`` values.
+    """
+    if {len(row) for row in data} - {num_columns}:
+        raise ValueError(f"Expected {num_columns} values in every row")
+    return [list(map(itemgetter(i), data)) for i in range(num_columns)]
+
+
+def to_object_array(values: list[Any]) -> NDArray[Any]:
+    """
+    Convert a column of values to a one dimensional NumPy object array.
+    """
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def arrow_type_hint(
+    description: tuple[Any, ...], values: list[Any]
+) -> Optional[pa.DataType]:
+    """
+    Return an Arrow type for a column based on its cursor description.
+
+    Inferring the precision and scale of ``Decimal`` values is by far the slowest
+    part of building Arrow arrays from Python objects, so when the driver reports
+    them in the cursor description the array is built with an explicit type.
+    """
+    precision, scale = (list(description) + [None] * 7)[4:6]
+    if not isinstance(precision, int) or not isinstance(scale, int):
+        return None
+    if not 0 < precision <= 38 or not 0 <= scale <= precision:
+        return None
+    sample = next((value for value in values if value is not None), None)
+    if isinstance(sample, decimal.Decimal):
+        return pa.decimal128(precision, scale)
+    return None
+
+
 class SupersetResultSet:
     def __init__(  # pylint: disable=too-many-locals  # noqa: C901
         self,
-        data: DbapiResult,
+        data: Union[DbapiResult, pa.Table],
         cursor_description: DbapiDescription,
         db_engine_spec: type[BaseEngineSpec],
     ):
         self.db_engine_spec = db_engine_spec
+        if isinstance(data, pa.Table):
+            self._init_from_arrow(data, cursor_description)
+            return
+
         data = data or []
         column_names: list[str] = []
         pa_data: list[pa.Array] = []
         deduped_cursor_desc: list[tuple[Any, ...]] = []
-        numpy_dtype: list[tuple[str, ...]] = []
+        columns: list[list[Any]] = []
         stringified_arr: NDArray[Any]
 
         if cursor_description:
@@ -128,17 +176,23 @@ class SupersetResultSet:
                 )
             ]
 
-            # generate numpy structured array dtype
-            numpy_dtype = [(column_name, "object") for column_name in column_names]
-
         # only do expensive recasting if datatype is not standard list of tuples
         if data and (not isinstance(data, list) or not isinstance(data[0], tuple)):
             data = [tuple(row) for row in data]
-        array = np.array(data, dtype=numpy_dtype)
 
-        for column in column_names:
+        if column_names:
+            # build the columns directly from the row tuples
+            columns = transpose_rows(data, len(column_names))
+
+        for values, description in zip(columns, deduped_cursor_desc, strict=False):
+            if arrow_type := arrow_type_hint(description, values):
+                try:
+                    pa_data.append(pa.array(values, type=arrow_type))
+                    continue
+                except (pa.lib.ArrowInvalid, pa.lib.ArrowTypeError):
+                    pass
             try:
-                pa_data.append(pa.array(array[column].tolist()))
+                pa_data.append(pa.array(values))
             except (
                 pa.lib.ArrowInvalid,
                 pa.lib.ArrowTypeError,
@@ -147,29 +201,30 @@ class SupersetResultSet:
                 TypeError,  # this is super hackey,
                 # https://issues.apache.org/jira/browse/ARROW-7855
             ):
-                # attempt serialization of values as strings
-                stringified_arr = stringify_values(array[column])
+                # attempt serialization of values as strings, only for the
+                # columns that Arrow could not convert
+                stringified_arr = stringify_values(to_object_array(values))
                 pa_data.append(pa.array(stringified_arr.tolist()))
 
         if pa_data:  # pylint: disable=too-many-nested-blocks
-            for i, column in enumerate(column_names):
+            for i, values in enumerate(columns):
                 if pa.types.is_nested(pa_data[i].type):
                     # TODO: revisit nested column serialization once nested types
                     #  are added as a natively supported column type in Superset
                     #  (superset.utils.core.GenericDataType).
-                    stringified_arr = stringify_values(array[column])
+                    stringified_arr = stringify_values(to_object_array(values))
                     pa_data[i] = pa.array(stringified_arr.tolist())
 
                 elif pa.types.is_temporal(pa_data[i].type):
                     # workaround for bug converting
                     # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
                     # related: https://issues.apache.org/jira/browse/ARROW-5248
-                    sample = self.first_nonempty(array[column])
+                    sample = self.first_nonempty(values)
                     if sample and isinstance(sample, datetime.datetime):
                         try:
                             if sample.tzinfo:
                                 tz = sample.tzinfo
-                                series = pd.Series(array[column])
+                                series = pd.Series(to_object_array(values))
                                 series = pd.to_datetime(series, utc=True)
                                 pa_data[i] = pa.Array.from_pandas(
                                     series,
@@ -178,6 +233,47 @@ class SupersetResultSet:
                         except Exception as ex:  # pylint: disable=broad-except
                             logger.exception(ex)
 
+        self._set_table(pa_data, column_names, deduped_cursor_desc)
+
+    def _init_from_arrow(
+        self,
+        table: pa.Table,
+        cursor_description: DbapiDescription,
+    ) -> None:
+        """
+        Build the result set from an Arrow table returned by the driver.
+
+        Only nested columns are converted, to strings, matching the result sets
+        built from DBAPI rows; every other column is used as is, without ever
+        materializing Python objects.
+        """
+        column_names = dedup(
+            [convert_to_string(col[0]) for col in cursor_description]
+            if cursor_description
+            else table.column_names
+        )
+        deduped_cursor_desc = [
+            tuple([column_name, *list(description)[1:]])  # noqa: C409
+            for column_name, description in zip(
+                column_names, cursor_description or [], strict=False
+            )
+        ]
+
+        pa_data: list[pa.ChunkedArray] = []
+        for column in table.columns:
+            if pa.types.is_nested(column.type):
+                stringified_arr = stringify_values(to_object_array(column.to_pylist()))
+                column = pa.chunked_array([pa.array(stringified_arr.tolist())])
+            pa_data.append(column)
+
+        self._set_table(pa_data, column_names, deduped_cursor_desc)
+
+    def _set_table(
+        self,
+        pa_data: Sequence[Union[pa.Array, pa.ChunkedArray]],
+        column_names: list[str],
+        deduped_cursor_desc: list[tuple[Any, ...]],
+    ) -> None:
         if not pa_data:
             column_names = []
 
@@ -186,7 +282,7 @@ class SupersetResultSet:
         try:
             # The driver may not be passing a cursor.description
             self._type_dict = {
-                col: db_engine_spec.get_datatype(deduped_cursor_desc[i][1])
+                col: self.db_engine_spec.get_datatype(deduped_cursor_desc[i][1])
                 for i, col in enumerate(column_names)
                 if deduped_cursor_desc
             }
@@ -215,7 +311,7 @@ class SupersetResultSet:
             return table.to_pandas(integer_object_nulls=True, timestamp_as_object=True)
 
     @staticmethod
-    def first_nonempty(items: NDArray[Any]) -> Any:
+    def first_nonempty(items: Iterable[Any]) -> Any:
         return next((i for i in items if i), None)
 
     def is_temporal(self, db_type_str: Optional[str]) -> bool:
@@ -21,9 +21,10 @@ import logging
 import re
 import time
 from collections import defaultdict
-from typing import Any, Callable, cast, NamedTuple, Optional, TYPE_CHECKING
+from typing import Any, Callable, cast, NamedTuple, Optional, TYPE_CHECKING, Union
+from uuid import uuid4
 
-from flask import current_app, Flask, g, Request
+from flask import current_app, Flask, g, has_app_context, Request
 from flask_appbuilder import Model
 from flask_appbuilder.security.sqla.apis import RoleApi, UserApi
 from flask_appbuilder.security.sqla.manager import SecurityManager
@@ -49,7 +50,7 @@ from flask_login import AnonymousUserMixin, LoginManager
 from jwt.api_jwt import _jwt_global_obj
 from sqlalchemy import and_, inspect, or_
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import eagerload
+from sqlalchemy.orm import eagerload, Session
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.orm.query import Query as SqlaQuery
 from sqlalchemy.sql import exists
@@ -68,6 +69,7 @@ from superset.security.guest_token import (
     GuestTokenUser,
     GuestUser,
 )
+from superset.security.rls import rls_filter_cache, RLSFilter
 from superset.sql.parse import process_jinja_sql, Table
 from superset.tasks.utils import get_current_user
 from superset.utils import json
@@ -102,6 +104,8 @@ def get_conf() -> Any:
 
 DATABASE_PERM_REGEX = re.compile(r"^\[.+\]\.\(id\:(?P<id>\d+)\)$")
 
+PERMISSIONS_VERSION_CACHE_KEY = "superset:permissions:version"
+
 
 class DatabaseCatalogSchema(NamedTuple):
     database: str
@@ -485,8 +489,145 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         user = g.user
         if user.is_anonymous:
             return self.is_item_public(permission_name, view_name)
+        # the permissions of the builtin roles are configured, rather than stored
+        if not self._has_builtin_roles(user) and (
+            (snapshot := self.get_permission_snapshot()) is not None
+        ):
+            return view_name in snapshot.get(permission_name, ())
         return self._has_view_access(user, permission_name, view_name)
 
+    def _has_builtin_roles(self, user: User) -> bool:
+        return any(role.name in self.builtin_roles for role in user.roles)
+
+    def get_permissions_version(self) -> Optional[str]:
+        """
+        Return the version of the permissions, read once per request.
+
+        :returns: The version of the permissions
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        if "permissions_version" not in g:
+            g.permissions_version = cache_manager.cache.get(
+                PERMISSIONS_VERSION_CACHE_KEY
+            )
+        return g.permissions_version
+
+    def invalidate_permission_snapshots(self) -> None:
+        """
+        Change the version of the permissions, so that the permission snapshots of
+        all the users are built again.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        version = uuid4().hex
+        cache_manager.cache.set(PERMISSIONS_VERSION_CACHE_KEY, version, timeout=0)
+        if has_app_context():
+            g.permissions_version = version
+            g.pop("permission_snapshots", None)
+
+    def flag_permissions_changed(self, target: Any) -> None:
+        """
+        Flag the session changing the permissions, so that the permission snapshots
+        are built again once it's committed.
+
+        The snapshots aren't invalidated at once, since the other workers would
+        build them again from the permissions committed before the change.
+
+        :param target: The mapped instance being changed
+        """
+        state = inspect(target, raiseerr=False)
+        # the permission views of set_perm are persisted without a session
+        session = state.session if state is not None and state.session else None
+        (session or self.session).info["permissions_changed"] = True
+
+    def permissions_after_commit(self, session: Session) -> None:
+        """
+        Invalidate the permission snapshots once the session changing the
+        permissions is committed, on SQLAlchemy after_commit events.
+
+        :param session: The committed session
+        """
+        if session.info.pop("permissions_changed", False):
+            self.invalidate_permission_snapshots()
+
+    @staticmethod
+    def permissions_after_rollback(session: Session) -> None:
+        """
+        Discard the changes of the permissions of a session rolled back, on
+        SQLAlchemy after_rollback events.
+
+        :param session: The rolled back session
+        """
+        session.info.pop("permissions_changed", None)
+
+    def get_permission_snapshot(self) -> Optional[dict[str, frozenset[str]]]:
+        """
+        Return the view menus of each permission granted to the current user, through
+        their roles and groups, if the permission snapshots are enabled.
+
+        The snapshots are cached, by version of the permissions, and memoized for
+        the request.
+
+        :returns: The view menu names by permission name
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        if not current_app.config["PERMISSION_SNAPSHOT_CACHE_ENABLED"]:
+            return None
+        if self.is_guest_user() or not (user_id := get_user_id()):
+            return None
+
+        snapshots = g.setdefault("permission_snapshots", {})
+        if user_id not in snapshots:
+            cache_key = (
+                f"superset:permissions:{self.get_permissions_version()}:{user_id}"
+            )
+            snapshot = cache_manager.cache.get(cache_key)
+            if snapshot is None:
+                snapshot = self._get_permission_snapshot(user_id)
+                cache_manager.cache.set(
+                    cache_key,
+                    snapshot,
+                    timeout=current_app.config["PERMISSION_SNAPSHOT_CACHE_TIMEOUT_SEC"],
+                )
+            snapshots[user_id] = snapshot
+        return snapshots[user_id]
+
+    def _get_permission_snapshot(self, user_id: int) -> dict[str, frozenset[str]]:
+        role_ids = (
+            self.session.query(assoc_user_role.c.role_id)
+            .filter(assoc_user_role.c.user_id == user_id)
+            .union(
+                self.session.query(assoc_group_role.c.role_id)
+                .join(
+                    assoc_user_group,
+                    assoc_user_group.c.group_id == assoc_group_role.c.group_id,
+                )
+                .filter(assoc_user_group.c.user_id == user_id)
+            )
+        )
+        query = (
+            self.session.query(self.permission_model.name, self.viewmenu_model.name)
+            .select_from(self.permissionview_model)
+            .join(self.permission_model)
+            .join(self.viewmenu_model)
+            .join(assoc_permissionview_role)
+            .filter(assoc_permissionview_role.c.role_id.in_(role_ids))
+            .distinct()
+        )
+
+        view_menu_names: dict[str, set[str]] = defaultdict(set)
+        for permission_name, view_menu_name in query:
+            view_menu_names[permission_name].add(view_menu_name)
+        return {
+            permission_name: frozenset(names)
+            for permission_name, names in view_menu_names.items()
+        }
+
     def can_access_all_queries(self) -> bool:
         """
         Return True if the user can access all SQL Lab queries, False otherwise.
@@ -840,6 +981,9 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         return True
 
     def user_view_menu_names(self, permission_name: str) -> set[str]:
+        if (snapshot := self.get_permission_snapshot()) is not None:
+            return set(snapshot.get(permission_name, ()))
+
         base_query = (
             self.session.query(self.viewmenu_model.name)
             .join(self.permissionview_model)
@@ -2178,6 +2322,27 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param target: The mapped instance being changed
         """
 
+        self.flag_permissions_changed(target)
+
+    def on_role_assignment_after_update(
+        self, mapper: Mapper, connection: Connection, target: Model
+    ) -> None:
+        """
+        Hook that allows for further custom operations when the roles, or groups,
+        of a User or a Group are changed, on SQLAlchemy after_update events.
+
+        :param mapper: The table mapper
+        :param connection: The DB-API connection
+        :param target: The mapped instance being changed
+        """
+        state = inspect(target)
+        if any(
+            state.attrs[name].history.has_changes()
+            for name in ("roles", "groups", "users")
+            if name in state.attrs
+        ):
+            self.flag_permissions_changed(target)
+
     def on_view_menu_after_insert(
         self, mapper: Mapper, connection: Connection, target: ViewMenu
     ) -> None:
@@ -2210,6 +2375,8 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param target: The mapped instance being persisted
         """
 
+        self.flag_permissions_changed(target)
+
     def on_permission_after_insert(
         self, mapper: Mapper, connection: Connection, target: Permission
     ) -> None:
@@ -2242,6 +2409,8 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param target: The mapped instance being persisted
         """
 
+        self.flag_permissions_changed(target)
+
     def on_permission_view_after_delete(
         self, mapper: Mapper, connection: Connection, target: PermissionView
     ) -> None:
@@ -2258,6 +2427,8 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param target: The mapped instance being persisted
         """
 
+        self.flag_permissions_changed(target)
+
     @staticmethod
     def get_exclude_users_from_lists() -> list[str]:
         """
@@ -2580,7 +2751,9 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             ]
         return []
 
-    def get_rls_filters(self, table: "BaseDatasource") -> list[SqlaQuery]:
+    def get_rls_filters(
+        self, table: "BaseDatasource"
+    ) -> Union[list[SqlaQuery], list[RLSFilter]]:
         """
         Retrieves the appropriate row level security filters for the current user and
         the passed table.
@@ -2592,6 +2765,12 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         if not (hasattr(g, "user") and g.user is not None):
             return []
 
+        if current_app.config["RLS_FILTER_CACHE_ENABLED"]:
+            return rls_filter_cache.get_filters(
+                [role.id for role in self.get_user_roles(g.user)],
+                table.id,
+            )
+
         # pylint: disable=import-outside-toplevel
         from superset.connectors.sqla.models import (
             RLSFilterRoles,
@@ -0,0 +1,218 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+from uuid import uuid4
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import inspect
+from sqlalchemy.engine.base import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.mapper import Mapper
+
+from superset.utils.core import RowLevelSecurityFilterType
+
+
+class RLSFilter(NamedTuple):
+    id: int
+    group_key: str | None
+    clause: str
+
+
+@dataclass(frozen=True)
+class RLSRule:
+    filter: RLSFilter
+    filter_type: str
+    role_ids: frozenset[int]
+    table_ids: frozenset[int]
+
+    def applies_to(self, role_ids: frozenset[int]) -> bool:
+        """
+        Whether the rule applies to a user with the roles: the regular filters apply
+        to their roles, and the base filters to all the other roles.
+        """
+        if self.filter_type == RowLevelSecurityFilterType.REGULAR:
+            return bool(self.role_ids & role_ids)
+        if self.filter_type == RowLevelSecurityFilterType.BASE:
+            return not self.role_ids & role_ids
+        return False
+
+
+class RLSFilterCache:
+    """
+    An in-process cache of the row level security filters of each set of roles.
+
+    The rules are loaded from the metadata database once per version, and compiled
+    into the filters of each table for each set of roles when first needed, so that
+    the filters of a table are looked up in memory. The version is shared through
+    the cache of `CACHE_CONFIG`, and changed once the transactions changing the
+    rules are committed, so that all the workers reload them. The rules are also
+    reloaded after `RLS_FILTER_CACHE_TIMEOUT_SEC`, eg, when the version can't be
+    shared because the cache is a `NullCache`.
+    """
+
+    version_key = "superset:rls_filters:version"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version: str | None = None
+        self._loaded: float = 0
+        self._rules: list[RLSRule] | None = None
+        self._filters: dict[frozenset[int], dict[int, list[RLSFilter]]] = {}
+
+    def get_version(self) -> str | None:
+        """
+        Returns the version of the rules, read once per request.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        if "rls_filters_version" not in g:
+            g.rls_filters_version = cache_manager.cache.get(self.version_key)
+        return g.rls_filters_version
+
+    def get_filters(self, role_ids: Iterable[int], table_id: int) -> list[RLSFilter]:
+        """
+        Returns the filters of a table for a user with the roles.
+        """
+        key = frozenset(role_ids)
+        version = self.get_version()
+        timeout = current_app.config["RLS_FILTER_CACHE_TIMEOUT_SEC"]
+        with self._lock:
+            if (
+                self._rules is None
+                or version != self._version
+                or time.monotonic() - self._loaded >= timeout
+            ):
+                self._rules = None
+                self._filters = {}
+            rules = self._rules
+            filters = self._filters.get(key)
+
+        if filters is None:
+            if rules is None:
+                rules = self.load_rules()
+            filters = self.compile(rules, key)
+            with self._lock:
+                if self._rules is None:
+                    self._version = version
+                    self._loaded = time.monotonic()
+                    self._rules = rules
+                if self._rules is rules:
+                    self._filters[key] = filters
+
+        return list(filters.get(table_id, ()))
+
+    @staticmethod
+    def load_rules() -> list[RLSRule]:
+        """
+        Loads all the rules, with their roles and tables, from the metadata database.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset import db
+        from superset.connectors.sqla.models import (
+            RLSFilterRoles,
+            RLSFilterTables,
+            RowLevelSecurityFilter,
+        )
+
+        role_ids: dict[int, set[int]] = defaultdict(set)
+        for filter_id, role_id in db.session.query(
+            RLSFilterRoles.c.rls_filter_id,
+            RLSFilterRoles.c.role_id,
+        ):
+            role_ids[filter_id].add(role_id)
+
+        table_ids: dict[int, set[int]] = defaultdict(set)
+        for filter_id, table_id in db.session.query(
+            RLSFilterTables.c.rls_filter_id,
+            RLSFilterTables.c.table_id,
+        ):
+            table_ids[filter_id].add(table_id)
+
+        return [
+            RLSRule(
+                filter=RLSFilter(id=id_, group_key=group_key, clause=clause),
+                filter_type=filter_type,
+                role_ids=frozenset(role_ids[id_]),
+                table_ids=frozenset(table_ids[id_]),
+            )
+            for id_, filter_type, group_key, clause in db.session.query(
+                RowLevelSecurityFilter.id,
+                RowLevelSecurityFilter.filter_type,
+                RowLevelSecurityFilter.group_key,
+                RowLevelSecurityFilter.clause,
+            ).order_by(RowLevelSecurityFilter.id)
+        ]
+
+    @staticmethod
+    def compile(
+        rules: list[RLSRule],
+        role_ids: frozenset[int],
+    ) -> dict[int, list[RLSFilter]]:
+        """
+        Groups the filters applying to a user with the roles by table.
+        """
+        filters: dict[int, list[RLSFilter]] = defaultdict(list)
+        for rule in rules:
+            if rule.applies_to(role_ids):
+                for table_id in rule.table_ids:
+                    filters[table_id].append(rule.filter)
+        return dict(filters)
+
+    def invalidate(self) -> None:
+        """
+        Changes the version of the rules, so that all the workers reload them.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        version = uuid4().hex
+        cache_manager.cache.set(self.version_key, version, timeout=0)
+        with self._lock:
+            self._rules = None
+            self._filters = {}
+        if has_app_context():
+            g.rls_filters_version = version
+
+    @staticmethod
+    def on_rules_changed(mapper: Mapper, connection: Connection, target: Any) -> None:
+        """
+        Flags the session changing the rules, or the roles, on SQLAlchemy events.
+
+        The rules are reloaded once the session is committed, since the other
+        workers would load the uncommitted rules otherwise.
+        """
+        if session := inspect(target).session:
+            session.info["rls_filters_changed"] = True
+
+    def on_session_commit(self, session: Session) -> None:
+        if session.info.pop("rls_filters_changed", False):
+            self.invalidate()
+
+    @staticmethod
+    def on_session_rollback(session: Session) -> None:
+        session.info.pop("rls_filters_changed", None)
+
+
+rls_filter_cache = RLSFilterCache()
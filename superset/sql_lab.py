@@ -57,12 +57,12 @@ from superset.models.sql_lab import Query
 from superset.result_set import SupersetResultSet
 from superset.sql.parse import BaseSQLStatement, CTASMethod, SQLScript, Table
 from superset.sqllab.limiting_factor import LimitingFactor
-from superset.sqllab.utils import write_ipc_buffer
+from superset.sqllab.utils import write_ipc_buffer, write_results_pages
 from superset.utils import json
+from superset.utils.compression import compress
 from superset.utils.core import (
     override_user,
     QuerySource,
-    zlib_compress,
 )
 from superset.utils.dates import now_as_float
 from superset.utils.decorators import stats_timing
@@ -283,7 +283,7 @@ def execute_query(  # pylint: disable=too-many-statements, too-many-locals  # no
                     str(query.to_dict()),
                 )
                 increased_limit = None if query.limit is None else query.limit + 1
-                data = db_engine_spec.fetch_data(cursor, increased_limit)
+                data = db_engine_spec.fetch_results(cursor, increased_limit)
                 if query.limit is None or len(data) <= query.limit:
                     query.limiting_factor = LimitingFactor.NOT_LIMITED
                 else:
@@ -338,11 +338,16 @@ def _serialize_and_expand_data(
     db_engine_spec: BaseEngineSpec,
     use_msgpack: Optional[bool] = False,
     expand_data: bool = False,
-) -> tuple[Union[bytes, str], list[Any], list[Any], list[Any]]:
+    paged: bool = False,
+) -> tuple[Union[bytes, str, None], list[Any], list[Any], list[Any]]:
     selected_columns = result_set.columns
     all_columns: list[Any]
     expanded_columns: list[Any]
 
+    if use_msgpack and paged:
+        # data is stored separately, in pages
+        return (None, selected_columns, selected_columns, [])
+
     if use_msgpack:
         if has_app_context():
             stats_logger = app.config["STATS_LOGGER"]
@@ -527,8 +532,12 @@ def execute_sql_statements(  # noqa: C901
     query.end_time = now_as_float()
 
     use_arrow_data = store_results and cast(bool, results_backend_use_msgpack)
+    page_size = app.config["SQLLAB_RESULTS_BACKEND_PAGE_SIZE"]
+    use_pages = bool(
+        use_arrow_data and results_backend and page_size and result_set.size > page_size
+    )
     data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
-        result_set, db_engine_spec, use_arrow_data, expand_data
+        result_set, db_engine_spec, use_arrow_data, expand_data, use_pages
     )
 
     # TODO: data should be saved separately from metadata (likely in Parquet)
@@ -562,6 +571,8 @@ def execute_sql_statements(  # noqa: C901
                 # Check the size of the serialized payload
                 if sql_lab_payload_max_mb := app.config.get("SQLLAB_PAYLOAD_MAX_MB"):
                     serialized_payload_size = sys.getsizeof(serialized_payload)
+                    if use_pages:
+                        serialized_payload_size += result_set.pa_table.nbytes
                     max_bytes = sql_lab_payload_max_mb * BYTES_IN_MB
 
                     if serialized_payload_size > max_bytes:
@@ -578,7 +589,19 @@ def execute_sql_statements(  # noqa: C901
             if cache_timeout is None:
                 cache_timeout = app.config["CACHE_DEFAULT_TIMEOUT"]
 
-            compressed = zlib_compress(serialized_payload)
+            if use_pages:
+                # write the pages before the index, so that they're always available
+                # when the index is
+                payload["pages"] = write_results_pages(
+                    key, result_set.pa_table, page_size, cache_timeout
+                )
+                serialized_payload = _serialize_payload(
+                    payload, cast(bool, results_backend_use_msgpack)
+                )
+
+            compressed = compress(
+                serialized_payload, app.config["RESULTS_BACKEND_COMPRESSION"]
+            )
             logger.debug(
                 "*** serialized payload size: %i", getsizeof(serialized_payload)
             )
@@ -608,6 +631,7 @@ def execute_sql_statements(  # noqa: C901
                     "expanded_columns": expanded_columns,
                 }
             )
+            payload.pop("pages", None)
         # Check the size of the serialized payload (opt-in logic for return_results)
         if sql_lab_payload_max_mb := app.config.get("SQLLAB_PAYLOAD_MAX_MB"):
             serialized_payload = _serialize_payload(
@@ -15,10 +15,10 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
-from typing import Any, cast, Optional
+from typing import Any, cast, Iterator, Optional
 from urllib import parse
 
-from flask import current_app as app, request, Response
+from flask import current_app as app, request, Response, stream_with_context
 from flask_appbuilder import permission_name
 from flask_appbuilder.api import expose, protect, rison, safe
 from flask_appbuilder.models.sqla.interface import SQLAInterface
@@ -274,25 +274,36 @@ class SqlLabRestApi(BaseSupersetApi):
 
         query, data, row_count = result["query"], result["data"], result["count"]
 
+        def log_export(row_count: int) -> None:
+            event_info = {
+                "event_type": "data_export",
+                "client_id": client_id,
+                "row_count": row_count,
+                "database": query.database.name,
+                "catalog": query.catalog,
+                "schema": query.schema,
+                "sql": query.sql,
+                "exported_format": "csv",
+            }
+            event_rep = repr(event_info)
+            logger.debug(
+                "CSV exported: %s", event_rep, extra={"superset_event": event_info}
+            )
+
+        if isinstance(data, bytes):
+            log_export(cast(int, row_count))
+            body: bytes | Iterator[bytes] = data
+        else:
+            # the CSV is streamed, so the row count is only known at the end
+            def stream_csv() -> Iterator[bytes]:
+                log_export((yield from data))
+
+            body = stream_with_context(stream_csv())
+
         quoted_csv_name = parse.quote(query.name)
-        response = CsvResponse(
-            data, headers=generate_download_headers("csv", quoted_csv_name)
-        )
-        event_info = {
-            "event_type": "data_export",
-            "client_id": client_id,
-            "row_count": row_count,
-            "database": query.database.name,
-            "catalog": query.catalog,
-            "schema": query.schema,
-            "sql": query.sql,
-            "exported_format": "csv",
-        }
-        event_rep = repr(event_info)
-        logger.debug(
-            "CSV exported: %s", event_rep, extra={"superset_event": event_info}
+        return CsvResponse(
+            body, headers=generate_download_headers("csv", quoted_csv_name)
         )
-        return response
 
     @expose("/results/")
     @protect()
@@ -337,7 +348,11 @@ class SqlLabRestApi(BaseSupersetApi):
         params = kwargs["rison"]
         key = params.get("key")
         rows = params.get("rows")
-        result = SqlExecutionResultsCommand(key=key, rows=rows).run()
+        offset = params.get("offset", 0)
+        limit = params.get("limit")
+        result = SqlExecutionResultsCommand(
+            key=key, rows=rows, offset=offset, limit=limit
+        ).run()
 
         # Using pessimistic json serialization since some database drivers can return
         # unserializeable types at times
@@ -19,11 +19,16 @@ from __future__ import annotations
 from typing import Any
 
 import pyarrow as pa
+from flask import current_app as app
+from flask_babel import gettext as __
 
-from superset import db, is_feature_enabled
+from superset import db, is_feature_enabled, results_backend
 from superset.common.db_query_status import QueryStatus
 from superset.daos.database import DatabaseDAO
+from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
+from superset.exceptions import SupersetErrorException
 from superset.models.sql_lab import TabState
+from superset.utils.compression import compress, decompress
 
 DATABASE_KEYS = [
     "allow_file_upload",
@@ -80,6 +85,72 @@ def write_ipc_buffer(table: pa.Table) -> pa.Buffer:
     return sink.getvalue()
 
 
+def get_results_page_key(key: str, page: int) -> str:
+    return f"{key}:page:{page}"
+
+
+def write_results_pages(
+    key: str,
+    table: pa.Table,
+    page_size: int,
+    cache_timeout: int | None,
+) -> dict[str, int]:
+    """
+    Store a result in the results backend as independently compressed pages.
+
+    Each page is an Arrow IPC stream with up to ``page_size`` rows, stored under its
+    own key so that a range of rows can be read without loading the whole result.
+    Returns the index to be stored alongside the query payload.
+    """
+    offsets = range(0, table.num_rows, page_size)
+    for page, offset in enumerate(offsets):
+        buffer = write_ipc_buffer(table.slice(offset, page_size)).to_pybytes()
+        results_backend.set(
+            get_results_page_key(key, page),
+            compress(buffer, app.config["RESULTS_BACKEND_COMPRESSION"]),
+            cache_timeout,
+        )
+
+    return {"size": page_size, "count": len(offsets), "rows": table.num_rows}
+
+
+def read_results_pages(
+    key: str,
+    pages: dict[str, int],
+    offset: int = 0,
+    limit: int | None = None,
+) -> pa.Table:
+    """
+    Read a range of rows from a result stored with ``write_results_pages``.
+
+    Only the pages overlapping with the requested rows are read.
+    """
+    page_size = pages["size"]
+    end = pages["rows"] if limit is None else min(offset + limit, pages["rows"])
+    first = min(offset // page_size, pages["count"] - 1)
+    last = max(first, (end - 1) // page_size)
+
+    tables = []
+    for page in range(first, last + 1):
+        blob = results_backend.get(get_results_page_key(key, page))
+        if not blob:
+            raise SupersetErrorException(
+                SupersetError(
+                    message=__(
+                        "Data could not be retrieved from the results backend. You "
+                        "need to re-run the original query."
+                    ),
+                    error_type=SupersetErrorType.RESULTS_BACKEND_ERROR,
+                    level=ErrorLevel.ERROR,
+                ),
+                status=410,
+            )
+        buffer = decompress(blob)
+        tables.append(pa.ipc.open_stream(pa.BufferReader(buffer)).read_all())
+
+    return pa.concat_tables(tables).slice(offset - first * page_size, limit)
+
+
 def bootstrap_sqllab_data(user_id: int | None) -> dict[str, Any]:
     tabs_state: list[Any] = []
     active_tab: Any = None
@@ -18,6 +18,7 @@ from __future__ import annotations
 
 import copy
 import logging
+from functools import partial
 from typing import Any, cast, TYPE_CHECKING
 
 from celery.exceptions import SoftTimeLimitExceeded
@@ -26,6 +27,8 @@ from flask_appbuilder.security.sqla.models import User
 from marshmallow import ValidationError
 
 from superset.charts.schemas import ChartDataQueryContextSchema
+from superset.common.utils.query_cache_manager import QueryCacheManager
+from superset.constants import CacheRegion
 from superset.exceptions import SupersetVizException
 from superset.extensions import (
     async_query_manager,
@@ -33,6 +36,7 @@ from superset.extensions import (
     celery_app,
     security_manager,
 )
+from superset.extensions.query_canceller import cancel_queries_when
 from superset.utils.cache import generate_cache_key, set_and_log_cache
 from superset.utils.core import override_user
 from superset.views.utils import get_datasource_info, get_viz
@@ -88,11 +92,22 @@ def load_chart_data_into_cache(
     from superset.commands.chart.data.get_data_command import ChartDataCommand
 
     with override_user(_load_user_from_job_metadata(job_metadata), force=False):
+        if async_query_manager.is_job_cancelled(job_metadata):
+            async_query_manager.update_job(
+                job_metadata,
+                async_query_manager.STATUS_ERROR,
+                errors=[{"message": "The job was cancelled"}],
+            )
+            return
+
         try:
             set_form_data(form_data)
             query_context = _create_query_context_from_form(form_data)
             command = ChartDataCommand(query_context)
-            result = command.run(cache=True)
+            with cancel_queries_when(
+                partial(async_query_manager.is_job_cancelled, job_metadata)
+            ):
+                result = command.run(cache=True)
             cache_key = result["cache_key"]
             result_url = f"/api/v1/chart/data/{cache_key}"
             async_query_manager.update_job(
@@ -113,6 +128,28 @@ def load_chart_data_into_cache(
             raise
 
 
+@celery_app.task(name="refresh_chart_data_cache", soft_time_limit=query_timeout)
+def refresh_chart_data_cache(
+    job_metadata: dict[str, Any],
+    form_data: dict[str, Any],
+    cache_key: str,
+) -> None:
+    """
+    Refresh the cached data of a chart query context that became stale, see
+    `DATA_CACHE_STALE_TIMEOUT`, and release its refresh flag.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.commands.chart.data.get_data_command import ChartDataCommand
+
+    with override_user(_load_user_from_job_metadata(job_metadata), force=False):
+        try:
+            set_form_data(form_data)
+            query_context = _create_query_context_from_form(form_data)
+            ChartDataCommand(query_context).run()
+        finally:
+            QueryCacheManager.release_refresh(cache_key, CacheRegion.DATA)
+
+
 @celery_app.task(name="load_explore_json_into_cache", soft_time_limit=query_timeout)
 def load_explore_json_into_cache(  # pylint: disable=too-many-locals
     job_metadata: dict[str, Any],
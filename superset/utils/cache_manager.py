@@ -15,18 +15,269 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from typing import Any, Optional, Union
 
+from cachelib import BaseCache
 from flask import Flask
 from flask_caching import Cache
+from flask_caching.backends import NullCache
 from markupsafe import Markup
 
+from superset.stats_logger import BaseStatsLogger, DummyStatsLogger
+from superset.utils import json
 from superset.utils.core import DatasourceType
 
 logger = logging.getLogger(__name__)
 
 CACHE_IMPORT_PATH = "superset.extensions.metastore_cache.SupersetMetastoreCache"
 
+# default number of seconds values are kept in the in-process L1 cache
+L1_CACHE_DEFAULT_TIMEOUT = 60
+
+
+class L1Cache(BaseCache):
+    """
+    A bounded in-process cache in front of another cache backend.
+
+    Values are kept pickled, so that the cache is bounded by their size in bytes and
+    callers can't mutate the cached objects, and evicted in LRU order. They're
+    deliberately unpickled on every hit, so only the round trip to the backend is
+    saved: the DataFrames of the data cache are kept encoded, so unpickling them is
+    mostly a copy of their bytes. They're kept
+    for at most ``timeout`` seconds (or less if set with a shorter timeout), so that
+    values expiring in the shared backend aren't served for long.
+
+    When the shared backend is Redis, writes are published on a channel so that the
+    other processes drop the keys from their L1 cache.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        backend: BaseCache,
+        max_bytes: int,
+        timeout: int = L1_CACHE_DEFAULT_TIMEOUT,
+        name: str = "cache",
+        stats_logger: BaseStatsLogger | None = None,
+    ) -> None:
+        super().__init__(default_timeout=backend.default_timeout)
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.name = name
+        self.stats_logger = stats_logger or DummyStatsLogger()
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+        self._pid: int | None = None
+
+        self._client = getattr(backend, "_write_client", None)
+        prefix = getattr(backend, "key_prefix", "") or ""
+        self._channel = f"{prefix}superset:l1_cache:{name}"
+        self._id = uuid.uuid4().hex
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _incr(self, metric: str) -> None:
+        self.stats_logger.incr(f"{self.name}_l1_{metric}")
+
+    def _ensure_process(self) -> None:
+        """
+        Reset the cache in forked processes, and start listening to invalidations.
+        """
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._entries.clear()
+            self._size = 0
+            self._id = uuid.uuid4().hex
+            self._pid = os.getpid()
+
+        if self._client is not None and hasattr(self._client, "pubsub"):
+            thread = threading.Thread(
+                target=self._listen,
+                args=(self._client,),
+                name=f"{self._channel}:listener",
+                daemon=True,
+            )
+            thread.start()
+
+    def _listen(self, client: Any) -> None:
+        pid = os.getpid()
+        while self._pid == pid:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                for message in pubsub.listen():
+                    self._invalidate(message["data"])
+            except Exception:  # pylint: disable=broad-except
+                # invalidations may have been missed
+                logger.warning("L1 cache invalidation failed", exc_info=True)
+                self._clear()
+                time.sleep(1)
+
+    def _invalidate(self, message: bytes | str) -> None:
+        payload = json.loads(message)
+        if payload["id"] == self._id:
+            return
+        if payload["keys"] is None:
+            self._clear()
+        else:
+            for key in payload["keys"]:
+                self._evict(key)
+
+    def _publish(self, keys: list[str] | None) -> None:
+        if self._client is None or not hasattr(self._client, "publish"):
+            return
+        try:
+            self._client.publish(
+                self._channel,
+                json.dumps({"id": self._id, "keys": keys}),
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not invalidate the L1 caches", exc_info=True)
+
+    def _get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+        return pickle.loads(value)  # noqa: S301
+
+    def _set(self, key: str, value: Any, timeout: int | None) -> None:
+        if timeout is None:
+            timeout = self.backend.default_timeout
+        if timeout < 0:
+            return
+        timeout = min(timeout, self.timeout) if timeout else self.timeout
+        try:
+            pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        if len(pickled) > self.max_bytes:
+            self._evict(key)
+            return
+
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (time.monotonic() + timeout, pickled)
+            self._size += len(pickled)
+            while self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+                self._incr("eviction")
+
+    def _pop(self, key: str) -> None:
+        if entry := self._entries.pop(key, None):
+            self._size -= len(entry[1])
+
+    def _evict(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get(self, key: str) -> Any:
+        self._ensure_process()
+        if (value := self._get(key)) is not None:
+            self._incr("hit")
+            return value
+
+        self._incr("miss")
+        value = self.backend.get(key)
+        if value is not None:
+            self._set(key, value, None)
+        return value
+
+    def get_many(self, *keys: str) -> list[Any]:
+        return [self.get(key) for key in keys]
+
+    def has(self, key: str) -> bool:
+        self._ensure_process()
+        return self._get(key) is not None or self.backend.has(key)
+
+    def set(self, key: str, value: Any, timeout: int | None = None) -> Optional[bool]:
+        self._ensure_process()
+        result = self.backend.set(key, value, timeout)
+        self._publish([key])
+        if result:
+            self._set(key, value, timeout)
+        else:
+            self._evict(key)
+        return result
+
+    def add(self, key: str, value: Any, timeout: int | None = None) -> bool:
+        self._ensure_process()
+        result = self.backend.add(key, value, timeout)
+        if result:
+            self._publish([key])
+            self._set(key, value, timeout)
+        return result
+
+    def set_many(
+        self, mapping: dict[str, Any], timeout: int | None = None
+    ) -> list[Any]:
+        self._ensure_process()
+        result = self.backend.set_many(mapping, timeout)
+        self._publish(list(mapping))
+        for key in mapping:
+            self._evict(key)
+        return result
+
+    def delete(self, key: str) -> bool:
+        self._ensure_process()
+        self._evict(key)
+        result = self.backend.delete(key)
+        self._publish([key])
+        return result
+
+    def delete_many(self, *keys: str) -> list[Any]:
+        self._ensure_process()
+        for key in keys:
+            self._evict(key)
+        result = self.backend.delete_many(*keys)
+        self._publish(list(keys))
+        return result
+
+    def clear(self) -> bool:
+        self._ensure_process()
+        self._clear()
+        result = self.backend.clear()
+        self._publish(None)
+        return result
+
+    def inc(self, key: str, delta: int = 1) -> Optional[int]:
+        self._ensure_process()
+        self._evict(key)
+        result = self.backend.inc(key, delta)
+        self._publish([key])
+        return result
+
+    def dec(self, key: str, delta: int = 1) -> Optional[int]:
+        self._ensure_process()
+        self._evict(key)
+        result = self.backend.dec(key, delta)
+        self._publish([key])
+        return result
+
 
 class ExploreFormDataCache(Cache):
     def get(self, *args: Any, **kwargs: Any) -> Optional[Union[str, Markup]]:
@@ -86,6 +337,18 @@ class CacheManager:
 
         cache.init_app(app, cache_config)
 
+        backend = app.extensions["cache"][cache]
+        if cache_config.get("CACHE_L1_MAX_BYTES") and not isinstance(
+            backend, NullCache
+        ):
+            app.extensions["cache"][cache] = L1Cache(
+                backend,
+                max_bytes=cache_config["CACHE_L1_MAX_BYTES"],
+                timeout=cache_config.get("CACHE_L1_TIMEOUT", L1_CACHE_DEFAULT_TIMEOUT),
+                name=cache_config_key.lower().removesuffix("_config"),
+                stats_logger=app.config["STATS_LOGGER"],
+            )
+
     def init_app(self, app: Flask) -> None:
         self._init_cache(app, self._cache, "CACHE_CONFIG")
         self._init_cache(app, self._data_cache, "DATA_CACHE_CONFIG")
@@ -0,0 +1,194 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compression codecs for the results backend and the data cache.
+
+Compressed values start with a small header identifying the codec, so that
+entries written with different codecs can be read while the configured codec is
+being changed. zlib is the exception: it was used before codecs were
+configurable, so zlib values are written without a header and can still be read
+by older workers. Values without a header are assumed to be zlib.
+"""
+
+from __future__ import annotations
+
+import zlib
+from abc import ABC, abstractmethod
+
+from superset.exceptions import CompressionCodecException
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# a zlib stream never starts with a null byte, since the low bits of its first
+# byte are always 8 (deflate)
+HEADER_MAGIC = b"\x00SC"
+HEADER_SIZE = len(HEADER_MAGIC) + 1
+
+
+class CompressionCodec(ABC):
+    name: str
+    id: int
+    # whether values are prefixed with the header by default
+    header = True
+    # package providing the codec, if not in the standard library
+    package: str | None = None
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes: ...
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes: ...
+
+    def is_available(self) -> bool:
+        return True
+
+
+class NoneCompressionCodec(CompressionCodec):
+    name = "none"
+    id = 0
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCompressionCodec(CompressionCodec):
+    name = "zlib"
+    id = 1
+    header = False
+
+    def __init__(self, level: int = zlib.Z_DEFAULT_COMPRESSION):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class ZstdCompressionCodec(CompressionCodec):
+    name = "zstd"
+    id = 2
+    package = "zstandard"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        # the content size is always written by `compress`
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    def is_available(self) -> bool:
+        return zstandard is not None
+
+
+class LZ4CompressionCodec(CompressionCodec):
+    name = "lz4"
+    id = 3
+    package = "lz4"
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4.frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4.frame.decompress(data)
+
+    def is_available(self) -> bool:
+        return lz4 is not None
+
+
+COMPRESSION_CODECS: dict[str, CompressionCodec] = {
+    codec.name: codec
+    for codec in (
+        NoneCompressionCodec(),
+        ZlibCompressionCodec(),
+        ZstdCompressionCodec(),
+        LZ4CompressionCodec(),
+    )
+}
+COMPRESSION_CODECS_BY_ID = {codec.id: codec for codec in COMPRESSION_CODECS.values()}
+
+
+def get_compression_codec(name: str) -> CompressionCodec:
+    """
+    Return a registered codec by name, checking that its library is installed.
+    """
+    codec = COMPRESSION_CODECS.get(name)
+    if codec is None:
+        raise CompressionCodecException(f"Unknown compression codec: {name}")
+    if not codec.is_available():
+        raise CompressionCodecException(
+            f"The {name} compression codec requires the `{codec.package}` package"
+        )
+    return codec
+
+
+def compress(
+    data: bytes | str,
+    codec: str = "zlib",
+    header: bool | None = None,
+) -> bytes:
+    """
+    Compress a value with the given codec, prefixed with its header.
+
+    The header is omitted for zlib unless ``header`` is set, so that the value can
+    be read by ``zlib_decompress``.
+
+    >>> decompress(compress(b"foo", "none"))
+    b'foo'
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    compression_codec = get_compression_codec(codec)
+    compressed = compression_codec.compress(data)
+    if not (compression_codec.header if header is None else header):
+        return compressed
+    return HEADER_MAGIC + bytes([compression_codec.id]) + compressed
+
+
+def decompress(data: bytes, default: str | None = "zlib") -> bytes:
+    """
+    Decompress a value written by ``compress``.
+
+    Values without a header are decompressed with the ``default`` codec, or returned
+    as is when it's ``None``.
+    """
+    if not data.startswith(HEADER_MAGIC) or len(data) < HEADER_SIZE:
+        if default is None:
+            return data
+        return get_compression_codec(default).decompress(data)
+
+    codec_id = data[len(HEADER_MAGIC)]
+    if codec_id not in COMPRESSION_CODECS_BY_ID:
+        raise CompressionCodecException(f"Unknown compression codec id: {codec_id}")
+    codec = get_compression_codec(COMPRESSION_CODECS_BY_ID[codec_id].name)
+    return codec.decompress(data[HEADER_SIZE:])
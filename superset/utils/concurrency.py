@@ -0,0 +1,150 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import as_completed, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from flask import (
+    copy_current_request_context,
+    current_app,
+    Flask,
+    g,
+    has_request_context,
+)
+from sqlalchemy import inspect
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_local = threading.local()
+
+
+def _call_in_app_context(
+    func: Callable[[T], R],
+    app: Flask,
+    g_values: dict[str, Any],
+) -> Callable[[T], R]:
+    """
+    Wraps a function to run it in a copy of the current Flask contexts.
+
+    Flask contexts are local to the thread handling the request, so the function runs
+    in a new app context with the values of `g` (eg, the user), and in a copy of the
+    request context if there's one.
+    """
+
+    def wrapper(item: T) -> R:
+        with app.app_context():
+            for key, value in g_values.items():
+                setattr(g, key, value)
+            _local.is_worker = True
+            try:
+                return func(item)
+            finally:
+                _local.is_worker = False
+
+    if has_request_context():
+        return copy_current_request_context(wrapper)
+    return wrapper
+
+
+def load_orm_state(instance: Any, *relationships: str) -> None:
+    """
+    Loads the attributes of an ORM instance, and of its related instances, before
+    it's used by worker threads.
+
+    The instances are bound to the session of the thread that loaded them, which
+    isn't thread safe, so the worker threads must only read their loaded state, and
+    not lazy load their relationships or their expired attributes.
+    """
+    state = inspect(instance, raiseerr=False)
+    if state is None or state.session is None:
+        return
+
+    for key in state.mapper.column_attrs.keys():
+        getattr(instance, key)
+    for name in relationships:
+        if name not in state.mapper.relationships:
+            continue
+        value = getattr(instance, name)
+        for related in value if isinstance(value, list) else [value]:
+            if related is not None:
+                load_orm_state(related)
+
+
+def map_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+) -> list[R]:
+    """
+    Returns the results of a function applied to items in up to `max_workers`
+    threads, in the order of the items.
+
+    The function runs in the Flask contexts of the caller, and the first exception it
+    raises is re-raised. The ORM instances it uses must be loaded beforehand, see
+    `load_orm_state`. With a single worker, or a single item, it runs in the
+    current thread, as do nested calls from the worker threads, so that the number
+    of threads is bounded by `max_workers`.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1 or getattr(_local, "is_worker", False):
+        return [func(item) for item in items]
+
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    g_values = dict(g.__dict__)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [
+            executor.submit(_call_in_app_context(func, app, g_values), item)
+            for item in items
+        ]
+        return [future.result() for future in futures]
+
+
+def iter_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+) -> Iterator[tuple[int, R]]:
+    """
+    Yields the index of each item and the result of a function applied to it in up
+    to `max_workers` threads, as the results are available.
+
+    It runs like `map_concurrently`, and the items that haven't started yet are
+    cancelled when the iterator is closed, eg, because the client of a streamed
+    response disconnected.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1 or getattr(_local, "is_worker", False):
+        for idx, item in enumerate(items):
+            yield idx, func(item)
+        return
+
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    g_values = dict(g.__dict__)
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+    try:
+        futures = {
+            executor.submit(_call_in_app_context(func, app, g_values), item): idx
+            for idx, item in enumerate(items)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
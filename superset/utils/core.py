@@ -2010,6 +2010,44 @@ def create_zip(files: dict[str, Any]) -> BytesIO:
     return buf
 
 
+class _ZipStreamBuffer:
+    """
+    Unseekable file object collecting what ``ZipFile`` writes, until it's read.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def read(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(files: dict[str, Iterable[bytes]]) -> Iterator[bytes]:
+    """
+    Like ``create_zip``, but the contents of the files and the resulting archive are
+    streamed, so that they're never fully in memory.
+    """
+    buf = _ZipStreamBuffer()
+    with ZipFile(buf, "w") as bundle:  # type: ignore
+        for filename, contents in files.items():
+            # the size is unknown beforehand, so allow large files
+            with bundle.open(filename, "w", force_zip64=True) as fp:
+                for chunk in contents:
+                    fp.write(chunk)
+                    if data := buf.read():
+                        yield data
+    yield buf.read()
+
+
 def check_is_safe_zip(zip_file: ZipFile) -> None:
     """
     Checks whether a ZIP file is safe, raises SupersetException if not.
@@ -14,14 +14,18 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import codecs
 import logging
 import re
 import urllib.request
-from typing import Any, Optional, Union
+from typing import Any, Iterator, Optional, Union
 from urllib.error import URLError
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from superset.utils import json
 from superset.utils.core import GenericDataType
@@ -64,6 +68,55 @@ def escape_value(value: str) -> str:
     return value
 
 
+# Strings that might need escaping: the ones starting with a special character or a
+# whitespace (including the non-ASCII ones matched by `\s`). Valid in Python and RE2.
+escape_candidates_pattern = r'^[\-@+|=%"\x09-\x0d\x1c-\x20]|^[^\x00-\x7f]'
+
+
+def match_strings(series: pd.Series, pattern: str) -> Optional[npt.NDArray[np.bool_]]:
+    """
+    Returns a boolean mask of the string values of an object series matching a regex.
+
+    Series of strings are matched with Arrow compute (RE2), series mixing strings and
+    other values with the pandas string methods (``re``), so the pattern must behave
+    the same in both. Returns ``None`` if the series has no string values.
+    """
+    inferred_type = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred_type == "string":
+        try:
+            array = pa.array(series.to_numpy(), type=pa.string(), from_pandas=True)
+        except (pa.ArrowException, UnicodeEncodeError):
+            # eg, lone surrogates can't be encoded to UTF-8
+            pass
+        else:
+            mask = pc.match_substring_regex(array, pattern).fill_null(False)
+            return mask.to_numpy(zero_copy_only=False)
+    elif inferred_type not in {"mixed", "mixed-integer"}:
+        return None
+
+    return series.str.match(pattern, na=False).to_numpy(dtype=bool)
+
+
+def escape_series(series: pd.Series) -> pd.Series:
+    """
+    Escapes the string values of a series, like ``escape_value``.
+
+    Candidates are found with a single vectorized match over the series, so that
+    only the (usually few) values starting with a special character are escaped
+    one by one. Non-string values are left untouched.
+    """
+    candidates = match_strings(series, escape_candidates_pattern)
+    if candidates is None or not candidates.any():
+        return series
+
+    values = series.to_numpy(dtype=object, copy=True)
+    values[candidates] = np.array(
+        [escape_value(value) for value in values[candidates]],
+        dtype=object,
+    )
+    return pd.Series(values, index=series.index, name=series.name)
+
+
 def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
     def escape_values(v: Any) -> Union[str, Any]:
         return escape_value(v) if isinstance(v, str) else v
@@ -72,15 +125,40 @@ def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
     df = df.rename(columns=escape_values)
 
     # Escape csv values
-    for name, column in df.items():
+    for col_idx, (_, column) in enumerate(df.items()):
         if column.dtype == np.dtype(object):
-            for idx, value in enumerate(column.values):
-                if isinstance(value, str):
-                    df.at[idx, name] = escape_value(value)
+            escaped = escape_series(column)
+            if escaped is not column:
+                df.isetitem(col_idx, escaped)
 
     return df.to_csv(escapechar="\\", **kwargs)
 
 
+def df_to_escaped_csv_chunks(
+    df: pd.DataFrame,
+    chunk_size: int,
+    **kwargs: Any,
+) -> Iterator[bytes]:
+    """
+    Convert a DataFrame to an escaped CSV, encoded in chunks of ``chunk_size`` rows.
+
+    Produces the same output as ``df_to_escaped_csv``, without building the whole
+    CSV in memory.
+    """
+    # an incremental encoder only writes the BOM of encodings like `utf-8-sig` once
+    encoder = codecs.getincrementalencoder(kwargs.get("encoding") or "utf-8")()
+    header = kwargs.pop("header", True)
+
+    for start in range(0, max(len(df.index), 1), chunk_size):
+        chunk = df.iloc[start : start + chunk_size]
+        csv_string = df_to_escaped_csv(
+            chunk,
+            header=header if start == 0 else False,
+            **kwargs,
+        )
+        yield encoder.encode(csv_string)
+
+
 def get_chart_csv_data(
     chart_url: str, auth_cookies: Optional[dict[str, str]] = None
 ) -> Optional[bytes]:
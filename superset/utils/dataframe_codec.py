@@ -0,0 +1,175 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Codecs for storing DataFrames in the data cache.
+
+By default DataFrames are stored as is, and pickled by the cache backend. Pickled
+object columns are large, slow to load and not guaranteed to work across pandas
+versions, so a codec can be configured via ``DATA_CACHE_DATAFRAME_CODEC`` to
+store them as compressed Arrow IPC or Parquet instead, wrapped in a small
+envelope. The payload can be further compressed with ``DATA_CACHE_COMPRESSION``.
+Entries that were pickled, or that couldn't be encoded, are returned as is when
+decoding.
+"""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, TypedDict, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from superset.exceptions import DataFrameCodecDecodeException
+from superset.utils import json
+from superset.utils.compression import compress, decompress
+
+logger = logging.getLogger(__name__)
+
+
+class EncodedDataFrame(TypedDict):
+    codec: str
+    metadata: str
+    payload: bytes
+
+
+class DataFrameCodec(ABC):
+    name: str
+
+    @abstractmethod
+    def encode(self, df: pd.DataFrame) -> bytes: ...
+
+    @abstractmethod
+    def decode(self, value: bytes) -> pd.DataFrame: ...
+
+    @staticmethod
+    def table_to_df(table: pa.Table) -> pd.DataFrame:
+        try:
+            return table.to_pandas(integer_object_nulls=True)
+        except pa.lib.ArrowInvalid:
+            return table.to_pandas(integer_object_nulls=True, timestamp_as_object=True)
+
+
+class ArrowIPCDataFrameCodec(DataFrameCodec):
+    name = "arrow"
+
+    def __init__(self, compression: str | None = "zstd"):
+        self.compression = compression
+
+    def encode(self, df: pd.DataFrame) -> bytes:
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def decode(self, value: bytes) -> pd.DataFrame:
+        return self.table_to_df(pa.ipc.open_stream(value).read_all())
+
+
+class ParquetDataFrameCodec(DataFrameCodec):
+    name = "parquet"
+
+    def __init__(self, compression: str | None = "zstd"):
+        self.compression = compression
+
+    def encode(self, df: pd.DataFrame) -> bytes:
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink, compression=self.compression or "none")
+        return sink.getvalue().to_pybytes()
+
+    def decode(self, value: bytes) -> pd.DataFrame:
+        return self.table_to_df(pq.read_table(pa.BufferReader(value)))
+
+
+# codecs used to decode entries, regardless of the codec currently configured
+DATAFRAME_CODECS: dict[str, DataFrameCodec] = {
+    codec.name: codec for codec in (ArrowIPCDataFrameCodec(), ParquetDataFrameCodec())
+}
+
+
+def has_string_labels(df: pd.DataFrame) -> bool:
+    """
+    Check that all the column labels are strings, or tuples of strings.
+
+    Arrow converts other labels to strings, so they wouldn't round trip.
+    """
+    return all(
+        all(isinstance(part, str) for part in label)
+        if isinstance(label, tuple)
+        else isinstance(label, str)
+        for label in df.columns
+    )
+
+
+def encode_dataframe(
+    df: pd.DataFrame,
+    codec: DataFrameCodec | None,
+    compression: str | None = None,
+) -> Union[pd.DataFrame, EncodedDataFrame]:
+    """
+    Encode a DataFrame for the data cache, optionally compressing the payload.
+
+    The DataFrame is returned as is when no codec is given, or when it can't be
+    encoded by the codec.
+    """
+    if codec is None or not isinstance(df, pd.DataFrame) or not has_string_labels(df):
+        return df
+
+    try:
+        payload = codec.encode(df)
+    except (pa.ArrowException, ValueError, TypeError) as ex:
+        logger.warning("Unable to encode DataFrame with codec %s: %s", codec.name, ex)
+        return df
+
+    if compression is not None:
+        payload = compress(payload, compression, header=True)
+
+    metadata = {"rows": len(df.index), "columns": [str(col) for col in df.columns]}
+    return {"codec": codec.name, "metadata": json.dumps(metadata), "payload": payload}
+
+
+def decode_dataframe(
+    value: Union[pd.DataFrame, EncodedDataFrame, Any],
+    codec: DataFrameCodec | None = None,
+) -> Any:
+    """
+    Decode a DataFrame stored in the data cache.
+
+    Values that were not encoded, like pickled DataFrames, are returned as is.
+    """
+    if not isinstance(value, dict) or "codec" not in value:
+        return value
+
+    if codec is None or codec.name != value["codec"]:
+        codec = DATAFRAME_CODECS.get(value["codec"])
+    if codec is None:
+        raise DataFrameCodecDecodeException(f"Unknown codec: {value['codec']}")
+
+    try:
+        payload = decompress(value["payload"], default=None)
+    except Exception as ex:  # pylint: disable=broad-except
+        raise DataFrameCodecDecodeException(str(ex)) from ex
+
+    try:
+        return codec.decode(payload)
+    except (pa.ArrowException, ValueError, TypeError) as ex:
+        raise DataFrameCodecDecodeException(str(ex)) from ex
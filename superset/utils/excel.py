@@ -15,27 +15,39 @@
 # specific language governing permissions and limitations
 # under the License.
 import io
-from typing import Any
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterator
 
+import numpy as np
 import pandas as pd
+import xlsxwriter
 
 from superset.utils.core import GenericDataType
+from superset.utils.csv import match_strings
+
+# keyword arguments of `DataFrame.to_excel` supported by `df_to_excel_chunks`
+STREAMING_EXCEL_ARGUMENTS = {"sheet_name", "index", "header", "na_rep"}
 
 
 def quote_formulas(df: pd.DataFrame) -> pd.DataFrame:
     """
     Make sure to quote any formulas for security reasons.
     """
-    formula_prefixes = {"=", "+", "-", "@"}
-
-    for col in df.select_dtypes(include="object").columns:
-        df[col] = df[col].apply(
-            lambda x: (
-                f"'{x}"
-                if isinstance(x, str) and len(x) and x[0] in formula_prefixes
-                else x
+    for col_idx, (_, column) in enumerate(df.items()):
+        if column.dtype != np.dtype(object):
+            continue
+
+        # only string values starting with one of =, +, - or @ are matched
+        needs_quoting = match_strings(column, r"^[=+\-@]")
+        if needs_quoting is not None and needs_quoting.any():
+            values = column.to_numpy(dtype=object, copy=True)
+            values[needs_quoting] = np.array(
+                [f"'{value}" for value in values[needs_quoting]],
+                dtype=object,
             )
-        )
+            df.isetitem(col_idx, values)
 
     return df
 
@@ -53,6 +65,102 @@ def df_to_excel(df: pd.DataFrame, **kwargs: Any) -> Any:
     return output.getvalue()
 
 
+def df_to_excel_chunks(
+    df: pd.DataFrame,
+    chunk_size: int = 64 * 1024,
+    **kwargs: Any,
+) -> Iterator[bytes]:
+    """
+    Convert a DataFrame to an Excel file, yielded in chunks of ``chunk_size`` bytes.
+
+    Rows are written with the ``constant_memory`` mode of xlsxwriter, which keeps
+    only the current row in memory, to a temporary file that is then read back in
+    chunks. DataFrames with hierarchical labels, or arguments other than the ones in
+    ``STREAMING_EXCEL_ARGUMENTS``, are converted with ``df_to_excel`` instead.
+    """
+    if (
+        isinstance(df.columns, pd.MultiIndex)
+        or isinstance(df.index, pd.MultiIndex)
+        or not set(kwargs) <= STREAMING_EXCEL_ARGUMENTS
+        or not isinstance(kwargs.get("header", True), bool)
+    ):
+        yield df_to_excel(df, **kwargs)
+        return
+
+    index = kwargs.get("index", True)
+    na_rep = kwargs.get("na_rep", "")
+
+    # make sure formulas are quoted, to prevent malicious injections
+    df = quote_formulas(df)
+
+    with tempfile.TemporaryFile() as output:
+        workbook = xlsxwriter.Workbook(
+            output,
+            {"constant_memory": True, "remove_timezone": True},
+        )
+        worksheet = workbook.add_worksheet(kwargs.get("sheet_name", "Sheet1"))
+        # same formats as `DataFrame.to_excel`
+        label_format = workbook.add_format(
+            {"bold": True, "border": 1, "align": "center", "valign": "top"}
+        )
+        formats: dict[type, Any] = {
+            datetime: workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"}),
+            date: workbook.add_format({"num_format": "yyyy-mm-dd"}),
+        }
+
+        row = 0
+        if kwargs.get("header", True):
+            labels = [df.index.name or ""] if index else []
+            labels.extend(str(column) for column in df.columns)
+            for col, label in enumerate(labels):
+                worksheet.write_string(row, col, label, label_format)
+            row += 1
+
+        for values in df.itertuples(index=index, name=None):
+            for col, value in enumerate(values):
+                cell_format = label_format if index and col == 0 else None
+                _write_excel_value(
+                    worksheet, row, col, value, na_rep, cell_format, formats
+                )
+            row += 1
+
+        workbook.close()
+
+        output.seek(0)
+        while chunk := output.read(chunk_size):
+            yield chunk
+
+
+def _write_excel_value(  # pylint: disable=too-many-arguments
+    worksheet: Any,
+    row: int,
+    col: int,
+    value: Any,
+    na_rep: str,
+    cell_format: Any,
+    formats: dict[type, Any],
+) -> None:
+    if isinstance(value, np.generic):
+        value = value.item()
+
+    if value is None or value is pd.NaT or value is pd.NA:
+        is_null = True
+    else:
+        is_null = isinstance(value, float) and np.isnan(value)
+
+    if is_null:
+        if na_rep:
+            worksheet.write_string(row, col, na_rep, cell_format)
+    elif isinstance(value, (bool, int, float, Decimal)):
+        worksheet.write(row, col, value, cell_format)
+    elif isinstance(value, datetime):
+        worksheet.write_datetime(row, col, value, cell_format or formats[datetime])
+    elif isinstance(value, date):
+        worksheet.write_datetime(row, col, value, cell_format or formats[date])
+    else:
+        worksheet.write_string(row, col, str(value), cell_format)
+
+
 def apply_column_types(
     df: pd.DataFrame, column_types: list[GenericDataType]
 ) -> pd.DataFrame:
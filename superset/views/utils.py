@@ -45,6 +45,7 @@ from superset.models.core import Database
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.models.sql_lab import Query
+from superset.sqllab.utils import read_results_pages
 from superset.superset_typing import FlaskResponse, FormData
 from superset.utils import json
 from superset.utils.core import DatasourceType
@@ -532,7 +533,11 @@ def check_datasource_perms(
 
 
 def _deserialize_results_payload(
-    payload: Union[bytes, str], query: Query, use_msgpack: Optional[bool] = False
+    payload: Union[bytes, str],
+    query: Query,
+    use_msgpack: Optional[bool] = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
 ) -> dict[str, Any]:
     logger.debug("Deserializing from msgpack: %r", use_msgpack)
     if use_msgpack:
@@ -543,8 +548,16 @@ def _deserialize_results_payload(
 
         with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
             try:
-                reader = pa.BufferReader(ds_payload["data"])
-                pa_table = pa.ipc.open_stream(reader).read_all()
+                if pages := ds_payload.get("pages"):
+                    # only read the pages with the requested rows
+                    pa_table = read_results_pages(
+                        query.results_key, pages, offset, limit
+                    )
+                else:
+                    reader = pa.BufferReader(ds_payload["data"])
+                    pa_table = pa.ipc.open_stream(reader).read_all()
+                    if offset or limit is not None:
+                        pa_table = pa_table.slice(offset, limit)
             except pa.ArrowSerializationError as ex:
                 raise SerializationError("Unable to deserialize table") from ex
 
@@ -566,7 +579,13 @@ def _deserialize_results_payload(
         return ds_payload
 
     with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
-        return json.loads(payload)
+        ds_payload = json.loads(payload)
+
+    if offset or limit is not None:
+        end = None if limit is None else offset + limit
+        ds_payload["data"] = ds_payload["data"][offset:end]
+
+    return ds_payload
 
 
 def get_cta_schema_name(
@@ -0,0 +1,180 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+
+from superset.extensions.admission_control import (
+    AdmissionController,
+    Workload,
+    WORKLOAD_PRIORITIES,
+)
+from superset.utils import json
+
+REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
+REDIS_PORT = os.environ.get("REDIS_PORT", "6379")
+REDIS_CACHE_DB = os.environ.get("REDIS_CACHE_DB", 4)
+
+DATABASE_ID = 4242
+
+
+@pytest.fixture
+def admission_controller() -> Iterator[AdmissionController]:
+    app = Mock()
+    app.config = {
+        "DB_ADMISSION_CONTROL_REDIS_URL": (
+            f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_CACHE_DB}"
+        ),
+        "DB_ADMISSION_CONTROL_MAX_WAIT_SEC": 1,
+        "DB_ADMISSION_CONTROL_LEASE_SEC": 3600,
+        "STATS_LOGGER": Mock(),
+    }
+    admission_controller = AdmissionController(app)
+    keys = admission_controller.get_keys(DATABASE_ID)
+    admission_controller.redis.delete(*keys)
+    yield admission_controller
+    admission_controller.redis.delete(*keys)
+
+
+def get_token(workload: Workload, user: str) -> str:
+    return f"{workload}|{user}|{uuid4().hex}"
+
+
+def acquire(
+    admission_controller: AdmissionController,
+    token: str,
+    slots: dict[str, Any] | None = None,
+    total: int = 0,
+) -> bool:
+    """
+    Runs the script acquiring a slot for a token, like `AdmissionController.admit`.
+    """
+    workload, user, _ = token.split("|")
+    admitted, _ = admission_controller.acquire(
+        admission_controller.get_keys(DATABASE_ID),
+        [
+            token,
+            user,
+            json.dumps(slots or {}),
+            total,
+            WORKLOAD_PRIORITIES[Workload(workload)],
+            3600,
+            10,
+        ],
+    )
+    return admitted
+
+
+def release(admission_controller: AdmissionController, token: str) -> None:
+    holders = admission_controller.get_keys(DATABASE_ID)[0]
+    admission_controller.redis.zrem(holders, token)
+
+
+def test_max_concurrent_queries(admission_controller: AdmissionController) -> None:
+    """
+    Test that the queries of all the workloads are limited by the database.
+    """
+    tokens = [
+        get_token(Workload.DASHBOARD, "1"),
+        get_token(Workload.SQL_LAB, "2"),
+        get_token(Workload.EXPLORE, "3"),
+    ]
+
+    assert acquire(admission_controller, tokens[0], total=2)
+    assert acquire(admission_controller, tokens[1], total=2)
+    assert not acquire(admission_controller, tokens[2], total=2)
+
+    release(admission_controller, tokens[0])
+    assert acquire(admission_controller, tokens[2], total=2)
+
+
+def test_workload_slots(admission_controller: AdmissionController) -> None:
+    """
+    Test that the queries of a workload are limited by its slots.
+    """
+    slots = {"sql_lab": 1}
+    sql_lab = [get_token(Workload.SQL_LAB, "1"), get_token(Workload.SQL_LAB, "2")]
+
+    assert acquire(admission_controller, sql_lab[0], slots)
+    assert not acquire(admission_controller, sql_lab[1], slots)
+    # the waiting query doesn't hold back the workloads with free slots
+    assert acquire(admission_controller, get_token(Workload.DASHBOARD, "1"), slots)
+
+    release(admission_controller, sql_lab[0])
+    assert acquire(admission_controller, sql_lab[1], slots)
+
+
+def test_priority(admission_controller: AdmissionController) -> None:
+    """
+    Test that the waiters of a higher priority workload are admitted first.
+    """
+    holder = get_token(Workload.DASHBOARD, "1")
+    explore = get_token(Workload.EXPLORE, "2")
+    dashboard = get_token(Workload.DASHBOARD, "3")
+
+    assert acquire(admission_controller, holder, total=1)
+    assert not acquire(admission_controller, explore, total=1)
+    assert not acquire(admission_controller, dashboard, total=1)
+
+    release(admission_controller, holder)
+    # the free slot is kept for the dashboard query, which arrived last
+    assert not acquire(admission_controller, explore, total=1)
+    assert acquire(admission_controller, dashboard, total=1)
+
+
+def test_user_fairness(admission_controller: AdmissionController) -> None:
+    """
+    Test that the waiters of the users holding fewer slots are admitted first.
+    """
+    holder = get_token(Workload.EXPLORE, "1")
+    busy = get_token(Workload.EXPLORE, "1")
+    other = get_token(Workload.EXPLORE, "2")
+
+    assert acquire(admission_controller, holder, total=1)
+    assert not acquire(admission_controller, busy, total=1)
+    assert not acquire(admission_controller, other, total=1)
+
+    release(admission_controller, holder)
+    assert not acquire(admission_controller, busy, total=1)
+    assert acquire(admission_controller, other, total=1)
+
+
+def test_user_fairness_keeps_priority(
+    admission_controller: AdmissionController,
+) -> None:
+    """
+    Test that the waiters of a user holding many slots still have the priority of
+    their workload.
+    """
+    holders = [get_token(Workload.DASHBOARD, "1") for _ in range(12)]
+    for token in holders:
+        assert acquire(admission_controller, token, total=12)
+
+    dashboard = get_token(Workload.DASHBOARD, "1")
+    explore = get_token(Workload.EXPLORE, "2")
+    assert not acquire(admission_controller, dashboard, total=12)
+    assert not acquire(admission_controller, explore, total=12)
+
+    release(admission_controller, holders[0])
+    assert not acquire(admission_controller, explore, total=12)
+    assert acquire(admission_controller, dashboard, total=12)
@@ -482,3 +482,35 @@ class TestSqlLabApi(SupersetTestCase):
         assert data == expected_data, f"CSV data mismatch. Got: {data}"
         db.session.delete(query_obj)
         db.session.commit()
+
+    @mock.patch("superset.models.sql_lab.Query.raise_for_access", lambda _: None)  # noqa: PT008
+    @mock.patch("superset.commands.sql_lab.export.results_backend", None)
+    def test_export_results_streaming(self) -> None:
+        self.login(ADMIN_USERNAME)
+
+        database = get_example_database()
+        query_obj = Query(
+            client_id="test_stream",
+            database=database,
+            tab_name="test_tab",
+            sql_editor_id="test_editor_id",
+            sql="select 1 as foo union all select 2",
+            select_sql="select 1 as foo union all select 2",
+            executed_sql="select 1 as foo union all select 2",
+            limit=100,
+            select_as_cta=False,
+            rows=2,
+            error_message="none",
+        )
+        db.session.add(query_obj)
+        db.session.commit()
+
+        app.config["SQLLAB_CSV_EXPORT_CHUNK_SIZE"] = 1
+        try:
+            resp = self.client.get("/api/v1/sqllab/export/test_stream/")
+            assert resp.is_streamed
+            assert resp.data == b"\xef\xbb\xbffoo\n1\n2\n"
+        finally:
+            app.config["SQLLAB_CSV_EXPORT_CHUNK_SIZE"] = None
+            db.session.delete(query_obj)
+            db.session.commit()
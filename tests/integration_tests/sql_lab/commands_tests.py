@@ -18,6 +18,7 @@ from unittest import mock
 from unittest.mock import Mock, patch
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 from flask import current_app
 from flask_babel import gettext as __
@@ -36,6 +37,7 @@ from superset.models.core import Database  # noqa: F401
 from superset.models.sql_lab import Query
 from superset.sqllab.limiting_factor import LimitingFactor
 from superset.sqllab.schemas import EstimateQueryCostSchema
+from superset.sqllab.utils import write_results_pages
 from superset.utils import core as utils
 from superset.utils.database import get_example_database
 from tests.integration_tests.base_tests import SupersetTestCase
@@ -87,10 +89,15 @@ class TestQueryEstimationCommand(SupersetTestCase):
             assert (
                 ex_info.value.error.error_type == SupersetErrorType.SQLLAB_TIMEOUT_ERROR
             )
-            assert ex_info.value.error.message == __(
-                "The query estimation was killed after %(sqllab_timeout)s seconds. It might "  # noqa: E501
-                "be too complex, or the database might be under heavy load.",
-                sqllab_timeout=current_app.config["SQLLAB_QUERY_COST_ESTIMATE_TIMEOUT"],
+            assert (
+                ex_info.value.error.message
+                == __(
+                    "The query estimation was killed after %(sqllab_timeout)s seconds. It might "  # noqa: E501
+                    "be too complex, or the database might be under heavy load.",
+                    sqllab_timeout=current_app.config[
+                        "SQLLAB_QUERY_COST_ESTIMATE_TIMEOUT"
+                    ],
+                )
             )
 
     def test_run_success(self) -> None:
@@ -222,6 +229,34 @@ class TestSqlResultExportCommand(SupersetTestCase):
         assert result["count"] == 1
         assert result["query"].client_id == "test"
 
+    @pytest.mark.usefixtures("create_database_and_query")
+    @patch("superset.models.sql_lab.Query.raise_for_access", lambda _: None)
+    def test_run_no_results_backend_streaming(self) -> None:
+        query_obj = db.session.query(Query).filter_by(results_key="abc_query").one()
+        query_obj.executed_sql = (
+            "select 1 as foo union all select 2 union all select 3 limit 3"
+        )
+        query_obj.select_sql = None
+        query_obj.limiting_factor = LimitingFactor.DROPDOWN
+        db.session.commit()
+
+        command = export.SqlResultExportCommand("test")
+
+        current_app.config["SQLLAB_CSV_EXPORT_CHUNK_SIZE"] = 1
+        try:
+            result = command.run()
+            assert result["count"] is None
+
+            data = result["data"]
+            chunks = [next(data), next(data)]
+            with pytest.raises(StopIteration) as excinfo:
+                next(data)
+        finally:
+            current_app.config["SQLLAB_CSV_EXPORT_CHUNK_SIZE"] = None
+
+        assert chunks == [b"\xef\xbb\xbffoo\n1\n", b"2\n"]
+        assert excinfo.value.value == 2
+
     @pytest.mark.usefixtures("create_database_and_query")
     @patch("superset.models.sql_lab.Query.raise_for_access", lambda _: None)
     @patch("superset.commands.sql_lab.export.results_backend_use_msgpack", False)
@@ -365,3 +400,62 @@ class TestSqlExecutionResultsCommand(SupersetTestCase):
         assert result.get("status") == "success"
         assert result["query"].get("rows") == 104
         assert result.get("data") == data
+
+    @pytest.mark.usefixtures("create_database_and_query")
+    @patch("superset.commands.sql_lab.results.results_backend_use_msgpack", False)
+    def test_run_with_offset_and_limit(self) -> None:
+        data = [{"col_0": i} for i in range(104)]
+        payload = {
+            "status": QueryStatus.SUCCESS,
+            "query": {"rows": 104},
+            "data": data,
+        }
+        serialized_payload = sql_lab._serialize_payload(payload, False)
+        compressed = utils.zlib_compress(serialized_payload)
+
+        results.results_backend = mock.Mock()
+        results.results_backend.get.return_value = compressed
+
+        command = results.SqlExecutionResultsCommand("abc_query", offset=10, limit=5)
+        result = command.run()
+
+        assert result.get("data") == data[10:15]
+
+    @pytest.mark.usefixtures("create_database_and_query")
+    @patch("superset.commands.sql_lab.results.results_backend_use_msgpack", True)
+    def test_run_paged_results(self) -> None:
+        store: dict[str, bytes] = {}
+        backend = mock.Mock()
+        backend.set.side_effect = lambda key, value, timeout: store.update({key: value})
+        backend.get.side_effect = store.get
+
+        table = pa.table({"col_0": list(range(104))})
+        with patch("superset.sqllab.utils.results_backend", backend):
+            pages = write_results_pages("abc_query", table, 10, None)
+        assert pages == {"size": 10, "count": 11, "rows": 104}
+
+        payload = {
+            "status": QueryStatus.SUCCESS,
+            "query": {"rows": 104},
+            "data": None,
+            "selected_columns": [{"name": "col_0", "type": "INT", "is_dttm": False}],
+            "pages": pages,
+        }
+        serialized_payload = sql_lab._serialize_payload(payload, True)
+        results.results_backend = mock.Mock()
+        results.results_backend.get.return_value = utils.zlib_compress(
+            serialized_payload
+        )
+
+        backend.get.reset_mock()
+        with patch("superset.sqllab.utils.results_backend", backend):
+            command = results.SqlExecutionResultsCommand(
+                "abc_query", offset=25, limit=10
+            )
+            result = command.run()
+
+        assert result["data"] == [{"col_0": i} for i in range(25, 35)]
+        assert [call.args[0] for call in backend.get.call_args_list] == [
+            "abc_query:page:2",
+            "abc_query:page:3",
+        ]
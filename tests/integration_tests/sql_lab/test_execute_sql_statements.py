@@ -14,12 +14,17 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from unittest import mock
+
+import msgpack
 from flask import current_app
 
 from superset.common.db_query_status import QueryStatus
 from superset.models.core import Database
 from superset.models.sql_lab import Query
 from superset.sql_lab import execute_sql_statements
+from superset.utils.compression import decompress, HEADER_MAGIC
+from superset.utils.core import zlib_decompress
 from superset.utils.dates import now_as_float
 
 
@@ -54,3 +59,66 @@ def test_non_async_execute(non_async_example_db: Database, example_query: Query)
 
     if non_async_example_db.db_engine_spec.engine_name == "hive":
         assert example_query.tracking_url_raw
+
+
+def test_execute_stores_paged_results(
+    non_async_example_db: Database, example_query: Query
+):
+    """Test that large results are stored as pages in the results backend"""
+    store: dict[str, bytes] = {}
+    backend = mock.Mock()
+    backend.set.side_effect = lambda key, value, timeout: store.update({key: value})
+    backend.get.side_effect = store.get
+
+    current_app.config["SQLLAB_RESULTS_BACKEND_PAGE_SIZE"] = 2
+    try:
+        with (
+            mock.patch("superset.sql_lab.results_backend", backend),
+            mock.patch("superset.sqllab.utils.results_backend", backend),
+        ):
+            execute_sql_statements(
+                example_query.id,
+                "select 1 as foo union all select 2 union all select 3",
+                store_results=True,
+                return_results=False,
+                start_time=now_as_float(),
+                expand_data=False,
+                log_params=dict(),  # noqa: C408
+            )
+    finally:
+        current_app.config["SQLLAB_RESULTS_BACKEND_PAGE_SIZE"] = None
+
+    key = example_query.results_key
+    assert sorted(store) == [key, f"{key}:page:0", f"{key}:page:1"]
+    payload = msgpack.loads(zlib_decompress(store[key], decode=False), raw=False)
+    assert payload["data"] is None
+    assert payload["pages"] == {"size": 2, "count": 2, "rows": 3}
+
+
+def test_execute_stores_compressed_results(
+    non_async_example_db: Database, example_query: Query
+):
+    """Test that results are compressed with the configured codec"""
+    store: dict[str, bytes] = {}
+    backend = mock.Mock()
+    backend.set.side_effect = lambda key, value, timeout: store.update({key: value})
+
+    current_app.config["RESULTS_BACKEND_COMPRESSION"] = "zstd"
+    try:
+        with mock.patch("superset.sql_lab.results_backend", backend):
+            execute_sql_statements(
+                example_query.id,
+                "select 1 as foo",
+                store_results=True,
+                return_results=False,
+                start_time=now_as_float(),
+                expand_data=False,
+                log_params=dict(),  # noqa: C408
+            )
+    finally:
+        current_app.config["RESULTS_BACKEND_COMPRESSION"] = "zlib"
+
+    blob = store[example_query.results_key]
+    assert blob.startswith(HEADER_MAGIC)
+    payload = msgpack.loads(decompress(blob), raw=False)
+    assert payload["query_id"] == example_query.id
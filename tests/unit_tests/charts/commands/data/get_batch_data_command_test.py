@@ -0,0 +1,112 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+
+from typing import Any
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from superset.commands.chart.data.get_batch_data_command import (
+    ChartDataBatchCommand,
+)
+from superset.commands.chart.exceptions import ChartDataQueryFailedError
+from superset.common.chart_data import ChartDataResultFormat
+from superset.exceptions import QueryObjectValidationError
+
+MODULE = "superset.commands.chart.data.get_batch_data_command"
+
+
+def make_query_context(form_data: dict[str, Any]) -> MagicMock:
+    if form_data.get("invalid"):
+        raise QueryObjectValidationError("Invalid query")
+
+    datasource = MagicMock(uid="1__table", **{"database.id": 1})
+    datasource.database.max_concurrent_queries = None
+    return MagicMock(
+        datasource=datasource,
+        queries=[MagicMock()],
+        cache_values={"queries": form_data["queries"]},
+        force=False,
+        result_format=ChartDataResultFormat.JSON,
+    )
+
+
+def test_batch_data_command(mocker: MockerFixture) -> None:
+    """
+    Test that identical query contexts are run once, and errors are per query context.
+    """
+    mocker.patch(
+        f"{MODULE}.ChartDataQueryContextSchema",
+        return_value=MagicMock(**{"load.side_effect": make_query_context}),
+    )
+    security_manager = mocker.patch(f"{MODULE}.security_manager")
+    security_manager.is_guest_user.return_value = False
+    security_manager.can_access_datasource.return_value = True
+
+    def run_query_context(query_context: MagicMock) -> MagicMock:
+        queries = query_context.cache_values["queries"]
+        command = MagicMock()
+        if queries == ["failed"]:
+            command.run.side_effect = ChartDataQueryFailedError("Query failed")
+        command.run.return_value = {"queries": [{"data": queries}]}
+        return command
+
+    chart_data_command = mocker.patch(
+        f"{MODULE}.ChartDataCommand", side_effect=run_query_context
+    )
+
+    results = list(
+        ChartDataBatchCommand(
+            [
+                {"queries": ["a"]},
+                {"queries": ["b"]},
+                {"queries": ["a"]},
+                {"invalid": True},
+                {"queries": ["failed"]},
+            ]
+        ).run()
+    )
+
+    assert sorted(results, key=lambda result: result["index"]) == [
+        {"index": 0, "status": 200, "result": [{"data": ["a"]}]},
+        {"index": 1, "status": 200, "result": [{"data": ["b"]}]},
+        {"index": 2, "status": 200, "result": [{"data": ["a"]}]},
+        {"index": 3, "status": 400, "message": "Invalid query"},
+        {"index": 4, "status": 400, "message": "Query failed"},
+    ]
+    assert chart_data_command.call_count == 3
+    security_manager.can_access_datasource.assert_called_once()
+
+
+def test_batch_data_command_access_denied(mocker: MockerFixture) -> None:
+    """
+    Test that the access is checked per query context when the datasource is denied.
+    """
+    mocker.patch(
+        f"{MODULE}.ChartDataQueryContextSchema",
+        return_value=MagicMock(**{"load.side_effect": make_query_context}),
+    )
+    security_manager = mocker.patch(f"{MODULE}.security_manager")
+    security_manager.is_guest_user.return_value = False
+    security_manager.can_access_datasource.return_value = False
+    chart_data_command = mocker.patch(f"{MODULE}.ChartDataCommand")
+
+    command = ChartDataBatchCommand([{"queries": ["a"]}, {"queries": ["b"]}])
+    command.validate()
+
+    assert chart_data_command.return_value.validate.call_count == 2
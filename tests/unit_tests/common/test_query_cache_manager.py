@@ -0,0 +1,202 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+from flask import current_app
+from flask_caching import Cache
+from pytest_mock import MockerFixture
+
+from superset.common.db_query_status import QueryStatus
+from superset.common.utils.query_cache_manager import QueryCacheManager
+from superset.constants import CacheRegion
+from superset.models.helpers import QueryResult
+from superset.utils.dataframe_codec import ArrowIPCDataFrameCodec
+from tests.conftest import with_config
+
+
+def get_cache(mocker: MockerFixture) -> Cache:
+    cache = Cache()
+    cache.init_app(current_app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch.dict(
+        "superset.common.utils.query_cache_manager._cache",
+        {CacheRegion.DATA: cache},
+    )
+    return cache
+
+
+@with_config({"DATA_CACHE_DATAFRAME_CODEC": ArrowIPCDataFrameCodec()})
+def test_set_query_result_with_codec(mocker: MockerFixture) -> None:
+    """
+    Test that DataFrames are encoded in the cache and decoded when read.
+    """
+    cache = get_cache(mocker)
+    df = pd.DataFrame({"a": [1, 2], "b": ["foo", None]})
+    query_result = QueryResult(
+        df=df,
+        query="SELECT 1",
+        duration=timedelta(seconds=1),
+        status=QueryStatus.SUCCESS,
+    )
+
+    QueryCacheManager().set_query_result(
+        key="key",
+        query_result=query_result,
+        region=CacheRegion.DATA,
+    )
+
+    assert cache.get("key")["df"]["codec"] == "arrow"
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    assert query_cache.is_loaded
+    pd.testing.assert_frame_equal(query_cache.df, df)
+
+
+def test_get_pickled_dataframe(mocker: MockerFixture) -> None:
+    """
+    Test that entries storing the DataFrame itself can still be read.
+    """
+    cache = get_cache(mocker)
+    df = pd.DataFrame({"a": [1, 2]})
+    cache.set("key", {"df": df, "query": "SELECT 1", "dttm": None})
+
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+
+    assert query_cache.is_loaded
+    pd.testing.assert_frame_equal(query_cache.df, df)
+
+
+def test_get_invalid_encoded_dataframe(mocker: MockerFixture) -> None:
+    """
+    Test that entries that can't be decoded are treated as a cache miss.
+    """
+    cache = get_cache(mocker)
+    cache.set(
+        "key",
+        {
+            "df": {"codec": "arrow", "metadata": "{}", "payload": b"invalid"},
+            "query": "SELECT 1",
+            "dttm": None,
+        },
+    )
+
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+
+    assert not query_cache.is_loaded
+
+
+def test_coalesce_leader(mocker: MockerFixture) -> None:
+    """
+    Test that the first caller takes the lease, and releases it when done.
+    """
+    cache = get_cache(mocker)
+    stats_logger = mocker.Mock()
+    mocker.patch.dict(current_app.config, {"STATS_LOGGER": stats_logger})
+
+    with QueryCacheManager.coalesce("key", 10, CacheRegion.DATA) as query_cache:
+        assert not query_cache.is_loaded
+        assert cache.get("key__lease")
+
+    assert not cache.get("key__lease")
+    stats_logger.incr.assert_called_once_with("coalescing_leader")
+
+
+def test_coalesce_waits_for_leader(mocker: MockerFixture) -> None:
+    """
+    Test that callers wait for the value loaded by the caller holding the lease.
+    """
+    cache = get_cache(mocker)
+    cache.add("key__lease", True)
+    df = pd.DataFrame({"a": [1, 2]})
+    sleep = mocker.patch(
+        "superset.common.utils.query_cache_manager.time.sleep",
+        side_effect=lambda _: cache.set(
+            "key", {"df": df, "query": "SELECT 1", "dttm": None}
+        ),
+    )
+
+    with QueryCacheManager.coalesce("key", 10, CacheRegion.DATA) as query_cache:
+        assert query_cache.is_loaded
+        pd.testing.assert_frame_equal(query_cache.df, df)
+
+    sleep.assert_called_once()
+    assert cache.get("key__lease")
+
+
+def test_coalesce_takes_over_released_lease(mocker: MockerFixture) -> None:
+    """
+    Test that a waiting caller takes the lease over if it's released without a value.
+    """
+    cache = get_cache(mocker)
+    cache.add("key__lease", True)
+    mocker.patch(
+        "superset.common.utils.query_cache_manager.time.sleep",
+        side_effect=lambda _: cache.delete("key__lease"),
+    )
+
+    with QueryCacheManager.coalesce("key", 10, CacheRegion.DATA) as query_cache:
+        assert not query_cache.is_loaded
+        assert cache.get("key__lease")
+
+    assert not cache.get("key__lease")
+
+
+def test_coalesce_timeout(mocker: MockerFixture) -> None:
+    """
+    Test that waiting callers give up after the timeout.
+    """
+    cache = get_cache(mocker)
+    cache.add("key__lease", True)
+    mocker.patch("superset.common.utils.query_cache_manager.time.sleep")
+    mocker.patch(
+        "superset.common.utils.query_cache_manager.time.monotonic",
+        side_effect=[0, 5, 11],
+    )
+
+    with QueryCacheManager.coalesce("key", 10, CacheRegion.DATA) as query_cache:
+        assert not query_cache.is_loaded
+
+    # the lease is still held by the other caller
+    assert cache.get("key__lease")
+
+
+def test_is_expired(mocker: MockerFixture) -> None:
+    """
+    Test that cached values are expired once older than the timeout.
+    """
+    cache = get_cache(mocker)
+    cache.set("key", {"df": pd.DataFrame(), "query": "SELECT 1", "dttm": None})
+    assert not QueryCacheManager.get("key", CacheRegion.DATA).is_expired(60)
+
+    dttm = (datetime.utcnow() - timedelta(seconds=120)).isoformat().split(".")[0]
+    cache.set("key", {"df": pd.DataFrame(), "query": "SELECT 1", "dttm": dttm})
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    assert query_cache.is_expired(60)
+    assert not query_cache.is_expired(300)
+
+
+def test_acquire_refresh(mocker: MockerFixture) -> None:
+    """
+    Test that a key can only be flagged as being refreshed once.
+    """
+    get_cache(mocker)
+
+    assert QueryCacheManager.acquire_refresh("key", 10, CacheRegion.DATA)
+    assert not QueryCacheManager.acquire_refresh("key", 10, CacheRegion.DATA)
+
+    QueryCacheManager.release_refresh("key", CacheRegion.DATA)
+    assert QueryCacheManager.acquire_refresh("key", 10, CacheRegion.DATA)
@@ -256,6 +256,18 @@ class TestQueryContextFactory:
         mock_dao.get_datasource.assert_called_once()
         assert result is not None
 
+    @patch("superset.common.query_context_factory.DatasourceDAO")
+    def test_convert_to_model_cache_datasources(self, mock_dao):
+        """Test _convert_to_model loads each datasource once when cached"""
+        factory = QueryContextFactory(cache_datasources=True)
+        mock_dao.get_datasource.side_effect = lambda **kwargs: Mock()
+
+        result = factory._convert_to_model({"type": "table", "id": 123})
+
+        assert factory._convert_to_model({"type": "table", "id": 123}) is result
+        assert factory._convert_to_model({"type": "table", "id": 456}) is not result
+        assert mock_dao.get_datasource.call_count == 2
+
     @patch("superset.common.query_context_factory.ChartDAO")
     def test_get_slice_found(self, mock_dao):
         """Test _get_slice when slice is found"""
@@ -15,15 +15,23 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from datetime import datetime, timedelta
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pandas as pd
 import pytest
 
-from superset.common.chart_data import ChartDataResultFormat
+from superset.common.chart_data import ChartDataResultFormat, ChartDataResultType
+from superset.common.db_query_status import QueryStatus
 from superset.common.query_context_processor import QueryContextProcessor
+from superset.common.query_object import QueryObject
+from superset.connectors.sqla.models import SqlaTable
+from superset.constants import CACHE_DISABLED_TIMEOUT
+from superset.models.helpers import QueryResult, QueryStringExtended
 from superset.utils.core import GenericDataType
+from tests.conftest import with_config
 
 
 @pytest.fixture
@@ -88,6 +96,39 @@ def test_get_data_xlsx(
     mock_df_to_excel.assert_called_once_with(df)
 
 
+@with_config({"CHART_DATA_EXPORT_CHUNK_SIZE": 2})
+def test_get_data_csv_streaming(processor, mock_query_context):
+    df = pd.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
+    coltypes = [GenericDataType.NUMERIC, GenericDataType.STRING]
+    mock_query_context.result_format = ChartDataResultFormat.CSV
+    mock_query_context.result_type = ChartDataResultType.FULL
+
+    result = processor.get_data(df, coltypes)
+    assert list(result) == [
+        b"\xef\xbb\xbfColumn 1,Column 2\n1,a\n2,b\n",
+        b"3,c\n",
+    ]
+
+    # post-processed results are needed as a string
+    mock_query_context.result_type = ChartDataResultType.POST_PROCESSED
+    result = processor.get_data(df, coltypes)
+    assert result == "Column 1,Column 2\n1,a\n2,b\n3,c\n"
+
+
+@with_config({"CHART_DATA_EXPORT_CHUNK_SIZE": 2})
+def test_get_data_xlsx_streaming(processor, mock_query_context):
+    df = pd.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
+    coltypes = [GenericDataType.NUMERIC, GenericDataType.STRING]
+    mock_query_context.result_format = ChartDataResultFormat.XLSX
+    mock_query_context.result_type = ChartDataResultType.FULL
+
+    result = processor.get_data(df, coltypes)
+    assert pd.read_excel(b"".join(result), index_col=0).to_dict("list") == {
+        "Column 1": [1, 2, 3],
+        "Column 2": ["a", "b", "c"],
+    }
+
+
 def test_get_data_json(processor, mock_query_context):
     df = pd.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
     coltypes = [GenericDataType.NUMERIC, GenericDataType.STRING]
@@ -636,6 +677,8 @@ def test_get_df_payload_validates_before_cache_key_generation():
     mock_query_context = MagicMock()
     mock_query_context.force = False
     mock_query_context.result_type = "full"
+    mock_query_context.get_cache_timeout.return_value = 300
+    mock_query_context.get_stale_cache_timeout.return_value = None
 
     # Create a mock datasource
     mock_datasource = MagicMock()
@@ -675,9 +718,9 @@ def test_get_df_payload_validates_before_cache_key_generation():
     def mock_cache_key(*args, **kwargs):
         call_order.append("cache_key")
         # Verify that extras have been sanitized at this point
-        assert query_obj.extras["where"] == "(col1 > 0)", (
-            f"Expected sanitized clause in cache_key, got: {query_obj.extras['where']}"
-        )
+        assert (
+            query_obj.extras["where"] == "(col1 > 0)"
+        ), f"Expected sanitized clause in cache_key, got: {query_obj.extras['where']}"
         return original_cache_key(*args, **kwargs)
 
     with patch.object(query_obj, "validate", side_effect=mock_validate):
@@ -701,3 +744,508 @@ def test_get_df_payload_validates_before_cache_key_generation():
         f"Expected validate to be called before cache_key, "
         f"but got call order: {call_order}"
     )
+
+
+@pytest.mark.parametrize("coalescing_timeout", [None, 10])
+def test_get_df_payload_coalescing(coalescing_timeout, mocker) -> None:
+    """
+    Test that cache misses wait for the query to be loaded by a concurrent request.
+    """
+    from superset.common.query_object import QueryObject
+
+    mocker.patch.dict(
+        "flask.current_app.config",
+        {"DATA_CACHE_COALESCING_TIMEOUT": coalescing_timeout},
+    )
+    mock_query_context = MagicMock()
+    mock_query_context.force = False
+    mock_query_context.get_cache_timeout.return_value = 300
+    mock_query_context.get_stale_cache_timeout.return_value = None
+    mock_datasource = MagicMock()
+    mock_datasource.cache_timeout = None
+    mock_datasource.column_names = ["col1"]
+    processor = QueryContextProcessor(mock_query_context)
+    processor._qc_datasource = mock_datasource
+    query_obj = QueryObject(datasource=mock_datasource, columns=["col1"], metrics=[])
+    mocker.patch.object(processor, "query_cache_key", return_value="key")
+    get_query_result = mocker.patch.object(processor, "get_query_result")
+    mocker.patch.object(processor, "get_annotation_data", return_value={})
+
+    cache_manager = mocker.patch(
+        "superset.common.query_context_processor.QueryCacheManager"
+    )
+    miss = MagicMock(is_loaded=False, df=pd.DataFrame({"col1": [1]}))
+    hit = MagicMock(is_loaded=True, df=pd.DataFrame({"col1": [1]}))
+    cache_manager.get.return_value = miss
+    cache_manager.coalesce.return_value.__enter__.return_value = hit
+
+    processor.get_df_payload(query_obj)
+
+    if coalescing_timeout:
+        cache_manager.coalesce.assert_called_once_with(
+            key="key", region="data", timeout=10
+        )
+        get_query_result.assert_not_called()
+    else:
+        cache_manager.coalesce.assert_not_called()
+        get_query_result.assert_called_once_with(query_obj)
+        miss.set_query_result.assert_called_once()
+
+
+@pytest.mark.parametrize("is_expired", [False, True])
+def test_get_df_payload_stale(is_expired, mocker) -> None:
+    """
+    Test that expired values are served as stale while they're refreshed.
+    """
+    from superset.common.query_object import QueryObject
+
+    mock_query_context = MagicMock()
+    mock_query_context.force = False
+    mock_query_context.get_cache_timeout.return_value = 300
+    mock_query_context.get_stale_cache_timeout.return_value = 3600
+    processor = QueryContextProcessor(mock_query_context)
+    processor._qc_datasource = MagicMock()
+    query_obj = QueryObject(datasource=processor._qc_datasource, columns=[])
+    mocker.patch.object(processor, "query_cache_key", return_value="key")
+    get_query_result = mocker.patch.object(processor, "get_query_result")
+    refresh_stale_cache = mocker.patch.object(processor, "refresh_stale_cache")
+
+    cache_manager = mocker.patch(
+        "superset.common.query_context_processor.QueryCacheManager"
+    )
+    cache = MagicMock(is_loaded=True, is_stale=False, df=pd.DataFrame())
+    cache.is_expired.return_value = is_expired
+    cache_manager.get.return_value = cache
+
+    payload = processor.get_df_payload(query_obj)
+
+    cache.is_expired.assert_called_once_with(300)
+    get_query_result.assert_not_called()
+    assert payload["is_stale"] == is_expired
+    if is_expired:
+        refresh_stale_cache.assert_called_once_with(3600)
+    else:
+        refresh_stale_cache.assert_not_called()
+
+
+def test_refresh_stale_cache(mocker) -> None:
+    """
+    Test that stale values are refreshed by a forced query in a Celery task, once
+    per query context.
+    """
+    mock_query_context = MagicMock()
+    mock_query_context.form_data = {"slice_id": 1}
+    mock_query_context.custom_cache_timeout = None
+    mock_query_context.cache_values = {"datasource": {"id": 1}, "queries": []}
+    processor = QueryContextProcessor(mock_query_context)
+    mocker.patch("superset.common.query_context_processor.get_user_id", return_value=1)
+    security_manager = mocker.patch(
+        "superset.common.query_context_processor.security_manager",
+        new=MagicMock(),
+    )
+    security_manager.get_current_guest_user_if_guest.return_value = None
+    cache_manager = mocker.patch(
+        "superset.common.query_context_processor.QueryCacheManager"
+    )
+    cache_manager.acquire_refresh.side_effect = [True, False]
+    task = mocker.patch("superset.tasks.async_queries.refresh_chart_data_cache")
+
+    processor.refresh_stale_cache(3600)
+    processor.refresh_stale_cache(3600)
+
+    key = processor.cache_key()
+    cache_manager.acquire_refresh.assert_called_with(key, 3600, "data")
+    task.delay.assert_called_once_with(
+        {"user_id": 1},
+        {
+            "form_data": {"slice_id": 1},
+            "custom_cache_timeout": None,
+            "datasource": {"id": 1},
+            "queries": [],
+            "force": True,
+        },
+        key,
+    )
+
+
+def render_sql(query_dict):
+    return f"SELECT {', '.join(query_dict['columns'])} FROM t"  # noqa: S608
+
+
+def compile_sql(query_dict, mutate=True) -> QueryStringExtended:
+    return QueryStringExtended(
+        applied_template_filters=[],
+        applied_filter_columns=[],
+        rejected_filter_columns=[],
+        labels_expected=query_dict["columns"],
+        prequeries=[],
+        sql=render_sql(query_dict),
+    )
+
+
+def get_raw_cache_processor(mocker) -> QueryContextProcessor:
+    from flask import current_app
+    from flask_caching import Cache
+
+    from superset.constants import CacheRegion
+
+    cache = Cache()
+    cache.init_app(current_app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch.dict(
+        "superset.common.utils.query_cache_manager._cache",
+        {CacheRegion.DATA: cache},
+    )
+    mocker.patch(
+        "superset.common.query_context_processor.security_manager",
+        new=MagicMock(**{"get_rls_cache_key.return_value": []}),
+    )
+
+    mock_query_context = MagicMock()
+    mock_query_context.force = False
+    mock_query_context.get_cache_timeout.return_value = 300
+    processor = QueryContextProcessor(mock_query_context)
+    processor._qc_datasource = MagicMock(
+        spec=SqlaTable,
+        uid="1__table",
+        catalog=None,
+        schema="public",
+        **{"database.id": 1, "database.extra": "{}"},
+    )
+    processor._qc_datasource.get_query_str_extended.side_effect = compile_sql
+    processor._qc_datasource.query.side_effect = (
+        lambda query_dict, query_str_ext=None: QueryResult(
+            df=pd.DataFrame({col: [1, 2] for col in query_dict["columns"]}),
+            query=render_sql(query_dict),
+            duration=timedelta(0),
+        )
+    )
+    return processor
+
+
+@with_config({"DATA_CACHE_RAW_QUERY_RESULTS": True})
+def test_query_datasource_raw_cache(mocker) -> None:
+    """
+    Test that queries rendering to the same SQL share their raw result.
+    """
+    processor = get_raw_cache_processor(mocker)
+    datasource = processor._qc_datasource
+
+    result = processor.query_datasource({"columns": ["a"], "post_processing": []})
+    assert datasource.query.call_count == 1
+    # the query compiled for the cache key is run on a miss
+    assert datasource.get_query_str_extended.call_count == 1
+    assert datasource.query.call_args.kwargs["query_str_ext"] == compile_sql(
+        {"columns": ["a"]}
+    )
+
+    cached = processor.query_datasource(
+        {"columns": ["a"], "post_processing": [{"operation": "pivot"}]}
+    )
+    assert datasource.query.call_count == 1
+    pd.testing.assert_frame_equal(cached.df, result.df)
+    assert cached.query == "SELECT a FROM t"
+
+    processor.query_datasource({"columns": ["b"]})
+    assert datasource.query.call_count == 2
+
+    processor._query_context.force = True
+    processor.query_datasource({"columns": ["a"]})
+    assert datasource.query.call_count == 3
+
+
+@with_config({"DATA_CACHE_RAW_QUERY_RESULTS": True})
+def test_query_datasource_raw_cache_per_user(mocker) -> None:
+    """
+    Test that raw results aren't shared between users when cached per user.
+    """
+    processor = get_raw_cache_processor(mocker)
+    get_impersonation_cache_key = mocker.patch(
+        "superset.common.query_context_processor.get_impersonation_cache_key",
+        return_value="alice",
+    )
+
+    processor.query_datasource({"columns": ["a"]})
+    processor.query_datasource({"columns": ["a"]})
+    assert processor._qc_datasource.query.call_count == 1
+
+    get_impersonation_cache_key.return_value = "bob"
+    processor.query_datasource({"columns": ["a"]})
+    assert processor._qc_datasource.query.call_count == 2
+
+
+@with_config({"DATA_CACHE_RAW_QUERY_RESULTS": True})
+def test_query_datasource_raw_cache_timeout_disabled(mocker) -> None:
+    """
+    Test that raw results cached by other charts aren't served to a chart with its
+    cache disabled.
+    """
+    processor = get_raw_cache_processor(mocker)
+    processor.query_datasource({"columns": ["a"]})
+    assert processor._qc_datasource.query.call_count == 1
+
+    processor._query_context.get_cache_timeout.return_value = CACHE_DISABLED_TIMEOUT
+    processor.query_datasource({"columns": ["a"]})
+    assert processor._qc_datasource.query.call_count == 2
+
+
+def test_query_datasource_raw_cache_disabled(mocker) -> None:
+    """
+    Test that raw results aren't cached by default.
+    """
+    processor = get_raw_cache_processor(mocker)
+
+    processor.query_datasource({"columns": ["a"]})
+    processor.query_datasource({"columns": ["a"]})
+    assert processor._qc_datasource.query.call_count == 2
+    processor._qc_datasource.get_query_str_extended.assert_not_called()
+
+
+def get_incremental_query_object(time_range: str) -> QueryObject:
+    return QueryObject(
+        columns=[
+            {
+                "columnType": "BASE_AXIS",
+                "expressionType": "SQL",
+                "label": "ds",
+                "sqlExpression": "ds",
+                "timeGrain": "P1D",
+            }
+        ],
+        metrics=["count"],
+        filters=[{"col": "ds", "op": "TEMPORAL_RANGE", "val": time_range}],
+        is_timeseries=False,
+        row_limit=1000,
+    )
+
+
+def get_incremental_cache_processor(
+    mocker, extra: dict[str, Any]
+) -> QueryContextProcessor:
+    processor = get_raw_cache_processor(mocker)
+    datasource = processor._qc_datasource
+    datasource.extra_dict = extra
+    datasource.changed_on = None
+    datasource.get_extra_cache_keys.return_value = []
+    datasource.query.side_effect = lambda query_dict: QueryResult(
+        df=pd.DataFrame(
+            {
+                "ds": pd.date_range(
+                    pd.Timestamp(query_dict["from_dttm"]).floor("D"),
+                    query_dict["to_dttm"],
+                    freq="D",
+                    inclusive="left",
+                ),
+                "count": 1,
+            }
+        ),
+        query=f"SELECT ds, COUNT(*) FROM t -- {query_dict['from_dttm']}",
+        duration=timedelta(seconds=1),
+    )
+    mocker.patch.object(processor, "normalize_df", side_effect=lambda df, _: df)
+    return processor
+
+
+def test_get_incremental_query_result(mocker) -> None:
+    """
+    Test that only the time buckets missing from the cache are queried.
+    """
+    processor = get_incremental_cache_processor(mocker, {"incremental_cache": True})
+    datasource = processor._qc_datasource
+
+    result = processor.get_incremental_query_result(
+        get_incremental_query_object("2024-01-01 : 2024-01-04")
+    )
+    assert result is not None
+    assert datasource.query.call_count == 1
+    assert result.df["ds"].tolist() == list(
+        pd.date_range("2024-01-01", periods=3, freq="D")
+    )
+
+    result = processor.get_incremental_query_result(
+        get_incremental_query_object("2024-01-02 : 2024-01-05")
+    )
+    assert result is not None
+    assert datasource.query.call_count == 2
+    query_dict = datasource.query.call_args[0][0]
+    assert query_dict["from_dttm"] == datetime(2024, 1, 4)
+    assert query_dict["to_dttm"] == datetime(2024, 1, 5)
+    assert result.df["ds"].tolist() == list(
+        pd.date_range("2024-01-02", periods=3, freq="D")
+    )
+    assert result.df["count"].tolist() == [1, 1, 1]
+
+
+def test_get_incremental_query_result_partial_buckets(mocker) -> None:
+    """
+    Test that time buckets cut by the time range are neither cached nor split.
+    """
+    processor = get_incremental_cache_processor(mocker, {"incremental_cache": True})
+    datasource = processor._qc_datasource
+
+    processor.get_incremental_query_result(
+        get_incremental_query_object("2024-01-01 12:00:00 : 2024-01-03")
+    )
+    processor.get_incremental_query_result(
+        get_incremental_query_object("2024-01-01 12:00:00 : 2024-01-03")
+    )
+    assert datasource.query.call_count == 2
+    query_dict = datasource.query.call_args[0][0]
+    assert query_dict["from_dttm"] == datetime(2024, 1, 1, 12)
+    assert query_dict["to_dttm"] == datetime(2024, 1, 2)
+
+
+def test_get_incremental_query_result_mutable_period(mocker) -> None:
+    """
+    Test that recent time buckets are queried every time.
+    """
+    processor = get_incremental_cache_processor(
+        mocker,
+        {"incremental_cache": True, "incremental_cache_mutable_period": 10**10},
+    )
+
+    processor.get_incremental_query_result(
+        get_incremental_query_object("2024-01-01 : 2024-01-04")
+    )
+    processor.get_incremental_query_result(
+        get_incremental_query_object("2024-01-01 : 2024-01-04")
+    )
+    assert processor._qc_datasource.query.call_count == 2
+
+
+def test_get_incremental_query_result_misaligned(mocker) -> None:
+    """
+    Test that rows not aligned with the time buckets disable incremental caching.
+    """
+    processor = get_incremental_cache_processor(mocker, {"incremental_cache": True})
+    processor._qc_datasource.query.side_effect = lambda query_dict: QueryResult(
+        df=pd.DataFrame({"ds": [datetime(2024, 1, 1, 6)], "count": [1]}),
+        query="SELECT ds, COUNT(*) FROM t",
+        duration=timedelta(0),
+    )
+
+    assert (
+        processor.get_incremental_query_result(
+            get_incremental_query_object("2024-01-01 : 2024-01-04")
+        )
+        is None
+    )
+
+
+def test_get_incremental_query_result_disabled(mocker) -> None:
+    """
+    Test that query objects aren't cached incrementally by default.
+    """
+    processor = get_incremental_cache_processor(mocker, {})
+
+    assert (
+        processor.get_incremental_query_result(
+            get_incremental_query_object("2024-01-01 : 2024-01-04")
+        )
+        is None
+    )
+    processor._qc_datasource.query.assert_not_called()
+
+
+def test_get_incremental_query_result_timeout_disabled(mocker) -> None:
+    """
+    Test that time buckets cached by other charts aren't served to a chart with its
+    cache disabled.
+    """
+    processor = get_incremental_cache_processor(mocker, {"incremental_cache": True})
+    assert processor.get_incremental_query_result(
+        get_incremental_query_object("2024-01-01 : 2024-01-04")
+    )
+    assert processor._qc_datasource.query.call_count == 1
+
+    processor._query_context.get_cache_timeout.return_value = CACHE_DISABLED_TIMEOUT
+    assert (
+        processor.get_incremental_query_result(
+            get_incremental_query_object("2024-01-01 : 2024-01-04")
+        )
+        is None
+    )
+    assert processor._qc_datasource.query.call_count == 1
+
+
+@with_config({"CHART_DATA_QUERY_MAX_WORKERS": 4})
+@pytest.mark.parametrize(
+    "max_concurrent_queries,max_workers",
+    [
+        (None, 4),
+        (2, 2),
+        (8, 4),
+    ],
+)
+def test_get_max_query_workers(
+    max_concurrent_queries: int | None, max_workers: int
+) -> None:
+    """
+    Test that concurrent queries are limited per database.
+    """
+    processor = QueryContextProcessor(MagicMock())
+    processor._qc_datasource = MagicMock(
+        **{"database.max_concurrent_queries": max_concurrent_queries}
+    )
+
+    assert processor.get_max_query_workers() == max_workers
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_get_payload_deduplicates_queries(max_workers: int, mocker) -> None:
+    """
+    Test that the payloads of identical query objects are built separately, and
+    results keep their order.
+    """
+    mocker.patch.object(
+        QueryContextProcessor, "get_max_query_workers", return_value=max_workers
+    )
+    get_query_results = mocker.patch(
+        "superset.common.query_context_processor.get_query_results",
+        side_effect=lambda result_type, query_context, query_obj, force_cached: {
+            "metrics": query_obj.metrics
+        },
+    )
+    query_context = MagicMock()
+    query_context.result_type = ChartDataResultType.FULL
+    query_context.queries = [
+        QueryObject(metrics=["count"], row_limit=10),
+        QueryObject(metrics=["sum__num"], row_limit=10),
+        QueryObject(metrics=["count"], row_limit=10),
+    ]
+    processor = QueryContextProcessor(query_context)
+
+    payload = processor.get_payload()
+
+    assert payload["queries"] == [
+        {"metrics": ["count"]},
+        {"metrics": ["sum__num"]},
+        {"metrics": ["count"]},
+    ]
+    assert payload["queries"][0] is not payload["queries"][2]
+    # the duplicate is built after the others, from the same DataFrame
+    assert get_query_results.call_count == 3
+    assert get_query_results.call_args.args[2] is query_context.queries[2]
+    assert processor._df_payloads is None
+
+
+def test_get_df_payload_shared(mocker) -> None:
+    """
+    Test that identical query objects of a payload share the data of their
+    DataFrame, and not its columns.
+    """
+    query_cache_manager = mocker.patch(
+        "superset.common.query_context_processor.QueryCacheManager"
+    )
+    processor = QueryContextProcessor(MagicMock())
+    mocker.patch.object(processor, "query_cache_key", return_value="key")
+    df = pd.DataFrame({"count": [1]})
+    processor._df_payloads = {"key": {"df": df, "status": QueryStatus.SUCCESS}}
+
+    payload = processor.get_df_payload(MagicMock())
+    del payload["status"]
+    payload["df"].columns = ["COUNT(*)"]
+
+    assert processor._df_payloads["key"]["status"] == QueryStatus.SUCCESS
+    assert processor._df_payloads["key"]["df"] is df
+    assert df.columns.tolist() == ["count"]
+    query_cache_manager.get.assert_not_called()
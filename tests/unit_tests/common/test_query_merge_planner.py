@@ -0,0 +1,169 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from superset.common.db_query_status import QueryStatus
+from superset.common.query_merge_planner import QueryMergePlanner
+from superset.common.query_object import QueryObject
+from superset.models.helpers import QueryResult
+from superset.utils.core import get_metric_name
+
+
+def get_datasource() -> MagicMock:
+    def query(query_dict: dict[str, Any]) -> QueryResult:
+        return QueryResult(
+            df=pd.DataFrame(
+                {
+                    "country": ["FR", "US"],
+                    **{
+                        get_metric_name(metric): [1, 2]
+                        for metric in query_dict["metrics"]
+                    },
+                }
+            ),
+            query=f"SELECT {', '.join(query_dict['metrics'])} FROM t",  # noqa: S608
+            duration=timedelta(0),
+        )
+
+    return MagicMock(uid="1__table", **{"query.side_effect": query})
+
+
+def get_query_object(metrics: list[str], **kwargs: Any) -> QueryObject:
+    return QueryObject(columns=["country"], metrics=metrics, row_limit=10, **kwargs)
+
+
+def test_query_merge_planner() -> None:
+    """
+    Test that query objects differing only by their metrics are merged.
+    """
+    datasource = get_datasource()
+    planner = QueryMergePlanner()
+    query_objects = [
+        get_query_object(["count", "sum__num"]),
+        get_query_object(["avg__num", "count"]),
+        get_query_object(["count"], row_limit=100),
+    ]
+    for query_object in query_objects:
+        planner.add_query_object(datasource, query_object)
+
+    result = planner.get_query_result(datasource, query_objects[0].to_dict())
+    assert result is not None
+    assert list(result.df.columns) == ["country", "count", "sum__num"]
+    assert result.query == "SELECT count, sum__num, avg__num FROM t"
+
+    result = planner.get_query_result(datasource, query_objects[1].to_dict())
+    assert result is not None
+    assert list(result.df.columns) == ["country", "avg__num", "count"]
+    assert datasource.query.call_count == 1
+
+    # the query object with a different row limit isn't merged
+    assert planner.get_query_result(datasource, query_objects[2].to_dict()) is None
+
+
+def test_query_merge_planner_single_query() -> None:
+    """
+    Test that query objects without others to merge with run on their own.
+    """
+    datasource = get_datasource()
+    planner = QueryMergePlanner()
+    query_object = get_query_object(["count"])
+    planner.add_query_object(datasource, query_object)
+    planner.add_query_object(datasource, get_query_object(["count"]))
+
+    assert planner.get_query_result(datasource, query_object.to_dict()) is None
+    datasource.query.assert_not_called()
+
+
+def test_query_merge_planner_conflicting_metrics() -> None:
+    """
+    Test that query objects with different metrics of the same label aren't merged.
+    """
+    datasource = get_datasource()
+    planner = QueryMergePlanner()
+    metric = {
+        "expressionType": "SQL",
+        "sqlExpression": "COUNT(*)",
+        "label": "count",
+    }
+    query_object = get_query_object([metric, "sum__num"])
+    planner.add_query_object(datasource, query_object)
+    planner.add_query_object(datasource, get_query_object(["count"]))
+
+    assert planner.get_query_result(datasource, query_object.to_dict()) is None
+
+
+def test_query_merge_planner_series_limit() -> None:
+    """
+    Test that series limited query objects are only merged when their series are
+    limited by the same metric.
+    """
+    datasource = get_datasource()
+    planner = QueryMergePlanner()
+    query_objects = [
+        get_query_object(["count"], series_columns=["country"], series_limit=5),
+        get_query_object(["sum__num"], series_columns=["country"], series_limit=5),
+        get_query_object(
+            ["count"],
+            series_columns=["country"],
+            series_limit=5,
+            series_limit_metric="count",
+        ),
+        get_query_object(
+            ["sum__num"],
+            series_columns=["country"],
+            series_limit=5,
+            series_limit_metric="count",
+        ),
+        get_query_object(
+            ["count", "avg__num"], series_columns=["country"], series_limit=10
+        ),
+        get_query_object(["count"], series_columns=["country"], series_limit=10),
+    ]
+    for query_object in query_objects:
+        planner.add_query_object(datasource, query_object)
+
+    # the series would be limited by the first metric of the merged query
+    assert planner.get_query_result(datasource, query_objects[0].to_dict()) is None
+    assert planner.get_query_result(datasource, query_objects[2].to_dict())
+    assert planner.get_query_result(datasource, query_objects[4].to_dict())
+
+
+def test_query_merge_planner_failed_query() -> None:
+    """
+    Test that query objects run on their own when the merged query fails.
+    """
+    datasource = get_datasource()
+    datasource.query.side_effect = lambda query_dict: QueryResult(
+        df=pd.DataFrame(),
+        query="SELECT 1",
+        duration=timedelta(0),
+        status=QueryStatus.FAILED,
+    )
+    planner = QueryMergePlanner()
+    query_object = get_query_object(["count"])
+    planner.add_query_object(datasource, query_object)
+    planner.add_query_object(datasource, get_query_object(["sum__num"]))
+
+    assert planner.get_query_result(datasource, query_object.to_dict()) is None
+    assert planner.get_query_result(datasource, query_object.to_dict()) is None
+    assert datasource.query.call_count == 1
@@ -22,6 +22,7 @@ import pytest
 from superset.common.utils.time_range_utils import (
     get_since_until_from_query_object,
     get_since_until_from_time_range,
+    get_time_buckets,
 )
 
 
@@ -92,3 +93,26 @@ def test__since_until_from_adhoc_filters(dummy_query_object):
         datetime(2001, 1, 1, 0, 0, 0),
         datetime(2002, 1, 1, 0, 0, 0),
     )
+
+
+def test_get_time_buckets():
+    assert get_time_buckets(datetime(2024, 1, 1, 12), datetime(2024, 1, 3), "P1D") == [
+        (datetime(2024, 1, 1), datetime(2024, 1, 2)),
+        (datetime(2024, 1, 2), datetime(2024, 1, 3)),
+    ]
+    assert get_time_buckets(datetime(2024, 1, 31), datetime(2024, 3, 1, 1), "P1M") == [
+        (datetime(2024, 1, 1), datetime(2024, 2, 1)),
+        (datetime(2024, 2, 1), datetime(2024, 3, 1)),
+        (datetime(2024, 3, 1), datetime(2024, 4, 1)),
+    ]
+    assert get_time_buckets(datetime(2024, 5, 1), datetime(2025, 1, 1), "P3M") == [
+        (datetime(2024, 4, 1), datetime(2024, 7, 1)),
+        (datetime(2024, 7, 1), datetime(2024, 10, 1)),
+        (datetime(2024, 10, 1), datetime(2025, 1, 1)),
+    ]
+    assert get_time_buckets(
+        datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 1, 12), "PT1H"
+    ) == [
+        (datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11)),
+        (datetime(2024, 1, 1, 11), datetime(2024, 1, 1, 12)),
+    ]
@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from flask import Flask
 import pandas as pd
 import pytest
 from pytest_mock import MockerFixture
@@ -28,6 +29,7 @@ from superset.exceptions import OAuth2RedirectError
 from superset.models.core import Database
 from superset.sql.parse import Table
 from superset.superset_typing import QueryObjectDict
+from tests.conftest import with_config
 
 
 def test_query_bubbles_errors(mocker: MockerFixture) -> None:
@@ -842,3 +844,192 @@ def test_quoted_name_prevents_double_quoting(mocker: MockerFixture) -> None:
     # Should have each part quoted separately:
     # GOOD: "MY_DB"."MY_SCHEMA"."MY_TABLE"
     assert '"MY_DB"."MY_SCHEMA"."MY_TABLE"' in compiled
+
+
+def test_get_sqla_query_rollup(mocker: MockerFixture) -> None:
+    """
+    Test that queries are routed to the smallest rollup able to answer them.
+    """
+    from contextlib import contextmanager
+
+    from superset.connectors.sqla.models import SqlMetric
+    from superset.utils import json
+
+    database = Database(database_name="my_db", sqlalchemy_uri="sqlite://")
+    engine = create_engine("sqlite://")
+
+    @contextmanager
+    def mock_get_sqla_engine(catalog=None, schema=None, **kwargs):
+        yield engine
+
+    mocker.patch.object(database, "get_sqla_engine", new=mock_get_sqla_engine)
+
+    sqla_table = SqlaTable(
+        table_name="sales",
+        columns=[
+            TableColumn(column_name="ds", is_dttm=True),
+            TableColumn(column_name="country"),
+            TableColumn(column_name="state"),
+        ],
+        metrics=[
+            SqlMetric(metric_name="sum__num", expression="SUM(num)"),
+            SqlMetric(metric_name="avg__num", expression="AVG(num)"),
+        ],
+        database=database,
+        extra=json.dumps(
+            {
+                "rollups": [
+                    {
+                        "table_name": "daily_sales_by_state",
+                        "dimensions": ["ds", "country", "state"],
+                        "metrics": {"sum__num": "SUM(sum__num)"},
+                        "row_count": 1000,
+                    },
+                    {
+                        "table_name": "daily_sales",
+                        "dimensions": ["ds", "country"],
+                        "metrics": {"sum__num": "SUM(sum__num)"},
+                        "row_count": 100,
+                    },
+                ]
+            }
+        ),
+    )
+    mocker.patch.object(sqla_table, "get_sqla_row_level_filters", return_value=[])
+
+    query_obj: QueryObjectDict = {
+        "columns": ["country"],
+        "metrics": ["sum__num"],
+        "is_timeseries": False,
+        "filter": [],
+    }
+    query_str_ext = sqla_table.get_query_str_extended(query_obj)
+    assert query_str_ext.rollup == "daily_sales"
+    assert "FROM daily_sales " in query_str_ext.sql
+    assert "SUM(sum__num)" in query_str_ext.sql
+
+    query_str_ext = sqla_table.get_query_str_extended(
+        {**query_obj, "columns": ["state"]}
+    )
+    assert query_str_ext.rollup == "daily_sales_by_state"
+
+    query_str_ext = sqla_table.get_query_str_extended(
+        {**query_obj, "metrics": ["avg__num"]}
+    )
+    assert query_str_ext.rollup is None
+    assert "FROM sales " in query_str_ext.sql
+
+    # the users with row level security filters query the dataset
+    sqla_table.get_sqla_row_level_filters.return_value = ["country = 'FR'"]
+    assert sqla_table.get_query_str_extended(query_obj).rollup is None
+
+
+@with_config({"COMPILED_QUERY_CACHE_ENABLED": True})
+def test_get_query_str_extended_cached(mocker: MockerFixture) -> None:
+    """
+    Test that the compiled queries are cached until the dataset changes.
+    """
+    from contextlib import contextmanager
+    from datetime import datetime
+
+    from superset.connectors.sqla.models import SqlMetric
+    from superset.connectors.sqla.query_cache import query_cache
+
+    query_cache.clear()
+    database = Database(id=1, database_name="my_db", sqlalchemy_uri="sqlite://")
+    engine = create_engine("sqlite://")
+
+    @contextmanager
+    def mock_get_sqla_engine(catalog=None, schema=None, **kwargs):
+        yield engine
+
+    mocker.patch.object(database, "get_sqla_engine", new=mock_get_sqla_engine)
+    mocker.patch(
+        "superset.connectors.sqla.models.security_manager.get_rls_filters",
+        return_value=[],
+    )
+    sqla_table = SqlaTable(
+        id=1,
+        table_name="sales",
+        columns=[TableColumn(column_name="country")],
+        metrics=[SqlMetric(metric_name="count", expression="COUNT(*)")],
+        database=database,
+    )
+    get_sqla_query = mocker.spy(sqla_table, "get_sqla_query")
+
+    query_obj: QueryObjectDict = {
+        "columns": ["country"],
+        "metrics": ["count"],
+        "is_timeseries": False,
+        "filter": [],
+    }
+    query_str_ext = sqla_table.get_query_str_extended(query_obj)
+    assert sqla_table.get_query_str_extended(dict(query_obj)) == query_str_ext
+    assert get_sqla_query.call_count == 1
+
+    sqla_table.changed_on = datetime(2024, 1, 1)
+    assert sqla_table.get_query_str_extended(query_obj) == query_str_ext
+    assert get_sqla_query.call_count == 2
+
+    # the queries are mutated for each user after the cache lookup
+    mutate_sql = mocker.patch.object(database, "mutate_sql_based_on_config")
+    mutate_sql.side_effect = lambda sql: f"-- alice\n{sql}"
+    alice = sqla_table.get_query_str_extended(query_obj)
+    mutate_sql.side_effect = lambda sql: f"-- bob\n{sql}"
+    bob = sqla_table.get_query_str_extended(query_obj)
+    assert alice.sql == f"-- alice\n{query_str_ext.sql}"
+    assert bob.sql == f"-- bob\n{query_str_ext.sql}"
+    assert get_sqla_query.call_count == 2
+
+
+@with_config({"COMPILED_QUERY_CACHE_ENABLED": True})
+def test_get_query_cache_key(mocker: MockerFixture) -> None:
+    """
+    Test that the templated queries are cached by template context.
+    """
+    mocker.patch(
+        "superset.connectors.sqla.models.security_manager.get_rls_filters",
+        return_value=[],
+    )
+    sqla_table = SqlaTable(
+        id=1,
+        table_name="sales",
+        columns=[TableColumn(column_name="country")],
+        metrics=[],
+        database=Database(id=1, database_name="my_db", sqlalchemy_uri="sqlite://"),
+    )
+    get_template_context_key = mocker.patch.object(
+        sqla_table,
+        "get_template_context_key",
+        return_value={"user_id": 1},
+    )
+
+    query_obj: QueryObjectDict = {"columns": ["country"], "metrics": []}
+    key = sqla_table.get_query_cache_key(query_obj)
+    assert sqla_table.get_query_cache_key({**query_obj, "row_limit": 10}) != key
+    get_template_context_key.assert_not_called()
+
+    templated_query_obj: QueryObjectDict = {
+        **query_obj,
+        "extras": {"where": "country = '{{ url_param('country') }}'"},
+    }
+    key = sqla_table.get_query_cache_key(templated_query_obj)
+    assert sqla_table.get_query_cache_key(templated_query_obj) == key
+    get_template_context_key.return_value = {"user_id": 2}
+    assert sqla_table.get_query_cache_key(templated_query_obj) != key
+
+
+def test_get_template_context_key(app: Flask) -> None:
+    """
+    Test that the template context includes the body of the request.
+    """
+    sqla_table = SqlaTable(table_name="sales", database=Database())
+
+    with app.test_request_context(
+        "/api/v1/chart/data?country=US",
+        json={"form_data": {"slice_id": 1}},
+    ):
+        key = sqla_table.get_template_context_key()
+
+    assert key["url_params"] == {"country": ["US"]}
+    assert key["json"] == {"form_data": {"slice_id": 1}}
@@ -0,0 +1,74 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from pytest_mock import MockerFixture
+
+from superset.connectors.sqla.query_cache import is_templated, QueryCache
+from tests.conftest import with_config
+
+
+def test_is_templated() -> None:
+    """
+    Test that the Jinja templates are detected.
+    """
+    assert is_templated("SELECT 1", "WHERE ds = '{{ from_dttm }}'")
+    assert is_templated("{% if filter_values('country') %}1{% endif %}")
+    assert not is_templated("SELECT 1", None, "")
+
+
+@with_config({"COMPILED_QUERY_CACHE_SIZE": 2})
+def test_query_cache_eviction() -> None:
+    """
+    Test that the least recently used queries are evicted.
+    """
+    query_cache = QueryCache()
+    query_cache.set("a", 1)
+    query_cache.set("b", 2)
+    assert query_cache.get("a") == 1
+    query_cache.set("c", 3)
+
+    assert query_cache.get("a") == 1
+    assert query_cache.get("b") is None
+    assert query_cache.get("c") == 3
+
+
+@with_config({"COMPILED_QUERY_CACHE_TIMEOUT_SEC": 10})
+def test_query_cache_timeout(mocker: MockerFixture) -> None:
+    """
+    Test that the queries expire after the timeout.
+    """
+    monotonic = mocker.patch("superset.connectors.sqla.query_cache.time.monotonic")
+    monotonic.return_value = 0
+    query_cache = QueryCache()
+    query_cache.set("a", 1)
+
+    monotonic.return_value = 9
+    assert query_cache.get("a") == 1
+    monotonic.return_value = 10
+    assert query_cache.get("a") is None
+
+
+def test_query_cache_copies() -> None:
+    """
+    Test that the cached queries can't be mutated by the callers.
+    """
+    query_cache = QueryCache()
+    value = {"prequeries": []}
+    query_cache.set("a", value)
+    value["prequeries"].append("SELECT 1")
+    query_cache.get("a")["prequeries"].append("SELECT 2")
+
+    assert query_cache.get("a") == {"prequeries": []}
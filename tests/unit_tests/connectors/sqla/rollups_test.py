@@ -0,0 +1,276 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from superset.connectors.sqla.rollups import (
+    get_rollups,
+    is_time_grain_aligned,
+    is_time_grain_compatible,
+    Rollup,
+)
+from superset.constants import TimeGrain
+
+ROLLUP = Rollup(
+    table_name="daily_sales",
+    dimensions=["ds", "country"],
+    metrics={"sum__num": "SUM(sum__num)", "count": "SUM(count)"},
+    time_column="ds",
+    time_grain=TimeGrain.DAY,
+)
+
+
+@pytest.mark.parametrize(
+    "time_grain, rollup_grain, expected",
+    [
+        (TimeGrain.DAY, TimeGrain.DAY, True),
+        (TimeGrain.HOUR, TimeGrain.FIFTEEN_MINUTES, True),
+        (TimeGrain.FIVE_MINUTES, TimeGrain.FIFTEEN_MINUTES, False),
+        (TimeGrain.WEEK_STARTING_SUNDAY, TimeGrain.DAY, True),
+        (TimeGrain.YEAR, TimeGrain.QUARTER, True),
+        (TimeGrain.QUARTER, TimeGrain.YEAR, False),
+        (TimeGrain.MONTH, TimeGrain.WEEK, False),
+        (TimeGrain.WEEK_ENDING_SUNDAY, TimeGrain.WEEK, True),
+        (TimeGrain.WEEK_STARTING_SUNDAY, TimeGrain.WEEK, False),
+        (None, TimeGrain.DAY, False),
+        (None, None, True),
+    ],
+)
+def test_is_time_grain_compatible(
+    time_grain: str | None,
+    rollup_grain: str | None,
+    expected: bool,
+) -> None:
+    """
+    Test that a time grain is compatible with coarser grains made of its buckets.
+    """
+    assert is_time_grain_compatible(time_grain, rollup_grain) == expected
+
+
+@pytest.mark.parametrize(
+    "dttm, rollup_grain, expected",
+    [
+        (None, TimeGrain.DAY, True),
+        (datetime(2024, 1, 2), TimeGrain.DAY, True),
+        (datetime(2024, 1, 2, 12), TimeGrain.DAY, False),
+        (datetime(2024, 1, 2, 12), TimeGrain.SIX_HOURS, True),
+        (datetime(2024, 1, 1), TimeGrain.WEEK, True),
+        (datetime(2024, 1, 1), TimeGrain.WEEK_STARTING_SUNDAY, False),
+        (datetime(2024, 4, 1), TimeGrain.QUARTER, True),
+        (datetime(2024, 5, 1), TimeGrain.QUARTER, False),
+    ],
+)
+def test_is_time_grain_aligned(
+    dttm: datetime | None,
+    rollup_grain: str,
+    expected: bool,
+) -> None:
+    """
+    Test that time bounds are aligned only on the start of the buckets of a grain.
+    """
+    assert is_time_grain_aligned(dttm, rollup_grain) == expected
+
+
+@pytest.mark.parametrize(
+    "query_obj, expected",
+    [
+        ({"metrics": ["sum__num"], "columns": ["country"]}, True),
+        ({"metrics": ["sum__num", "avg__num"], "columns": ["country"]}, False),
+        (
+            {
+                "metrics": [
+                    {"expressionType": "SQL", "sqlExpression": "SUM(num)"},
+                ],
+            },
+            False,
+        ),
+        ({"metrics": ["count"], "columns": ["state"]}, False),
+        ({"metrics": ["count"], "columns": ["ds"]}, False),
+        (
+            {
+                "metrics": ["count"],
+                "columns": [
+                    {
+                        "columnType": "BASE_AXIS",
+                        "sqlExpression": "ds",
+                        "label": "ds",
+                        "timeGrain": TimeGrain.MONTH,
+                    },
+                ],
+            },
+            True,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "columns": [
+                    {
+                        "columnType": "BASE_AXIS",
+                        "sqlExpression": "ds",
+                        "label": "ds",
+                        "timeGrain": TimeGrain.HOUR,
+                    },
+                ],
+            },
+            False,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "granularity": "ds",
+                "is_timeseries": True,
+                "extras": {"time_grain_sqla": TimeGrain.WEEK},
+                "from_dttm": datetime(2024, 1, 1),
+                "to_dttm": datetime(2024, 2, 1),
+            },
+            True,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "granularity": "ds",
+                "is_timeseries": False,
+                "from_dttm": datetime(2024, 1, 1, 12),
+            },
+            False,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "columns": ["country"],
+                "filter": [{"col": "country", "op": "IN", "val": ["FR"]}],
+            },
+            True,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "filter": [{"col": "state", "op": "IN", "val": ["CA"]}],
+            },
+            False,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "filter": [
+                    {
+                        "col": "ds",
+                        "op": "TEMPORAL_RANGE",
+                        "val": "2024-01-01 : 2024-02-01",
+                    },
+                ],
+            },
+            True,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "filter": [
+                    {
+                        "col": "ds",
+                        "op": "TEMPORAL_RANGE",
+                        "val": "2024-01-01T06:00:00 : 2024-02-01",
+                    },
+                ],
+            },
+            False,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "filter": [{"col": "ds", "op": ">=", "val": "2024-01-01"}],
+            },
+            False,
+        ),
+        ({"metrics": ["count"], "extras": {"where": "num > 0"}}, False),
+        ({"metrics": ["count"], "is_rowcount": True}, False),
+        (
+            {
+                "metrics": ["count"],
+                "columns": ["country"],
+                "orderby": [("count", False)],
+            },
+            True,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "columns": ["country"],
+                "orderby": [("avg__num", False)],
+            },
+            False,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "columns": ["country"],
+                "orderby": [
+                    ({"expressionType": "SQL", "sqlExpression": "SUM(num)"}, False),
+                ],
+            },
+            False,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "columns": ["country"],
+                "series_limit": 10,
+                "series_limit_metric": {
+                    "expressionType": "SQL",
+                    "sqlExpression": "SUM(num)",
+                },
+            },
+            False,
+        ),
+        (
+            {
+                "metrics": ["count"],
+                "columns": ["country"],
+                "series_limit": 10,
+                "series_limit_metric": "sum__num",
+            },
+            True,
+        ),
+    ],
+)
+def test_can_answer(query_obj: dict[str, Any], expected: bool) -> None:
+    """
+    Test that a rollup only answers the queries it has the same results for.
+    """
+    assert ROLLUP.can_answer(query_obj) == expected
+
+
+def test_get_rollups() -> None:
+    """
+    Test that the rollups are ordered by row count, and invalid ones are ignored.
+    """
+    rollups = get_rollups(
+        {
+            "rollups": [
+                {"table_name": "a", "dimensions": [], "metrics": {}},
+                {"table_name": "b", "dimensions": [], "metrics": {}, "row_count": 10},
+                {"table_name": "c", "dimensions": [], "metrics": {}, "row_count": 1},
+                {"table_name": "d", "unknown": True},
+            ]
+        }
+    )
+
+    assert [rollup.table_name for rollup in rollups] == ["c", "b", "a"]
+    assert get_rollups({}) == []
@@ -894,3 +894,17 @@ def test_extract_errors_no_match_falls_back(mocker: MockerFixture) -> None:
         engine_name="ExampleEngine",
     )
     assert result == [expected]
+
+
+def test_fetch_data_chunks(mocker: MockerFixture) -> None:
+    """
+    Test that results are fetched in chunks until the cursor is exhausted.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    cursor = mocker.MagicMock()
+    cursor.description = [("a", "INTEGER")]
+    cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+    assert list(BaseEngineSpec.fetch_data_chunks(cursor, 2)) == [[(1,), (2,)], [(3,)]]
+    cursor.fetchmany.assert_called_with(2)
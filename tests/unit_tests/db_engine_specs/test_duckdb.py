@@ -163,3 +163,25 @@ def test_column_type_recognition() -> None:
     col_spec = DuckDBEngineSpec.get_column_spec("TINYINT")
     # TINYINT matches the pattern "^int" so it should be recognized
     assert col_spec is None, "TINYINT doesn't match any patterns"
+
+
+def test_fetch_arrow() -> None:
+    """
+    Test that results are fetched as Arrow, respecting the limit.
+    """
+    from sqlalchemy import create_engine
+
+    from superset.db_engine_specs.duckdb import DuckDBEngineSpec
+
+    engine = create_engine("duckdb:///:memory:")
+    connection = engine.raw_connection()
+    cursor = connection.cursor()
+    cursor.execute("SELECT range AS a, 'x' || range AS b FROM range(10)")
+    description = cursor.description
+
+    table = DuckDBEngineSpec.fetch_results(cursor, 3)
+
+    assert table.column_names == ["a", "b"]
+    assert table.to_pydict() == {"a": [0, 1, 2], "b": ["x0", "x1", "x2"]}
+    assert cursor.description == description
+    connection.close()
@@ -280,3 +280,17 @@ SELECT * \nFROM my_schema.my_table
  LIMIT :param_1
     """.strip()
     )
+
+
+def test_get_streaming_cursor(mocker: MockerFixture) -> None:
+    """
+    Test that a named cursor is used to read results incrementally.
+    """
+    connection = mocker.MagicMock()
+    spec.get_streaming_cursor(connection)
+    assert connection.cursor.call_args.kwargs["name"].startswith("superset_")
+
+    # fallback for drivers without named cursors
+    connection.cursor.side_effect = [TypeError, mocker.sentinel.cursor]
+    assert spec.get_streaming_cursor(connection) is mocker.sentinel.cursor
+    connection.cursor.assert_called_with()
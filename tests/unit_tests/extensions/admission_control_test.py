@@ -0,0 +1,155 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from superset.exceptions import DatabaseAdmissionTimeoutError
+from superset.extensions.admission_control import (
+    AdmissionController,
+    AdmissionControllerFactory,
+    get_workload,
+    override_workload,
+    Workload,
+)
+from superset.utils.core import QuerySource
+
+
+def get_admission_controller(mocker: MockerFixture) -> AdmissionController:
+    app = Mock()
+    app.config = {
+        "DB_ADMISSION_CONTROL_CLASS": (
+            "superset.extensions.admission_control.AdmissionController"
+        ),
+        "DB_ADMISSION_CONTROL_REDIS_URL": "redis://localhost:6379/0",
+        "DB_ADMISSION_CONTROL_MAX_WAIT_SEC": 1,
+        "DB_ADMISSION_CONTROL_LEASE_SEC": 3600,
+        "STATS_LOGGER": Mock(),
+    }
+    factory = AdmissionControllerFactory()
+    factory.init_app(app)
+    admission_controller = factory.instance
+    admission_controller._redis = mocker.MagicMock()
+    return admission_controller
+
+
+def get_database(admission_control: dict[str, Any] | None = None) -> Mock:
+    database = Mock()
+    database.id = 1
+    database.database_name = "examples"
+    database.max_concurrent_queries = 4
+    database.get_extra.return_value = (
+        {"admission_control": admission_control} if admission_control else {}
+    )
+    return database
+
+
+def test_admit(mocker: MockerFixture) -> None:
+    """
+    Test that a query holds a slot of its workload until it's done.
+    """
+    admission_controller = get_admission_controller(mocker)
+    acquire = admission_controller.redis.register_script.return_value
+    acquire.return_value = [1, 0]
+    database = get_database({"slots": {"sql_lab": 2}})
+
+    with admission_controller.admit(database, QuerySource.SQL_LAB):
+        admission_controller.redis.zrem.assert_not_called()
+        # the nested queries of the database are admitted with the slot
+        with admission_controller.admit(database, QuerySource.SQL_LAB):
+            pass
+
+    acquire.assert_called_once()
+    keys = acquire.call_args.kwargs["keys"]
+    token, _, slots, total, rank, *_ = acquire.call_args.kwargs["args"]
+    assert keys[0] == "superset:admission_control:1:holders"
+    assert token.startswith("sql_lab|")
+    assert (slots, total, rank) == ('{"sql_lab": 2}', 4, 2)
+    admission_controller.redis.zrem.assert_called_once_with(keys[0], token)
+    admission_controller.stats_logger.gauge.assert_called_with(
+        "admission_control.1.sql_lab.queue_depth", 0
+    )
+    admission_controller.stats_logger.timing.assert_called_once()
+
+
+def test_admit_not_configured(mocker: MockerFixture) -> None:
+    """
+    Test that the queries of the databases without admission control are admitted.
+    """
+    admission_controller = get_admission_controller(mocker)
+
+    with admission_controller.admit(get_database()):
+        pass
+
+    admission_controller.redis.register_script.assert_not_called()
+
+
+def test_admit_timeout(mocker: MockerFixture) -> None:
+    """
+    Test that a query waiting for a slot longer than the maximum wait is rejected.
+    """
+    mocker.patch("superset.extensions.admission_control.time.sleep")
+    monotonic = mocker.patch("superset.extensions.admission_control.time.monotonic")
+    monotonic.side_effect = [0, 0.5, 2]
+    admission_controller = get_admission_controller(mocker)
+    acquire = admission_controller.redis.register_script.return_value
+    acquire.return_value = [0, 3]
+    database = get_database({"slots": {"dashboard": 2}, "max_wait": 1})
+
+    with pytest.raises(DatabaseAdmissionTimeoutError):
+        with admission_controller.admit(database, QuerySource.DASHBOARD):
+            pass
+
+    assert acquire.call_count == 2
+    admission_controller.stats_logger.incr.assert_called_once_with(
+        "admission_control.1.dashboard.rejected"
+    )
+    admission_controller.stats_logger.gauge.assert_called_with(
+        "admission_control.1.dashboard.queue_depth", 3
+    )
+    token = acquire.call_args.kwargs["args"][0]
+    admission_controller.redis.zrem.assert_any_call(
+        "superset:admission_control:1:queue", token
+    )
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        (QuerySource.DASHBOARD, Workload.DASHBOARD),
+        (QuerySource.CHART, Workload.EXPLORE),
+        (QuerySource.SQL_LAB, Workload.SQL_LAB),
+        (None, Workload.EXPLORE),
+    ],
+)
+def test_get_workload(source: QuerySource | None, expected: Workload) -> None:
+    """
+    Test that the workload of a query is derived from its source.
+    """
+    assert get_workload(source) == expected
+
+
+def test_override_workload() -> None:
+    """
+    Test that the workload of the queries can be overridden, eg, for alerts.
+    """
+    with override_workload(Workload.ALERT):
+        assert get_workload(QuerySource.DASHBOARD) == Workload.ALERT
+
+    assert get_workload(QuerySource.DASHBOARD) == Workload.DASHBOARD
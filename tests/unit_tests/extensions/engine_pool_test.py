@@ -0,0 +1,127 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest.mock import Mock
+
+from pytest_mock import MockerFixture
+from sqlalchemy.engine.url import make_url
+
+from superset.extensions.engine_pool import EnginePool, EnginePoolFactory
+
+
+def get_engine_pool(max_engines: int = 10, idle_timeout: int = 300) -> EnginePool:
+    app = Mock()
+    app.config = {
+        "DB_ENGINE_POOL_CLASS": "superset.extensions.engine_pool.EnginePool",
+        "DB_ENGINE_POOL_MAX_ENGINES": max_engines,
+        "DB_ENGINE_POOL_IDLE_TIMEOUT_SEC": idle_timeout,
+        "STATS_LOGGER": Mock(),
+    }
+    factory = EnginePoolFactory()
+    factory.init_app(app)
+    return factory.instance
+
+
+def test_get_engine() -> None:
+    """
+    Test that the engines are reused for the same parameters.
+    """
+    engine_pool = get_engine_pool()
+
+    engine = engine_pool.get_engine(1, make_url("sqlite:///a.db"), {})
+    assert engine_pool.get_engine(1, make_url("sqlite:///a.db"), {}) is engine
+    assert engine.pool._pre_ping
+    assert engine_pool.get_engine(1, make_url("sqlite:///b.db"), {}) is not engine
+    assert engine_pool.get_engine(2, make_url("sqlite:///a.db"), {}) is not engine
+    assert (
+        engine_pool.get_engine(1, make_url("sqlite:///a.db"), {"echo": True})
+        is not engine
+    )
+    assert (
+        engine_pool.get_engine(1, make_url("sqlite:///a.db"), {}, "alice")
+        is not engine
+    )
+
+    engine_pool.stats_logger.incr.assert_any_call("engine_pool.hit")
+    engine_pool.stats_logger.gauge.assert_called_with(
+        "engine_pool.connections.checked_out", 0
+    )
+
+
+def test_get_engine_evicted(mocker: MockerFixture) -> None:
+    """
+    Test that the least recently used engines are disposed.
+    """
+    engine_pool = get_engine_pool(max_engines=2)
+
+    engine_a = engine_pool.get_engine(1, make_url("sqlite:///a.db"), {})
+    engine_b = engine_pool.get_engine(1, make_url("sqlite:///b.db"), {})
+    engine_pool.get_engine(1, make_url("sqlite:///a.db"), {})
+    dispose = mocker.patch.object(engine_b, "dispose")
+    engine_pool.get_engine(1, make_url("sqlite:///c.db"), {})
+
+    dispose.assert_called_once()
+    assert engine_pool.get_engine(1, make_url("sqlite:///a.db"), {}) is engine_a
+    assert engine_pool.get_engine(1, make_url("sqlite:///b.db"), {}) is not engine_b
+    engine_pool.stats_logger.incr.assert_any_call("engine_pool.evicted")
+
+
+def test_get_engine_idle(mocker: MockerFixture) -> None:
+    """
+    Test that the engines unused for the idle timeout are disposed.
+    """
+    monotonic = mocker.patch("superset.extensions.engine_pool.time.monotonic")
+    engine_pool = get_engine_pool(idle_timeout=300)
+
+    monotonic.return_value = 0
+    engine_a = engine_pool.get_engine(1, make_url("sqlite:///a.db"), {})
+    monotonic.return_value = 200
+    engine_b = engine_pool.get_engine(1, make_url("sqlite:///b.db"), {})
+    monotonic.return_value = 400
+
+    assert engine_pool.get_engine(1, make_url("sqlite:///b.db"), {}) is engine_b
+    assert engine_pool.get_engine(1, make_url("sqlite:///a.db"), {}) is not engine_a
+    engine_pool.stats_logger.incr.assert_any_call("engine_pool.reaped")
+
+
+def test_get_engine_forked(mocker: MockerFixture) -> None:
+    """
+    Test that the engines of the parent process aren't used, nor closed, after a fork.
+    """
+    getpid = mocker.patch("superset.extensions.engine_pool.os.getpid")
+    getpid.return_value = 1
+    engine_pool = get_engine_pool()
+
+    engine = engine_pool.get_engine(1, make_url("sqlite:///a.db"), {})
+    dispose = mocker.patch.object(engine, "dispose")
+    getpid.return_value = 2
+
+    assert engine_pool.get_engine(1, make_url("sqlite:///a.db"), {}) is not engine
+    dispose.assert_called_once_with(close=False)
+
+
+def test_invalidate() -> None:
+    """
+    Test that the engines of an updated database are disposed.
+    """
+    engine_pool = get_engine_pool()
+
+    engine_1 = engine_pool.get_engine(1, make_url("sqlite:///a.db"), {})
+    engine_2 = engine_pool.get_engine(2, make_url("sqlite:///a.db"), {})
+    engine_pool.invalidate(1)
+
+    assert engine_pool.get_engine(1, make_url("sqlite:///a.db"), {}) is not engine_1
+    assert engine_pool.get_engine(2, make_url("sqlite:///a.db"), {}) is engine_2
@@ -0,0 +1,112 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import socket
+import threading
+from unittest.mock import MagicMock, Mock
+
+from flask import Flask
+
+from superset.extensions.query_canceller import (
+    cancel_queries_when,
+    is_client_disconnected,
+    QueryCanceller,
+)
+
+
+def get_query_canceller(app: Flask) -> QueryCanceller:
+    query_canceller = QueryCanceller(app)
+    query_canceller.enabled = True
+    query_canceller.poll_interval = 0.01
+    query_canceller.stats_logger = Mock()
+    return query_canceller
+
+
+def get_database() -> MagicMock:
+    database = MagicMock()
+    database.db_engine_spec.get_cancel_query_id.return_value = "42"
+    database.db_engine_spec.cancel_query.return_value = True
+    return database
+
+
+def test_is_client_disconnected() -> None:
+    """
+    Test that the requests whose client closed the connection are detected.
+    """
+    server, client = socket.socketpair()
+    environ = {"gunicorn.socket": server}
+
+    assert not is_client_disconnected(environ)
+    client.close()
+    assert is_client_disconnected(environ)
+    assert not is_client_disconnected({})
+    server.close()
+
+
+def test_track_not_cancellable(app: Flask) -> None:
+    """
+    Test that the queries run outside of a `cancel_queries_when` context aren't
+    tracked.
+    """
+    query_canceller = get_query_canceller(app)
+    database = get_database()
+
+    with query_canceller.track(database, Mock()):
+        assert not query_canceller._queries
+
+    database.db_engine_spec.get_cancel_query_id.assert_not_called()
+
+
+def test_cancel(app: Flask) -> None:
+    """
+    Test that an in-flight query is cancelled once, and not after it's done.
+    """
+    query_canceller = get_query_canceller(app)
+    database = get_database()
+    cursor = Mock()
+
+    with cancel_queries_when(lambda: False):
+        with query_canceller.track(database, cursor, schema="public"):
+            (in_flight,) = query_canceller._queries.values()
+            assert query_canceller.cancel(in_flight)
+            assert not query_canceller.cancel(in_flight)
+
+    database.db_engine_spec.get_cancel_query_id.assert_called_once_with(
+        cursor, in_flight.query
+    )
+    database.db_engine_spec.cancel_query.assert_called_once()
+    assert database.db_engine_spec.cancel_query.call_args.args[2] == "42"
+    database.get_sqla_engine.assert_called_once()
+    query_canceller.stats_logger.incr.assert_called_once_with(
+        "chart_query_cancellation.cancelled"
+    )
+    assert not query_canceller._queries
+
+
+def test_cancel_when_cancelled(app: Flask) -> None:
+    """
+    Test that the in-flight queries are cancelled once their results aren't needed.
+    """
+    query_canceller = get_query_canceller(app)
+    database = get_database()
+    cancelled = threading.Event()
+    database.db_engine_spec.cancel_query.side_effect = lambda *args: cancelled.set()
+
+    with cancel_queries_when(lambda: True):
+        with query_canceller.track(database, Mock()):
+            assert cancelled.wait(5)
+
+    database.db_engine_spec.cancel_query.assert_called_once()
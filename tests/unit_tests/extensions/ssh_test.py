@@ -14,11 +14,13 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from typing import Any
 from unittest.mock import Mock
 
 import sshtunnel
+from pytest_mock import MockerFixture
 
-from superset.extensions.ssh import SSHManagerFactory
+from superset.extensions.ssh import PooledSSHManager, SSHManagerFactory
 
 
 def test_ssh_tunnel_timeout_setting() -> None:
@@ -34,3 +36,124 @@ def test_ssh_tunnel_timeout_setting() -> None:
     factory.init_app(app)
     assert sshtunnel.TUNNEL_TIMEOUT == 123.0
     assert sshtunnel.SSH_TIMEOUT == 321.0
+
+
+def get_pooled_ssh_manager() -> PooledSSHManager:
+    app = Mock()
+    app.config = {
+        "SSH_TUNNEL_LOCAL_BIND_ADDRESS": "127.0.0.1",
+        "SSH_TUNNEL_TIMEOUT_SEC": 10.0,
+        "SSH_TUNNEL_PACKET_TIMEOUT_SEC": 1.0,
+        "SSH_TUNNEL_POOL_IDLE_TIMEOUT_SEC": 300.0,
+        "SSH_TUNNEL_KEEPALIVE_SEC": 30.0,
+        "SSH_TUNNEL_MANAGER_CLASS": "superset.extensions.ssh.PooledSSHManager",
+        "STATS_LOGGER": Mock(),
+    }
+    factory = SSHManagerFactory()
+    factory.init_app(app)
+    return factory.instance
+
+
+def get_ssh_tunnel(**kwargs: Any) -> Mock:
+    return Mock(
+        **{
+            "server_address": "bastion",
+            "server_port": 22,
+            "username": "user",
+            "password": "password",
+            "private_key": None,
+            "private_key_password": None,
+            **kwargs,
+        }
+    )
+
+
+def test_pooled_ssh_manager_shares_tunnels(mocker: MockerFixture) -> None:
+    """
+    Test that the tunnels are shared across engine contexts.
+    """
+    open_tunnel = mocker.patch("superset.extensions.ssh.sshtunnel.open_tunnel")
+    server = open_tunnel.return_value
+    server.is_active = False
+    mocker.patch("superset.extensions.ssh.threading.Timer")
+    ssh_manager = get_pooled_ssh_manager()
+
+    with ssh_manager.create_tunnel(get_ssh_tunnel(), "postgresql://db:5432") as first:
+        server.is_active = True
+        with ssh_manager.create_tunnel(
+            get_ssh_tunnel(),
+            "postgresql://db:5432",
+        ) as second:
+            assert first is second is server
+    with ssh_manager.create_tunnel(get_ssh_tunnel(), "postgresql://db:5432"):
+        pass
+
+    open_tunnel.assert_called_once()
+    assert open_tunnel.call_args.kwargs["set_keepalive"] == 30.0
+    server.start.assert_called_once()
+    server.stop.assert_not_called()
+
+    # the tunnels to other servers aren't shared
+    with ssh_manager.create_tunnel(get_ssh_tunnel(), "postgresql://db2:5432"):
+        pass
+    with ssh_manager.create_tunnel(
+        get_ssh_tunnel(username="other"),
+        "postgresql://db:5432",
+    ):
+        pass
+    assert open_tunnel.call_count == 3
+
+
+def test_pooled_ssh_manager_restarts_tunnels(mocker: MockerFixture) -> None:
+    """
+    Test that the tunnels are restarted when their transport is down.
+    """
+    open_tunnel = mocker.patch("superset.extensions.ssh.sshtunnel.open_tunnel")
+    server = open_tunnel.return_value
+    server.is_active = False
+    mocker.patch("superset.extensions.ssh.threading.Timer")
+    ssh_manager = get_pooled_ssh_manager()
+
+    with ssh_manager.create_tunnel(get_ssh_tunnel(), "postgresql://db:5432"):
+        pass
+    with ssh_manager.create_tunnel(get_ssh_tunnel(), "postgresql://db:5432"):
+        pass
+
+    server.start.assert_called_once()
+    server.restart.assert_called_once()
+    ssh_manager.stats_logger.incr.assert_called_with("ssh_tunnel_pool.restart")
+
+
+def test_pooled_ssh_manager_closes_idle_tunnels(mocker: MockerFixture) -> None:
+    """
+    Test that the tunnels are closed after the idle timeout.
+    """
+    open_tunnel = mocker.patch("superset.extensions.ssh.sshtunnel.open_tunnel")
+    server = open_tunnel.return_value
+    server.is_active = False
+    timer = mocker.patch("superset.extensions.ssh.threading.Timer")
+    monotonic = mocker.patch("superset.extensions.ssh.time.monotonic")
+    ssh_manager = get_pooled_ssh_manager()
+
+    monotonic.return_value = 0
+    with ssh_manager.create_tunnel(get_ssh_tunnel(), "postgresql://db:5432"):
+        pass
+    delay, close_idle, args = timer.call_args.args
+    assert delay == 300.0
+
+    # the tunnel was used since the timer started
+    monotonic.return_value = 200
+    with ssh_manager.create_tunnel(get_ssh_tunnel(), "postgresql://db:5432"):
+        pass
+    monotonic.return_value = 300
+    close_idle(*args)
+    server.stop.assert_not_called()
+    assert timer.call_args.args[0] == 200
+
+    monotonic.return_value = 500
+    close_idle(*args)
+    server.stop.assert_called_once_with(force=True)
+
+    with ssh_manager.create_tunnel(get_ssh_tunnel(), "postgresql://db:5432"):
+        pass
+    assert open_tunnel.call_count == 2
@@ -39,6 +39,7 @@ from superset.exceptions import OAuth2Error, OAuth2RedirectError
 from superset.models.core import Database
 from superset.sql.parse import LimitMethod, Table
 from superset.utils import json
+from tests.conftest import with_config
 from tests.unit_tests.conftest import with_feature_flags
 
 # sample config for OAuth2 tests
@@ -435,6 +436,34 @@ def test_get_sqla_engine(mocker: MockerFixture) -> None:
     )
 
 
+@with_config({"DB_ENGINE_POOL_ENABLED": True})
+def test_get_sqla_engine_pooled(mocker: MockerFixture) -> None:
+    """
+    Test that `_get_sqla_engine` reuses the engines of the engine pool.
+    """
+    from superset.models.core import Database
+
+    create_engine = mocker.patch("superset.models.core.create_engine")
+    engine_pool = mocker.patch("superset.models.core.engine_pool_factory").instance
+
+    database = Database(id=1, database_name="my_db", sqlalchemy_uri="trino://")
+    assert database._get_sqla_engine() == engine_pool.get_engine.return_value
+    engine_pool.get_engine.assert_called_with(
+        1,
+        make_url("trino:///"),
+        {"connect_args": {"source": "Apache Superset"}},
+        None,
+    )
+
+    # databases with their own pool class, or SSH tunnels, don't use the engine pool
+    database._get_sqla_engine(pooled=False)
+    create_engine.assert_called_once()
+    database.extra = json.dumps({"engine_params": {"poolclass": "StaticPool"}})
+    database._get_sqla_engine()
+    assert create_engine.call_count == 2
+    assert engine_pool.get_engine.call_count == 1
+
+
 def test_get_sqla_engine_user_impersonation(mocker: MockerFixture) -> None:
     """
     Test user impersonation in `_get_sqla_engine`.
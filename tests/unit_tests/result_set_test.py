@@ -18,9 +18,12 @@
 # pylint: disable=import-outside-toplevel, unused-argument
 
 from datetime import datetime, timezone
+from decimal import Decimal
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pytest
 from numpy.core.multiarray import array
 from pytest_mock import MockerFixture
 
@@ -185,3 +188,90 @@ def test_get_column_description_from_empty_data_using_cursor_description(
     )
     assert any(col.get("column_name") == "__time" for col in result_set.columns)
     logger.exception.assert_not_called()
+
+
+def test_transpose_rows() -> None:
+    """
+    Test that rows are transposed into columns, and that ragged rows are rejected.
+    """
+    from superset.result_set import transpose_rows
+
+    assert transpose_rows([(1, "a"), (2, "b")], 2) == [[1, 2], ["a", "b"]]
+    assert transpose_rows([], 2) == [[], []]
+
+    with pytest.raises(ValueError, match="Expected 2 values in every row"):
+        transpose_rows([(1, "a"), (2,)], 2)
+
+
+def test_stringify_only_failing_columns() -> None:
+    """
+    Test that only the columns that can't be converted to Arrow are stringified.
+    """
+    data = [(1, "foo", 1), (2, "bar", "baz")]
+    description = [
+        ("a", None, None, None, None, None, None),
+        ("b", None, None, None, None, None, None),
+        ("c", None, None, None, None, None, None),
+    ]
+    result_set = SupersetResultSet(data, description, BaseEngineSpec)  # type: ignore
+
+    assert result_set.pa_table.schema.types == [pa.int64(), pa.string(), pa.string()]
+    assert result_set.to_pandas_df().to_dict(orient="list") == {
+        "a": [1, 2],
+        "b": ["foo", "bar"],
+        "c": ["1", "baz"],
+    }
+
+
+def test_decimal_type_from_cursor_description() -> None:
+    """
+    Test that the precision and scale in the cursor description are used for
+    decimals, falling back to inference when the values don't fit.
+    """
+    description = [
+        ("a", None, None, None, 10, 2, None),
+        ("b", None, None, None, 3, 1, None),
+    ]
+    data = [(Decimal("1.10"), Decimal("12.345")), (None, Decimal("1.5"))]
+    result_set = SupersetResultSet(data, description, BaseEngineSpec)  # type: ignore
+
+    assert result_set.pa_table.schema.types == [
+        pa.decimal128(10, 2),
+        pa.decimal128(5, 3),
+    ]
+    assert result_set.to_pandas_df().to_dict(orient="list") == {
+        "a": [Decimal("1.10"), None],
+        "b": [Decimal("12.345"), Decimal("1.500")],
+    }
+
+
+def test_result_set_from_arrow_table() -> None:
+    """
+    Test that a result set can be built from an Arrow table returned by the driver.
+    """
+    table = pa.table(
+        {
+            "a": [1, 2],
+            "b": ["foo", None],
+            "c": [[1, 2], [3]],
+        }
+    )
+    description = [
+        ("a", "INTEGER", None, None, None, None, None),
+        ("a", "VARCHAR", None, None, None, None, None),
+        ("c", None, None, None, None, None, None),
+    ]
+    result_set = SupersetResultSet(table, description, BaseEngineSpec)  # type: ignore
+
+    assert result_set.pa_table.column_names == ["a", "a__1", "c"]
+    assert result_set.pa_table.schema.types == [pa.int64(), pa.string(), pa.string()]
+    assert result_set.to_pandas_df().to_dict(orient="list") == {
+        "a": [1, 2],
+        "a__1": ["foo", None],
+        "c": ["[1, 2]", "[3]"],
+    }
+    assert [column["type"] for column in result_set.columns] == [
+        "INTEGER",
+        "VARCHAR",
+        "STRING",
+    ]
@@ -20,13 +20,13 @@
 import json  # noqa: TID251
 
 import pytest
-from flask_appbuilder.security.sqla.models import Role, User
+from flask_appbuilder.security.sqla.models import Role, User, ViewMenu
 from pytest_mock import MockerFixture
 
 from superset.common.query_object import QueryObject
 from superset.connectors.sqla.models import Database, SqlaTable
 from superset.exceptions import SupersetSecurityException
-from superset.extensions import appbuilder
+from superset.extensions import appbuilder, cache_manager
 from superset.models.slice import Slice
 from superset.security.manager import (
     query_context_modified,
@@ -35,6 +35,7 @@ from superset.security.manager import (
 from superset.sql.parse import Table
 from superset.superset_typing import AdhocColumn, AdhocMetric
 from superset.utils.core import DatasourceName, override_user
+from tests.conftest import with_config
 
 
 def test_security_manager(app_context: None) -> None:
@@ -504,7 +505,7 @@ def test_raise_for_access_chart_on_admin(
     Test that the security manager can raise an exception for chart access,
     when the user does not have access to the chart datasource
     """
-    from flask_appbuilder.security.sqla.models import Role, User
+    from flask_appbuilder.security.sqla.models import Role, User, ViewMenu
 
     from superset.models.slice import Slice
     from superset.utils.core import override_user
@@ -1186,3 +1187,130 @@ def test_get_catalogs_accessible_by_user_schema_access(
     catalogs = {"catalog1", "catalog2"}
 
     assert sm.get_catalogs_accessible_by_user(database, catalogs) == {"catalog2"}
+
+
+@with_config({"PERMISSION_SNAPSHOT_CACHE_ENABLED": True})
+def test_permission_snapshot(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that the permissions of a user are built once per version of the
+    permissions.
+    """
+    sm = SupersetSecurityManager(appbuilder)
+    get_permission_snapshot = mocker.patch.object(
+        sm,
+        "_get_permission_snapshot",
+        return_value={
+            "database_access": frozenset({"[db1].(id:1)"}),
+            "datasource_access": frozenset({"[db1].[table1](id:1)"}),
+        },
+    )
+    _has_view_access = mocker.patch.object(sm, "_has_view_access")
+    cache = mocker.patch.object(cache_manager, "_cache")
+    cache.get.side_effect = ["v1", None]
+
+    with override_user(User(id=1, roles=[Role(name="Gamma")])):
+        assert sm.can_access("datasource_access", "[db1].[table1](id:1)")
+        assert not sm.can_access("datasource_access", "[db1].[table2](id:2)")
+        assert sm.user_view_menu_names("datasource_access") == {
+            "[db1].[table1](id:1)"
+        }
+        assert sm.get_accessible_databases() == [1]
+        get_permission_snapshot.assert_called_once_with(1)
+        cache.set.assert_called_once_with(
+            "superset:permissions:v1:1",
+            get_permission_snapshot.return_value,
+            timeout=300,
+        )
+
+        sm.invalidate_permission_snapshots()
+        cache.get.side_effect = [None]
+        assert sm.can_access("datasource_access", "[db1].[table1](id:1)")
+        assert get_permission_snapshot.call_count == 2
+
+    _has_view_access.assert_not_called()
+
+
+def test_on_role_assignment_after_update(
+    mocker: MockerFixture,
+    app_context: None,
+) -> None:
+    """
+    Test that the sessions changing the roles of a user are flagged.
+    """
+    sm = SupersetSecurityManager(appbuilder)
+    flag_permissions_changed = mocker.patch.object(sm, "flag_permissions_changed")
+    user = User(id=1, roles=[])
+    state = mocker.patch("superset.security.manager.inspect").return_value
+    state.attrs = {"roles": mocker.MagicMock()}
+
+    state.attrs["roles"].history.has_changes.return_value = False
+    sm.on_role_assignment_after_update(mocker.MagicMock(), mocker.MagicMock(), user)
+    flag_permissions_changed.assert_not_called()
+
+    state.attrs["roles"].history.has_changes.return_value = True
+    sm.on_role_assignment_after_update(mocker.MagicMock(), mocker.MagicMock(), user)
+    flag_permissions_changed.assert_called_once_with(user)
+
+
+def test_invalidate_permission_snapshots_on_commit(
+    mocker: MockerFixture,
+    app_context: None,
+) -> None:
+    """
+    Test that the permission snapshots are invalidated once the session changing
+    the permissions is committed, and not when it's flushed.
+    """
+    sm = SupersetSecurityManager(appbuilder)
+    invalidate = mocker.patch.object(sm, "invalidate_permission_snapshots")
+    session = mocker.MagicMock(info={})
+    mocker.patch("superset.security.manager.inspect").return_value.session = session
+
+    sm.on_permission_view_after_delete(
+        mocker.MagicMock(), mocker.MagicMock(), mocker.MagicMock()
+    )
+    invalidate.assert_not_called()
+    sm.permissions_after_rollback(session)
+    sm.permissions_after_commit(session)
+    invalidate.assert_not_called()
+
+    sm.on_role_after_update(mocker.MagicMock(), mocker.MagicMock(), Role(name="Gamma"))
+    invalidate.assert_not_called()
+    sm.permissions_after_commit(session)
+    sm.permissions_after_commit(session)
+    invalidate.assert_called_once()
+
+
+def test_invalidate_permission_snapshots_on_dataset_rename(
+    mocker: MockerFixture,
+    app_context: None,
+) -> None:
+    """
+    Test that the permission snapshots are invalidated once the view menu of a
+    renamed dataset is committed.
+    """
+    sm = SupersetSecurityManager(appbuilder)
+    invalidate = mocker.patch.object(sm, "invalidate_permission_snapshots")
+    session = mocker.MagicMock(info={})
+    mocker.patch("superset.security.manager.inspect").return_value.session = session
+    mocker.patch.object(
+        sm,
+        "find_view_menu",
+        side_effect=[
+            None,
+            ViewMenu(name="[db].[old](id:1)"),
+            ViewMenu(name="[db].[new](id:1)"),
+        ],
+    )
+    connection = mocker.MagicMock()
+
+    sm._update_dataset_perm(
+        mocker.MagicMock(),
+        connection,
+        "[db].[old](id:1)",
+        "[db].[new](id:1)",
+        mocker.MagicMock(id=1),
+    )
+    assert connection.execute.call_count == 3
+    invalidate.assert_not_called()
+    sm.permissions_after_commit(session)
+    invalidate.assert_called_once()
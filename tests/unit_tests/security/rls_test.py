@@ -0,0 +1,96 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest.mock import Mock
+
+from flask import g
+from pytest_mock import MockerFixture
+
+from superset.extensions import cache_manager
+from superset.security.rls import RLSFilter, RLSFilterCache, RLSRule
+from superset.utils.core import RowLevelSecurityFilterType
+
+REGULAR = RLSRule(
+    filter=RLSFilter(id=1, group_key=None, clause="country = 'US'"),
+    filter_type=RowLevelSecurityFilterType.REGULAR,
+    role_ids=frozenset({1}),
+    table_ids=frozenset({10, 11}),
+)
+BASE = RLSRule(
+    filter=RLSFilter(id=2, group_key="region", clause="region = 'EMEA'"),
+    filter_type=RowLevelSecurityFilterType.BASE,
+    role_ids=frozenset({2}),
+    table_ids=frozenset({10}),
+)
+
+
+def test_compile() -> None:
+    """
+    Test that the filters applying to a set of roles are grouped by table.
+    """
+    rules = [REGULAR, BASE]
+
+    assert RLSFilterCache.compile(rules, frozenset({1})) == {
+        10: [REGULAR.filter, BASE.filter],
+        11: [REGULAR.filter],
+    }
+    assert RLSFilterCache.compile(rules, frozenset({2})) == {}
+    assert RLSFilterCache.compile(rules, frozenset()) == {10: [BASE.filter]}
+
+
+def test_get_filters(mocker: MockerFixture) -> None:
+    """
+    Test that the rules are loaded once per version.
+    """
+    rls_filter_cache = RLSFilterCache()
+    load_rules = mocker.patch.object(
+        rls_filter_cache, "load_rules", return_value=[REGULAR, BASE]
+    )
+    cache = mocker.patch.object(cache_manager, "_cache")
+    cache.get.return_value = "v1"
+
+    assert rls_filter_cache.get_filters([1, 3], 10) == [REGULAR.filter, BASE.filter]
+    assert rls_filter_cache.get_filters([3, 1], 11) == [REGULAR.filter]
+    assert rls_filter_cache.get_filters([2], 10) == []
+    load_rules.assert_called_once()
+    cache.get.assert_called_once_with(RLSFilterCache.version_key)
+
+    # another worker changed the rules
+    del g.rls_filters_version
+    cache.get.return_value = "v2"
+    load_rules.return_value = [BASE]
+    assert rls_filter_cache.get_filters([1], 10) == [BASE.filter]
+    assert load_rules.call_count == 2
+
+
+def test_invalidate_on_commit(mocker: MockerFixture) -> None:
+    """
+    Test that the rules are reloaded once the session changing them is committed.
+    """
+    rls_filter_cache = RLSFilterCache()
+    invalidate = mocker.patch.object(rls_filter_cache, "invalidate")
+    session = Mock(info={})
+    mocker.patch("superset.security.rls.inspect").return_value.session = session
+
+    rls_filter_cache.on_rules_changed(Mock(), Mock(), Mock())
+    rls_filter_cache.on_session_rollback(session)
+    rls_filter_cache.on_session_commit(session)
+    invalidate.assert_not_called()
+
+    rls_filter_cache.on_rules_changed(Mock(), Mock(), Mock())
+    rls_filter_cache.on_session_commit(session)
+    rls_filter_cache.on_session_commit(session)
+    invalidate.assert_called_once()
@@ -41,6 +41,7 @@ def test_load_chart_data_into_cache_with_error(
 
     mock_security_manager.get_user_by_id.return_value = mock_user
     mock_async_query_manager.STATUS_ERROR = "error"
+    mock_async_query_manager.is_job_cancelled.return_value = False
     mock_query_context_schema_cls.return_value = mock_query_context_schema
 
     mock_query_context_schema.load.side_effect = err
@@ -53,3 +54,43 @@ def test_load_chart_data_into_cache_with_error(
     mock_async_query_manager.update_job.assert_called_once_with(
         job_metadata, "error", errors=expected_errors
     )
+
+
+@mock.patch("superset.tasks.async_queries.security_manager")
+@mock.patch("superset.tasks.async_queries.async_query_manager")
+@mock.patch("superset.tasks.async_queries.ChartDataQueryContextSchema")
+def test_load_chart_data_into_cache_cancelled(
+    mock_query_context_schema_cls, mock_async_query_manager, mock_security_manager
+):
+    """Test that the cancelled jobs aren't run"""
+    from superset.tasks.async_queries import load_chart_data_into_cache
+
+    job_metadata = {"user_id": 1, "channel_id": "channel", "job_id": "job"}
+    mock_async_query_manager.STATUS_ERROR = "error"
+    mock_async_query_manager.is_job_cancelled.return_value = True
+
+    load_chart_data_into_cache(job_metadata, {})
+
+    mock_query_context_schema_cls.return_value.load.assert_not_called()
+    mock_async_query_manager.update_job.assert_called_once_with(
+        job_metadata, "error", errors=[{"message": "The job was cancelled"}]
+    )
+
+
+@mock.patch("superset.tasks.async_queries.QueryCacheManager")
+@mock.patch("superset.tasks.async_queries.security_manager")
+@mock.patch("superset.tasks.async_queries.ChartDataQueryContextSchema")
+def test_refresh_chart_data_cache_with_error(
+    mock_query_context_schema_cls, mock_security_manager, mock_query_cache_manager
+):
+    """Test that the refresh flag is released even if the refresh fails"""
+    from superset.tasks.async_queries import refresh_chart_data_cache
+
+    mock_query_context_schema_cls.return_value.load.side_effect = (
+        ChartDataQueryFailedError(_("Something went wrong"))
+    )
+
+    with pytest.raises(ChartDataQueryFailedError):
+        refresh_chart_data_cache({"user_id": 1}, {"force": True}, "key")
+
+    mock_query_cache_manager.release_refresh.assert_called_once_with("key", "data")
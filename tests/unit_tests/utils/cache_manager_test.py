@@ -0,0 +1,178 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from typing import Any
+
+from cachelib import SimpleCache
+from flask import Flask
+from pytest_mock import MockerFixture
+
+from superset.utils import json
+from superset.utils.cache_manager import CacheManager, L1Cache
+
+
+def get_l1_cache(mocker: MockerFixture, **kwargs: Any) -> tuple[L1Cache, Any]:
+    backend = SimpleCache()
+    backend._write_client = mocker.MagicMock()
+    l1_cache = L1Cache(backend, stats_logger=mocker.MagicMock(), **kwargs)
+    # don't start the listener thread
+    mocker.patch.object(l1_cache, "_ensure_process")
+    return l1_cache, backend
+
+
+def test_l1_cache_get(mocker: MockerFixture) -> None:
+    """
+    Test that values are read from the backend once, and copied on each read.
+    """
+    l1_cache, backend = get_l1_cache(mocker, max_bytes=1024)
+    backend.set("key", {"a": [1, 2]})
+    backend_get = mocker.spy(backend, "get")
+
+    assert l1_cache.get("key") == {"a": [1, 2]}
+    value = l1_cache.get("key")
+    assert value == {"a": [1, 2]}
+    value["a"].append(3)
+
+    assert l1_cache.get("key") == {"a": [1, 2]}
+    backend_get.assert_called_once_with("key")
+    l1_cache.stats_logger.incr.assert_any_call("cache_l1_miss")
+    l1_cache.stats_logger.incr.assert_any_call("cache_l1_hit")
+
+    assert l1_cache.get("missing") is None
+    assert l1_cache.size == len(l1_cache._entries["key"][1])
+
+
+def test_l1_cache_max_bytes(mocker: MockerFixture) -> None:
+    """
+    Test that the least recently used values are evicted to stay within the budget.
+    """
+    l1_cache, _ = get_l1_cache(mocker, max_bytes=100)
+
+    l1_cache.set("a", "a" * 30)
+    l1_cache.set("b", "b" * 30)
+    l1_cache.get("a")
+    l1_cache.set("c", "c" * 30)
+
+    assert list(l1_cache._entries) == ["a", "c"]
+    assert l1_cache.size <= 100
+    l1_cache.stats_logger.incr.assert_called_with("cache_l1_eviction")
+
+    # values larger than the budget are only stored in the backend
+    l1_cache.set("d", "d" * 200)
+    assert "d" not in l1_cache._entries
+    assert l1_cache.get("d") == "d" * 200
+
+
+def test_l1_cache_timeout(mocker: MockerFixture) -> None:
+    """
+    Test that values are kept up to the shortest of their timeout and the L1 timeout.
+    """
+    l1_cache, backend = get_l1_cache(mocker, max_bytes=1024, timeout=60)
+    monotonic = mocker.patch(
+        "superset.utils.cache_manager.time.monotonic", return_value=0
+    )
+
+    l1_cache.set("short", 1, timeout=10)
+    l1_cache.set("long", 1, timeout=3600)
+    l1_cache.set("forever", 1, timeout=0)
+
+    monotonic.return_value = 30
+    assert l1_cache._get("short") is None
+    assert l1_cache._get("long") == 1
+
+    monotonic.return_value = 90
+    assert l1_cache._get("long") is None
+    assert l1_cache._get("forever") is None
+    assert l1_cache.get("long") == backend.get("long") == 1
+
+
+def test_l1_cache_invalidation(mocker: MockerFixture) -> None:
+    """
+    Test that writes are published, and that published writes evict values.
+    """
+    l1_cache, _ = get_l1_cache(mocker, max_bytes=1024)
+    client = l1_cache._client
+
+    l1_cache.set("a", 1)
+    l1_cache.set("b", 2)
+    l1_cache.delete("a")
+
+    messages = [call.args[1] for call in client.publish.call_args_list]
+    assert [json.loads(message)["keys"] for message in messages] == [
+        ["a"],
+        ["b"],
+        ["a"],
+    ]
+
+    # messages published by this cache are ignored
+    l1_cache._invalidate(messages[1])
+    assert l1_cache._get("b") == 2
+
+    l1_cache._invalidate(json.dumps({"id": "other", "keys": ["b"]}))
+    assert l1_cache._get("b") is None
+
+    l1_cache.set("c", 3)
+    l1_cache._invalidate(json.dumps({"id": "other", "keys": None}))
+    assert l1_cache.size == 0
+
+
+def test_l1_cache_fork(mocker: MockerFixture) -> None:
+    """
+    Test that forked processes start with an empty cache.
+    """
+    l1_cache = L1Cache(SimpleCache(), max_bytes=1024)
+    getpid = mocker.patch("superset.utils.cache_manager.os.getpid", return_value=1)
+
+    l1_cache.set("key", 1)
+    assert l1_cache._get("key") == 1
+
+    getpid.return_value = 2
+    l1_cache.get("other")
+    assert l1_cache._get("key") is None
+    assert l1_cache.get("key") == 1
+
+
+def test_cache_manager_l1_cache(mocker: MockerFixture) -> None:
+    """
+    Test that the L1 cache is only added to caches configured with a budget.
+    """
+    app = Flask(__name__)
+    app.config.update(
+        {
+            "CACHE_DEFAULT_TIMEOUT": 300,
+            "STATS_LOGGER": mocker.MagicMock(),
+            "CACHE_CONFIG": {"CACHE_TYPE": "NullCache", "CACHE_L1_MAX_BYTES": 1024},
+            "DATA_CACHE_CONFIG": {
+                "CACHE_TYPE": "SimpleCache",
+                "CACHE_L1_MAX_BYTES": 1024,
+            },
+            "THUMBNAIL_CACHE_CONFIG": {"CACHE_TYPE": "SimpleCache"},
+            "FILTER_STATE_CACHE_CONFIG": {"CACHE_TYPE": "SimpleCache"},
+            "EXPLORE_FORM_DATA_CACHE_CONFIG": {"CACHE_TYPE": "SimpleCache"},
+        }
+    )
+    cache_manager = CacheManager()
+    cache_manager.init_app(app)
+
+    with app.app_context():
+        assert not isinstance(cache_manager.cache.cache, L1Cache)
+        assert isinstance(cache_manager.data_cache.cache, L1Cache)
+        assert cache_manager.data_cache.cache.name == "data_cache"
+        assert not isinstance(cache_manager.thumbnail_cache.cache, L1Cache)
+
+        cache_manager.data_cache.set("key", "value")
+        assert cache_manager.data_cache.get("key") == "value"
@@ -0,0 +1,77 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+from pytest_mock import MockerFixture
+
+from superset.exceptions import CompressionCodecException
+from superset.utils.compression import (
+    compress,
+    COMPRESSION_CODECS,
+    decompress,
+    HEADER_MAGIC,
+)
+from superset.utils.core import zlib_compress, zlib_decompress
+
+DATA = b'{"name": "foo", "value": 1}' * 100
+
+
+@pytest.mark.parametrize(
+    "codec",
+    [name for name, codec in COMPRESSION_CODECS.items() if codec.is_available()],
+)
+def test_round_trip(codec: str) -> None:
+    """
+    Test that values are decompressed with the codec that compressed them.
+    """
+    assert decompress(compress(DATA, codec)) == DATA
+    assert decompress(compress(DATA, codec, header=True)) == DATA
+    assert decompress(compress(DATA.decode("utf-8"), codec)) == DATA
+
+
+def test_header() -> None:
+    """
+    Test that zlib values have no header, so they can be read by older versions.
+    """
+    assert zlib_decompress(compress(DATA, "zlib"), decode=False) == DATA
+    assert decompress(zlib_compress(DATA)) == DATA
+
+    assert compress(DATA, "zlib", header=True).startswith(HEADER_MAGIC)
+    assert compress(DATA, "none") == HEADER_MAGIC + b"\x00" + DATA
+
+
+def test_decompress_without_header() -> None:
+    """
+    Test that values without a header use the default codec.
+    """
+    assert decompress(DATA, default=None) == DATA
+    assert decompress(DATA, default="none") == DATA
+
+
+def test_invalid_codec(mocker: MockerFixture) -> None:
+    """
+    Test that unknown and unavailable codecs raise an exception.
+    """
+    with pytest.raises(CompressionCodecException, match="Unknown compression codec"):
+        compress(DATA, "foo")
+
+    with pytest.raises(CompressionCodecException, match="Unknown compression codec"):
+        decompress(HEADER_MAGIC + b"\xff" + DATA)
+
+    mocker.patch("superset.utils.compression.lz4", None)
+    with pytest.raises(CompressionCodecException, match="requires the `lz4` package"):
+        compress(DATA, "lz4")
@@ -0,0 +1,147 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+
+import threading
+
+import pytest
+from flask import g
+from sqlalchemy.orm.session import Session
+
+from superset.utils.concurrency import (
+    iter_concurrently,
+    load_orm_state,
+    map_concurrently,
+)
+
+
+def test_map_concurrently() -> None:
+    """
+    Test that results are returned in the order of the items.
+    """
+    barrier = threading.Barrier(3, timeout=5)
+
+    def square(value: int) -> int:
+        # all the items are processed at the same time
+        barrier.wait()
+        return value**2
+
+    assert map_concurrently(square, [1, 2, 3], max_workers=3) == [1, 4, 9]
+
+
+def test_map_concurrently_app_context() -> None:
+    """
+    Test that the function runs with the values of `g` of the caller.
+    """
+    g.user = "admin"
+
+    def get_user(_: int) -> tuple[str, bool]:
+        return g.user, threading.current_thread() is threading.main_thread()
+
+    assert map_concurrently(get_user, [1, 2], max_workers=2) == [
+        ("admin", False),
+        ("admin", False),
+    ]
+
+
+def test_map_concurrently_single_worker() -> None:
+    """
+    Test that items are processed in the current thread with a single worker.
+    """
+
+    def get_thread(_: int) -> threading.Thread:
+        return threading.current_thread()
+
+    assert map_concurrently(get_thread, [1, 2], max_workers=1) == [
+        threading.current_thread(),
+        threading.current_thread(),
+    ]
+
+
+def test_map_concurrently_nested() -> None:
+    """
+    Test that nested calls run in the worker threads.
+    """
+
+    def get_threads(_: int) -> set[threading.Thread]:
+        return set(
+            map_concurrently(
+                lambda _: threading.current_thread(), [1, 2, 3], max_workers=3
+            )
+        )
+
+    for threads in map_concurrently(get_threads, [1, 2], max_workers=2):
+        assert len(threads) == 1
+        assert threading.main_thread() not in threads
+
+
+def test_map_concurrently_exception() -> None:
+    """
+    Test that exceptions raised by the function are re-raised.
+    """
+
+    def fail(value: int) -> int:
+        if value == 2:
+            raise ValueError("failed")
+        return value
+
+    with pytest.raises(ValueError, match="failed"):
+        map_concurrently(fail, [1, 2, 3], max_workers=2)
+
+
+def test_iter_concurrently() -> None:
+    """
+    Test that results are yielded as they're available, with the index of the item.
+    """
+    first_done = threading.Event()
+
+    def wait(value: int) -> int:
+        if value == 1:
+            # the second item is done first
+            assert first_done.wait(timeout=5)
+        else:
+            first_done.set()
+        return value
+
+    assert list(iter_concurrently(wait, [1, 2], max_workers=2)) == [(1, 2), (0, 1)]
+    assert list(iter_concurrently(wait, [2, 3], max_workers=1)) == [(0, 2), (1, 3)]
+
+
+def test_load_orm_state(session: Session) -> None:
+    """
+    Test that the expired attributes and the relationships of an instance are loaded.
+    """
+    from superset.connectors.sqla.models import SqlaTable, TableColumn
+    from superset.models.core import Database
+
+    engine = session.get_bind()
+    SqlaTable.metadata.create_all(engine)  # pylint: disable=no-member
+
+    table = SqlaTable(
+        table_name="sales",
+        database=Database(database_name="my_db", sqlalchemy_uri="sqlite://"),
+        columns=[TableColumn(column_name="country")],
+    )
+    session.add(table)
+    session.commit()
+
+    load_orm_state(table, "columns", "database", "unknown")
+    # the loaded state is readable without the session
+    session.expunge_all()
+    assert table.table_name == "sales"
+    assert [column.column_name for column in table.columns] == ["country"]
+    assert table.database.database_name == "my_db"
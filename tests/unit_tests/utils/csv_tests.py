@@ -16,6 +16,11 @@
 # under the License.
 
 
+import random
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pytest  # noqa: F401
@@ -25,9 +30,41 @@ from superset.utils import csv, json
 from superset.utils.core import GenericDataType
 from superset.utils.csv import (
     df_to_escaped_csv,
+    df_to_escaped_csv_chunks,
+    escape_value,
     get_chart_dataframe,
 )
 
+# characters that are likely to trip the escaping rules
+ALPHABET = ["-", "@", "+", "|", "=", "%", '"', " ", "\t", "\n", "\v", "\x1c", "0", "."]
+ALPHABET += ["\x85", "\u3000", "é", "a", "'", ","]
+
+
+def random_value(rng: random.Random) -> Any:
+    """
+    Return a random value for an object column, mostly short adversarial strings.
+    """
+    kind = rng.random()
+    if kind < 0.75:
+        return "".join(rng.choices(ALPHABET, k=rng.randint(0, 6)))
+    if kind < 0.8:
+        # subclasses of str, and strings that can't be converted to Arrow
+        return rng.choice([np.str_, lambda v: "\ud800" + v])("=" + rng.choice(ALPHABET))
+    return rng.choice([None, np.nan, 1, -1.5, Decimal("-2"), b"=b", True, ("=",)])
+
+
+def legacy_df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
+    """
+    The original implementation of ``df_to_escaped_csv``, escaping value by value.
+    """
+    df = df.rename(columns=lambda v: escape_value(v) if isinstance(v, str) else v)
+    for col_idx, (_, column) in enumerate(df.items()):
+        if column.dtype == np.dtype(object):
+            for idx, value in enumerate(column.values):
+                if isinstance(value, str):
+                    df.iat[idx, col_idx] = escape_value(value)
+    return df.to_csv(escapechar="\\", **kwargs)
+
 
 def test_escape_value():
     result = csv.escape_value("value")
@@ -182,6 +219,53 @@ def test_df_to_escaped_csv():
     assert df_to_escaped_csv(df, encoding="utf8", index=False) == '0\n1\n""\n'
 
 
+@pytest.mark.parametrize("seed", range(20))
+def test_df_to_escaped_csv_matches_legacy(seed: int) -> None:
+    """
+    Test that the vectorized escaping is identical to escaping value by value.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    rows = rng.randint(0, 50)
+    df = pd.DataFrame(
+        {
+            "strings": ["".join(rng.choices(ALPHABET, k=4)) for _ in range(rows)],
+            "mixed": [random_value(rng) for _ in range(rows)],
+            "other": [random_value(rng) for _ in range(rows)],
+            "numbers": [rng.random() for _ in range(rows)],
+        },
+        index=[rng.choice(["=a", "b"]) for _ in range(rows)],
+    )
+    df.columns = ["strings", "=mixed", "=mixed", "numbers"]
+    original = df.copy()
+
+    assert df_to_escaped_csv(df, encoding="utf-8") == legacy_df_to_escaped_csv(
+        df, encoding="utf-8"
+    )
+    assert df.equals(original)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 10])
+def test_df_to_escaped_csv_chunks(chunk_size: int) -> None:
+    """
+    Test that the chunked CSV is identical to the CSV built at once.
+    """
+    df = pd.DataFrame(
+        {"=name": ["a", "=b", "-c"], "value": [1, 2, None]},
+        index=pd.Index(["x", "y", "z"], name="key"),
+    )
+    expected = df_to_escaped_csv(df, encoding="utf-8-sig").encode("utf-8-sig")
+
+    chunks = list(df_to_escaped_csv_chunks(df, chunk_size, encoding="utf-8-sig"))
+
+    assert len(chunks) == -(-3 // chunk_size)
+    assert b"".join(chunks) == expected
+
+    # the header is written for empty DataFrames
+    assert list(df_to_escaped_csv_chunks(df.iloc[:0], 2, index=False)) == [
+        b"'=name,value\n"
+    ]
+
+
 def test_get_chart_dataframe_returns_none_when_no_content(
     monkeypatch: pytest.MonkeyPatch,
 ):
@@ -0,0 +1,120 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from superset.exceptions import DataFrameCodecDecodeException
+from superset.utils import json
+from superset.utils.dataframe_codec import (
+    ArrowIPCDataFrameCodec,
+    DataFrameCodec,
+    decode_dataframe,
+    encode_dataframe,
+    ParquetDataFrameCodec,
+)
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ds": pd.to_datetime(["2024-01-01", None]),
+            "ts": pd.to_datetime(["2024-01-01", "2024-01-02"]).tz_localize("UTC"),
+            "count": [1, 2],
+            "nullable_count": pd.Series([1, None], dtype=object),
+            "avg": [1.5, np.nan],
+            "name": ["foo", None],
+            "flag": [True, False],
+            "amount": [Decimal("1.20"), None],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "codec",
+    [ArrowIPCDataFrameCodec(), ParquetDataFrameCodec(), ArrowIPCDataFrameCodec(None)],
+)
+def test_round_trip(df: pd.DataFrame, codec: DataFrameCodec) -> None:
+    """
+    Test that DataFrames are encoded and decoded without loss.
+    """
+    encoded = encode_dataframe(df, codec)
+
+    assert isinstance(encoded, dict)
+    assert encoded["codec"] == codec.name
+    assert json.loads(encoded["metadata"]) == {"rows": 2, "columns": list(df.columns)}
+    pd.testing.assert_frame_equal(decode_dataframe(encoded), df)
+
+
+@pytest.mark.parametrize("compression", ["zlib", "zstd", "none"])
+def test_round_trip_with_compression(df: pd.DataFrame, compression: str) -> None:
+    """
+    Test that compressed payloads are decompressed when decoding.
+    """
+    encoded = encode_dataframe(df, ArrowIPCDataFrameCodec(None), compression)
+
+    assert isinstance(encoded, dict)
+    pd.testing.assert_frame_equal(decode_dataframe(encoded), df)
+
+
+def test_decode_with_other_codec(df: pd.DataFrame) -> None:
+    """
+    Test that entries are decoded with the codec that encoded them.
+    """
+    encoded = encode_dataframe(df, ParquetDataFrameCodec())
+
+    pd.testing.assert_frame_equal(
+        decode_dataframe(encoded, ArrowIPCDataFrameCodec()),
+        df,
+    )
+
+
+def test_unencoded_values(df: pd.DataFrame) -> None:
+    """
+    Test that DataFrames are kept as is without a codec, and when they can't be
+    encoded, and that decoding them is a no-op.
+    """
+    assert encode_dataframe(df, None) is df
+    assert decode_dataframe(df) is df
+
+    mixed = pd.DataFrame({"a": [1, "foo"]})
+    assert encode_dataframe(mixed, ArrowIPCDataFrameCodec()) is mixed
+
+    non_string_labels = pd.DataFrame({0: [1, 2]})
+    assert encode_dataframe(non_string_labels, ArrowIPCDataFrameCodec()) is (
+        non_string_labels
+    )
+
+
+def test_decode_invalid() -> None:
+    """
+    Test that invalid entries raise a decode exception.
+    """
+    with pytest.raises(DataFrameCodecDecodeException, match="Unknown codec"):
+        decode_dataframe({"codec": "foo", "metadata": "{}", "payload": b""})
+
+    with pytest.raises(DataFrameCodecDecodeException):
+        decode_dataframe({"codec": "arrow", "metadata": "{}", "payload": b"foo"})
+
+    with pytest.raises(DataFrameCodecDecodeException):
+        decode_dataframe(
+            {"codec": "arrow", "metadata": "{}", "payload": b"\x00SC\x02foo"}
+        )
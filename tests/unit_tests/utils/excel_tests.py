@@ -15,13 +15,22 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import random
 from datetime import datetime, timezone
+from typing import Any
 
+import numpy as np
 import pandas as pd
+import pytest
 from pandas.api.types import is_numeric_dtype
 
 from superset.utils.core import GenericDataType
-from superset.utils.excel import apply_column_types, df_to_excel
+from superset.utils.excel import (
+    apply_column_types,
+    df_to_excel,
+    df_to_excel_chunks,
+    quote_formulas,
+)
 
 
 def test_timezone_conversion() -> None:
@@ -47,6 +56,54 @@ def test_quote_formulas() -> None:
     ]
 
 
+def legacy_quote_formulas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The original implementation of ``quote_formulas``, quoting value by value.
+    """
+    for col in df.select_dtypes(include="object").columns:
+        df[col] = df[col].apply(
+            lambda x: (
+                f"'{x}"
+                if isinstance(x, str) and len(x) and x[0] in {"=", "+", "-", "@"}
+                else x
+            )
+        )
+    return df
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_quote_formulas_matches_legacy(seed: int) -> None:
+    """
+    Test that the vectorized quoting is identical to quoting value by value.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    alphabet = ["=", "+", "-", "@", "'", " ", "a", "1"]
+    others: list[Any] = [None, np.nan, 1, 2.5, b"=b", True, datetime(2024, 1, 1)]
+    rows = rng.randint(0, 50)
+    df = pd.DataFrame(
+        {
+            "strings": ["".join(rng.choices(alphabet, k=3)) for _ in range(rows)],
+            "mixed": [
+                "".join(rng.choices(alphabet, k=rng.randint(0, 3)))
+                if rng.random() < 0.7
+                else rng.choice(others)
+                for _ in range(rows)
+            ],
+            "ints": pd.Series([rng.randint(-5, 5) for _ in range(rows)], dtype=object),
+            "numbers": [rng.random() for _ in range(rows)],
+        }
+    )
+
+    expected = legacy_quote_formulas(df.copy())
+    result = quote_formulas(df)
+
+    assert result is df
+    assert result.astype(str).equals(expected.astype(str))
+    assert pd.read_excel(df_to_excel(df.copy())).equals(
+        pd.read_excel(df_to_excel(expected))
+    )
+
+
 def test_column_data_types_with_one_numeric_column():
     df = pd.DataFrame(
         {
@@ -129,3 +186,42 @@ def test_column_data_types_with_large_numeric_values():
         "1100108628127863",
         "18014398509481984",
     ]
+
+
+def test_df_to_excel_chunks() -> None:
+    """
+    Test that the streamed workbook has the same contents as ``df_to_excel``.
+    """
+    df = pd.DataFrame(
+        {
+            "int": [1, 2],
+            "float": [1.5, None],
+            "dttm": [datetime(2023, 1, 1, 12, 30), None],
+            "str": ["=formula", None],
+            "bool": [True, False],
+        }
+    )
+
+    chunks = list(df_to_excel_chunks(df.copy(), chunk_size=1024))
+
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(
+        pd.read_excel(b"".join(chunks)),
+        pd.read_excel(df_to_excel(df.copy())),
+    )
+    assert pd.read_excel(b"".join(chunks))["str"][0] == "'=formula"
+
+    contents = b"".join(df_to_excel_chunks(df.copy(), index=False, sheet_name="data"))
+    assert list(pd.read_excel(contents, sheet_name="data").columns) == list(df.columns)
+
+
+def test_df_to_excel_chunks_fallback() -> None:
+    """
+    Test that DataFrames with hierarchical labels are converted with ``to_excel``.
+    """
+    df = pd.DataFrame(
+        [[1, 2]],
+        columns=pd.MultiIndex.from_tuples([("a", "b"), ("a", "c")]),
+    )
+
+    assert list(df_to_excel_chunks(df.copy())) == [df_to_excel(df.copy())]
@@ -48,6 +48,7 @@ from superset.utils.core import (
     remove_extra_adhoc_filters,
     sanitize_svg_content,
     sanitize_url,
+    stream_zip,
 )
 from tests.conftest import with_config
 
@@ -1162,3 +1163,19 @@ def test_sanitize_url_blocks_dangerous():
     """Test that dangerous URL schemes are blocked."""
     assert sanitize_url("javascript:alert('xss')") == ""
     assert sanitize_url("data:text/html,<script>alert(1)</script>") == ""
+
+
+def test_stream_zip() -> None:
+    """
+    Test that files are bundled into a zip file while being streamed.
+    """
+    from io import BytesIO
+    from zipfile import ZipFile
+
+    chunks = list(stream_zip({"a.csv": [b"a\n", b"1\n"], "b.csv": [b"b\n"]}))
+
+    assert len(chunks) > 1
+    with ZipFile(BytesIO(b"".join(chunks))) as bundle:
+        assert bundle.namelist() == ["a.csv", "b.csv"]
+        assert bundle.read("a.csv") == b"a\n1\n"
+        assert bundle.read("b.csv") == b"b\n"